@@ -0,0 +1,30 @@
+"""add graph_versions generation counter
+
+Revision ID: 3b7d21c4e9a0
+Revises: 9af3a5e16f28
+Create Date: 2026-10-18 09:12:44.103512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3b7d21c4e9a0"
+down_revision = "9af3a5e16f28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    graph_versions = op.create_table(
+        "graph_versions",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(graph_versions, [{"name": "mood_graph", "version": 1}])
+
+
+def downgrade():
+    op.drop_table("graph_versions")
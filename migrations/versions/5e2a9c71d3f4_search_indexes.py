@@ -0,0 +1,60 @@
+"""add indexes for mood search and comment lookups
+
+Revision ID: 5e2a9c71d3f4
+Revises: 3b7d21c4e9a0
+Create Date: 2026-10-18 11:03:27.418205
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5e2a9c71d3f4"
+down_revision = "3b7d21c4e9a0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build the indexes without blocking writes on PostgreSQL; CREATE INDEX
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_establishment_tags_tag_name_establishment_id",
+            "establishment_tags",
+            ["tag_name", "establishment_id"],
+            postgresql_include=["count"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tag_relationships_target_tag_name_source_tag_name",
+            "tag_relationships",
+            ["target_tag_name", "source_tag_name"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_comments_establishment_id_created_at",
+            "comments",
+            ["establishment_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_comments_establishment_id_created_at",
+            table_name="comments",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tag_relationships_target_tag_name_source_tag_name",
+            table_name="tag_relationships",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_establishment_tags_tag_name_establishment_id",
+            table_name="establishment_tags",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,43 @@
+"""add materialized establishment_mood_scores table
+
+Revision ID: 8c4f0b6e2d17
+Revises: 5e2a9c71d3f4
+Create Date: 2026-10-18 13:47:09.530216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8c4f0b6e2d17"
+down_revision = "5e2a9c71d3f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by `flask rebuild-mood-scores`, which needs the mood graph closure
+    op.create_table(
+        "establishment_mood_scores",
+        sa.Column("establishment_id", sa.Integer(), nullable=False),
+        sa.Column("tag_name", sa.String(length=50), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["establishment_id"], ["establishments.id"]),
+        sa.ForeignKeyConstraint(["tag_name"], ["tags.name"]),
+        sa.PrimaryKeyConstraint("establishment_id", "tag_name"),
+    )
+    op.create_index(
+        "ix_establishment_mood_scores_tag_name_establishment_id",
+        "establishment_mood_scores",
+        ["tag_name", "establishment_id"],
+        postgresql_include=["score"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_establishment_mood_scores_tag_name_establishment_id",
+        table_name="establishment_mood_scores",
+    )
+    op.drop_table("establishment_mood_scores")
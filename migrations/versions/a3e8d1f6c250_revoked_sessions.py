@@ -0,0 +1,42 @@
+"""add revoked_sessions shared by stateless authentication workers
+
+Revision ID: a3e8d1f6c250
+Revises: f7b20e5d8c13
+Create Date: 2026-10-18 19:05:37.214906
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a3e8d1f6c250"
+down_revision = "f7b20e5d8c13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "revoked_sessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("session_key", sa.LargeBinary(length=16), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_revoked_sessions_expires_at"),
+        "revoked_sessions",
+        ["expires_at"],
+        unique=False,
+    )
+    graph_versions = sa.table(
+        "graph_versions", sa.column("name", sa.String), sa.column("version", sa.Integer)
+    )
+    op.bulk_insert(graph_versions, [{"name": "session_revocations", "version": 0}])
+
+
+def downgrade():
+    op.execute("DELETE FROM graph_versions WHERE name = 'session_revocations'")
+    op.drop_index(op.f("ix_revoked_sessions_expires_at"), table_name="revoked_sessions")
+    op.drop_table("revoked_sessions")
@@ -0,0 +1,48 @@
+"""add establishment_rating_stats table
+
+Revision ID: d41a7c3e9b58
+Revises: 8c4f0b6e2d17
+Create Date: 2026-10-18 15:12:44.208913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d41a7c3e9b58"
+down_revision = "8c4f0b6e2d17"
+branch_labels = None
+depends_on = None
+
+RATINGS = range(1, 11)
+
+
+def upgrade():
+    op.create_table(
+        "establishment_rating_stats",
+        sa.Column("establishment_id", sa.Integer(), nullable=False),
+        sa.Column("rating_count", sa.Integer(), nullable=False),
+        sa.Column("rating_sum", sa.Integer(), nullable=False),
+        *[
+            sa.Column(f"rating_{rating}", sa.Integer(), nullable=False)
+            for rating in RATINGS
+        ],
+        sa.ForeignKeyConstraint(["establishment_id"], ["establishments.id"]),
+        sa.PrimaryKeyConstraint("establishment_id"),
+    )
+    # Backfill from the comments written so far
+    buckets = ", ".join(f"rating_{rating}" for rating in RATINGS)
+    counts = ", ".join(
+        f"SUM(CASE WHEN rating = {rating} THEN 1 ELSE 0 END)" for rating in RATINGS
+    )
+    op.execute(
+        f"INSERT INTO establishment_rating_stats "
+        f"(establishment_id, rating_count, rating_sum, {buckets}) "
+        f"SELECT establishment_id, COUNT(*), SUM(rating), {counts} "
+        f"FROM comments GROUP BY establishment_id"
+    )
+
+
+def downgrade():
+    op.drop_table("establishment_rating_stats")
@@ -0,0 +1,48 @@
+"""extend the comments index with id for keyset pagination
+
+Revision ID: f7b20e5d8c13
+Revises: d41a7c3e9b58
+Create Date: 2026-10-18 16:40:18.772630
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f7b20e5d8c13"
+down_revision = "d41a7c3e9b58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pages are ordered by (created_at, id), so the id tiebreaker belongs in
+    # the index too; build the new index before dropping the old one
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_establishment_id_created_at_id",
+            "comments",
+            ["establishment_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_comments_establishment_id_created_at",
+            table_name="comments",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_establishment_id_created_at",
+            "comments",
+            ["establishment_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_comments_establishment_id_created_at_id",
+            table_name="comments",
+            postgresql_concurrently=True,
+        )
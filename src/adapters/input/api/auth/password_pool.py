@@ -0,0 +1,92 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from typing import Any, Callable, Optional
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the password pool has no room for another operation."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many password operations in progress")
+        self.retry_after = retry_after
+
+
+class PasswordPool:
+    """
+    Bounded process pool for CPU-heavy password hashing and verification.
+
+    bcrypt holds a request thread for hundreds of milliseconds; running it in
+    separate processes keeps the request workers free for other traffic.
+    At most ``size`` operations run at once and ``queue_limit`` more may wait;
+    beyond that, ``run`` fails fast with PasswordPoolSaturated instead of
+    letting an authentication burst queue up. A size of 0 runs operations
+    inline on the calling thread.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        queue_limit: int,
+        timeout: float = 30.0,
+        retry_after: int = 1,
+        preload: str = __name__,
+    ):
+        self.size = size
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.preload = preload
+        self._slots = threading.BoundedSemaphore(size + queue_limit) if size else None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a module-level function in the pool and wait for its result.
+
+        Raises:
+            PasswordPoolSaturated: If the pool and its queue are full, or the
+                result took longer than the timeout
+        """
+        if not self.size:
+            return function(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolSaturated(self.retry_after)
+        try:
+            future = self._get_executor().submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            # Still queued or running: the pool can't keep up
+            raise PasswordPoolSaturated(self.retry_after) from None
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if they were started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _release(self, future: Future) -> None:
+        self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Started on first use. Workers come from a fork server rather than
+        # the application process, since forking a process that already runs
+        # threads can deadlock the children; the server preloads the module of
+        # the pooled functions so new workers start warm. As with any process
+        # pool, scripts starting the app must guard it with __name__ checks.
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([self.preload])
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size, mp_context=context
+                )
+            return self._executor
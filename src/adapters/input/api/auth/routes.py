@@ -1,16 +1,33 @@
-from flask import request, session, make_response
+import uuid
+
+from flask import g, request, session, make_response
 from flask_restx import Namespace, Resource, fields
 
+from adapters.input.api.auth import security
+from adapters.input.api.auth.password_pool import PasswordPoolSaturated
 from adapters.input.api.auth.security import (
+    ACCESS_TOKEN_EXPIRES,
+    REFRESH_TOKEN_EXPIRES,
     generate_jwt,
     hash_password,
+    is_valid_session,
     login_required,
+    needs_rehash,
+    password_pool,
+    session_denylist,
     set_cookie,
+    token_cache,
     verify_password,
     decode_jwt,
 )
-from adapters.input.api.auth.utils import get_session_id, get_user_by_email
+from adapters.input.api.auth.utils import (
+    get_session_id,
+    get_user_by_email,
+    invalidate_user,
+    user_exists,
+)
 from adapters.output.persistence.sqlalchemy.models.user import UserModel
+from domain.models.user import User
 from infrastructure.database import db
 
 api = Namespace("auth", description="Authentication operations")
@@ -34,24 +51,57 @@ register_model = api.model(
 )
 
 
+def busy_response(error: PasswordPoolSaturated):
+    """503 response asking the client to retry a password operation later."""
+    return {"message": str(error)}, 503, {"Retry-After": str(error.retry_after)}
+
+
+def rehash_password(user: User, password: str) -> None:
+    """
+    Store a new hash of a just verified password at the current bcrypt cost.
+
+    Best effort: if the password pool is saturated the old hash is kept, and
+    the next login tries again.
+    """
+    try:
+        password_hash = password_pool.run(
+            hash_password, password, security.bcrypt_rounds
+        )
+    except PasswordPoolSaturated:
+        return
+
+    UserModel.query.filter_by(id=user.id).update({"password_hash": password_hash})
+    db.session.commit()
+    invalidate_user(user.email)
+
+
 @api.route("/register")
 class Register(Resource):
     @api.expect(register_model)
+    @api.response(503, "Too many password operations, retry after Retry-After")
     def post(self):
         """Register a new user."""
         data = request.get_json()
 
-        if get_user_by_email(data["email"]):
+        if user_exists(data["email"]):
             return {"message": "Email already registered"}, 400
 
+        try:
+            password_hash = password_pool.run(
+                hash_password, data["password"], security.bcrypt_rounds
+            )
+        except PasswordPoolSaturated as error:
+            return busy_response(error)
+
         user = UserModel(
             email=data["email"],
-            password_hash=hash_password(data["password"]),
+            password_hash=password_hash,
             is_admin=data.get("is_admin", False),
         )
 
         db.session.add(user)
         db.session.commit()
+        invalidate_user(user.email)
 
         return {"message": "User registered successfully"}, 201
 
@@ -59,6 +109,7 @@ class Register(Resource):
 @api.route("/login")
 class Login(Resource):
     @api.expect(login_model)
+    @api.response(503, "Too many password operations, retry after Retry-After")
     def post(self):
         """Authenticate user and create session."""
         data = request.get_json()
@@ -67,18 +118,33 @@ class Login(Resource):
         if not user:
             return {"message": "User not found"}, 404
 
-        if not verify_password(data["password"], user.password_hash):
+        try:
+            valid = password_pool.run(
+                verify_password, data["password"], user.password_hash
+            )
+        except PasswordPoolSaturated as error:
+            return busy_response(error)
+        if not valid:
             return {"message": "Invalid password"}, 401
 
-        # Set session data
-        session["user_id"] = user.id
-        session["email"] = user.email
-        session["is_admin"] = user.is_admin
+        if needs_rehash(user.password_hash):
+            rehash_password(user, data["password"])
+
+        if security.AUTH_STATELESS:
+            # Everything requests need travels in the tokens
+            session_id = str(uuid.uuid4())
+            claims = {"user_id": user.id, "is_admin": user.is_admin}
+        else:
+            # Set session data
+            session["user_id"] = user.id
+            session["email"] = user.email
+            session["is_admin"] = user.is_admin
+            session_id = get_session_id()
+            claims = None
 
         # Generate tokens
-        session_id = get_session_id()
-        access_token = generate_jwt(session_id, expires_in=3600)  # 1 hour
-        refresh_token = generate_jwt(session_id, expires_in=604800)  # 1 week
+        access_token = generate_jwt(session_id, ACCESS_TOKEN_EXPIRES, claims)
+        refresh_token = generate_jwt(session_id, REFRESH_TOKEN_EXPIRES, claims)
 
         # Create response
         response = make_response(
@@ -98,7 +164,12 @@ class Logout(Resource):
     @login_required
     def post(self):
         """Clear user session and cookies."""
-        session.clear()
+        session_id = g.token_payload["session_id"]
+        token_cache.invalidate_session(session_id)
+        if security.AUTH_STATELESS:
+            session_denylist.revoke(session_id)
+        else:
+            session.clear()
 
         response = make_response({"message": "Logout successful"})
         response.status_code = 200
@@ -120,12 +191,17 @@ class TokenRefresh(Resource):
         if not payload:
             return {"message": "Invalid or expired refresh token"}, 401
 
-        session_id = payload.get("session_id")
-        if not session_id or session_id != session.get("session_id"):
+        if not is_valid_session(payload):
             return {"message": "Invalid session"}, 401
 
         # Generate new access token
-        access_token = generate_jwt(session_id, expires_in=3600)
+        claims = None
+        if security.AUTH_STATELESS:
+            if "user_id" not in payload or "is_admin" not in payload:
+                # Issued before stateless mode was enabled; log in again
+                return {"message": "Invalid refresh token"}, 401
+            claims = {"user_id": payload["user_id"], "is_admin": payload["is_admin"]}
+        access_token = generate_jwt(payload["session_id"], ACCESS_TOKEN_EXPIRES, claims)
 
         # Create response
         response = make_response({"message": "Token refreshed successfully"})
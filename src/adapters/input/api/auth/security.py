@@ -1,19 +1,150 @@
+import atexit
 import datetime
+import logging
 import os
+import time
 from functools import wraps
 from typing import Any, Callable, Optional
 
 import bcrypt
 import jwt
-from flask import Response, request, session
+from flask import Response, g, request, session
+
+from adapters.input.api.auth.password_pool import PasswordPool
+from adapters.input.api.auth.session_denylist import SharedSessionDenylist
+from adapters.input.api.auth.token_cache import VerifiedTokenCache
+from adapters.output.persistence.sqlalchemy.repositories.session_revocation_repository import (
+    SQLAlchemySessionRevocationRepository,
+)
+from infrastructure.database import db
+
+logger = logging.getLogger(__name__)
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
+REFRESH_TOKEN_EXPIRES = 604800  # 1 week
+
+# Stateless mode: tokens carry user_id and is_admin claims and are checked
+# against an in-memory denylist of logged out sessions instead of the session,
+# so authenticated requests never touch the session store. Logouts are shared
+# through the database; workers pick them up within the poll interval
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+session_denylist = SharedSessionDenylist(
+    SQLAlchemySessionRevocationRepository(db.session),
+    ttl=REFRESH_TOKEN_EXPIRES,
+    poll_interval=float(os.getenv("AUTH_REVOCATION_POLL_INTERVAL", "5")),
+)
+
+# bcrypt cost: fixed with BCRYPT_ROUNDS, or calibrated at startup to the
+# highest cost whose hash takes at most BCRYPT_TARGET_MS on this machine,
+# within [BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS]
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "0")) or None
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+bcrypt_rounds = BCRYPT_ROUNDS or 12  # bcrypt.gensalt() default until calibrated
+
+# Workers calibrate independently and may land a round apart; a calibrated
+# cost only replaces hashes further away than this, so logins served by
+# different workers don't rehash the same password back and forth
+BCRYPT_REHASH_TOLERANCE = int(os.getenv("BCRYPT_REHASH_TOLERANCE", "1"))
+
+# Tokens verified recently; clients resend the same token on every request
+# (size 0 verifies every token)
+token_cache = VerifiedTokenCache(int(os.getenv("JWT_CACHE_SIZE", "4096")))
+
+# Worker processes for bcrypt (0 hashes on the request thread), how many more
+# operations may wait for one, and the Retry-After of rejected requests
+password_pool = PasswordPool(
+    size=int(os.getenv("PASSWORD_POOL_SIZE", "2")),
+    queue_limit=int(os.getenv("PASSWORD_POOL_QUEUE", "8")),
+    timeout=float(os.getenv("PASSWORD_POOL_TIMEOUT", "10")),
+    retry_after=int(os.getenv("PASSWORD_POOL_RETRY_AFTER", "1")),
+    preload=__name__,
+)
+atexit.register(password_pool.shutdown)
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """
+    Hash a password using bcrypt.
+
+    Pass ``rounds`` when hashing in the password pool: its worker processes
+    don't see the cost calibrated in the application process.
+    """
+    salt = bcrypt.gensalt(rounds or bcrypt_rounds)
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def password_rounds(hashed_password: str) -> int:
+    """Cost factor a bcrypt hash was created with ("$2b$<rounds>$...")."""
+    return int(hashed_password.split("$")[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a verified hash should be replaced at the current cost.
+
+    A fixed BCRYPT_ROUNDS is enforced exactly. A calibrated cost replaces
+    hashes below BCRYPT_MIN_ROUNDS or more than BCRYPT_REHASH_TOLERANCE
+    rounds away from it.
+    """
+    rounds = password_rounds(hashed_password)
+    if BCRYPT_ROUNDS:
+        return rounds != BCRYPT_ROUNDS
+    return (
+        rounds < BCRYPT_MIN_ROUNDS
+        or abs(rounds - bcrypt_rounds) > BCRYPT_REHASH_TOLERANCE
+    )
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+def time_bcrypt(rounds: int) -> float:
+    """Seconds one bcrypt hash takes at a cost, best of three."""
+    salt = bcrypt.gensalt(rounds)
+    timings = []
+    for _ in range(3):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration", salt)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def calibrate_bcrypt_rounds(
+    target: float,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS,
+    measure: Callable[[int], float] = time_bcrypt,
+) -> int:
+    """
+    Highest bcrypt cost whose hash takes at most ``target`` seconds.
+
+    Only the minimum cost is timed: each extra round doubles the work, so the
+    others are extrapolated. Never returns less than ``min_rounds``.
+    """
+    elapsed = measure(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 <= target:
+        elapsed *= 2
+        rounds += 1
+    return rounds
+
+
+def configure_bcrypt_rounds() -> int:
+    """Set the bcrypt cost for new hashes, calibrating it unless it is fixed."""
+    global bcrypt_rounds
+    if BCRYPT_ROUNDS:
+        bcrypt_rounds = BCRYPT_ROUNDS
+    else:
+        bcrypt_rounds = calibrate_bcrypt_rounds(BCRYPT_TARGET_MS / 1000)
+        logger.info(
+            "bcrypt cost calibrated to %d rounds for a %.0f ms target; "
+            "set BCRYPT_ROUNDS=%d to use it on every worker",
+            bcrypt_rounds,
+            BCRYPT_TARGET_MS,
+            bcrypt_rounds,
+        )
+    return bcrypt_rounds
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -21,9 +152,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
-def generate_jwt(session_id: str, expires_in: int = 3600) -> str:
-    """Generate a JWT token with session_id."""
+def generate_jwt(
+    session_id: str,
+    expires_in: int = ACCESS_TOKEN_EXPIRES,
+    claims: Optional[dict[str, Any]] = None,
+) -> str:
+    """Generate a JWT token with session_id and any extra claims."""
     payload = {
+        **(claims or {}),
         "session_id": session_id,
         "exp": datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in),
     }
@@ -31,14 +167,21 @@ def generate_jwt(session_id: str, expires_in: int = 3600) -> str:
 
 
 def decode_jwt(token: str) -> Optional[dict[str, Any]]:
-    """Decode and verify a JWT token."""
+    """Decode and verify a JWT token, reusing the result of earlier checks."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
-        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    token_cache.put(token, payload)
+    return payload
+
 
 def set_cookie(response: Response, key: str, value: str) -> Response:
     """Set a secure cookie in the response."""
@@ -53,6 +196,19 @@ def set_cookie(response: Response, key: str, value: str) -> Response:
     return response
 
 
+def is_valid_session(payload: dict[str, Any]) -> bool:
+    """
+    Check a token belongs to a live session: the current server-side session,
+    or in stateless mode any session that hasn't logged out.
+    """
+    session_id = payload.get("session_id")
+    if not session_id:
+        return False
+    if AUTH_STATELESS:
+        return session_id not in session_denylist
+    return session_id == session.get("session_id")
+
+
 def login_required(f: Callable) -> Callable:
     """Decorator to protect routes that require authentication."""
 
@@ -66,10 +222,10 @@ def login_required(f: Callable) -> Callable:
         if not payload:
             return {"message": "Invalid or expired token"}, 401
 
-        session_id = payload.get("session_id")
-        if not session_id or session_id != session.get("session_id"):
+        if not is_valid_session(payload):
             return {"message": "Invalid session"}, 401
 
+        g.token_payload = payload
         return f(*args, **kwargs)
 
     return decorated
@@ -81,7 +237,11 @@ def admin_required(f: Callable) -> Callable:
     @wraps(f)
     @login_required
     def decorated(*args: Any, **kwargs: Any) -> Any:
-        if not session.get("is_admin"):
+        if AUTH_STATELESS:
+            is_admin = g.token_payload.get("is_admin")
+        else:
+            is_admin = session.get("is_admin")
+        if not is_admin:
             return {"message": "Admin privileges required"}, 403
         return f(*args, **kwargs)
 
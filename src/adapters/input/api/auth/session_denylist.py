@@ -0,0 +1,112 @@
+import hashlib
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from adapters.output.persistence.sqlalchemy.repositories.session_revocation_repository import (
+    SQLAlchemySessionRevocationRepository,
+)
+from domain.services.graph_version import CachedVersion
+
+
+class SessionDenylist:
+    """
+    In-memory set of revoked session ids for stateless authentication.
+
+    Each id is kept as a 16-byte digest until every token issued for the
+    session has expired, then forgotten, so the set only holds sessions that
+    logged out within the last token lifetime. Being per process, a logout is
+    only seen by the worker that handled it; see SharedSessionDenylist.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._expires_at: Dict[bytes, float] = {}
+        self._expiry_heap: List[Tuple[float, bytes]] = []
+
+    @staticmethod
+    def _key(session_id: str) -> bytes:
+        return hashlib.blake2b(session_id.encode(), digest_size=16).digest()
+
+    def revoke(self, session_id: str) -> None:
+        """Reject the session's tokens until the longest of them has expired."""
+        self._remember(self._key(session_id), self._clock() + self.ttl)
+
+    def __contains__(self, session_id: str) -> bool:
+        key = self._key(session_id)
+        with self._lock:
+            expires_at = self._expires_at.get(key)
+            return expires_at is not None and self._clock() < expires_at
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge()
+            return len(self._expires_at)
+
+    def _remember(self, key: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._purge()
+            self._expires_at[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+    def _purge(self) -> None:
+        now = self._clock()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            # A later revoke of the same session pushed a newer entry
+            if self._expires_at.get(key) == expires_at:
+                del self._expires_at[key]
+
+
+class SharedSessionDenylist(SessionDenylist):
+    """
+    SessionDenylist whose revocations are shared by every worker.
+
+    Logouts are stored in the revoked_sessions table. Each process re-reads
+    their generation counter at most every ``poll_interval`` seconds and only
+    loads revocations it hasn't seen yet, so a logout is denied everywhere
+    within ``poll_interval`` seconds while a check stays an in-memory lookup.
+    """
+
+    def __init__(
+        self,
+        repository: SQLAlchemySessionRevocationRepository,
+        ttl: float,
+        poll_interval: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(ttl, clock)
+        self._repository = repository
+        self._version = CachedVersion(
+            repository.get_version, ttl=poll_interval, clock=clock
+        )
+        self._sync_lock = threading.Lock()
+        self._synced_version: Optional[int] = None
+        self._last_id = 0
+
+    def revoke(self, session_id: str) -> None:
+        """Reject the session's tokens in every worker until they have expired."""
+        key = self._key(session_id)
+        now = self._clock()
+        self._repository.add(key, now + self.ttl, now)
+        self._remember(key, now + self.ttl)
+
+    def __contains__(self, session_id: str) -> bool:
+        self._sync()
+        return super().__contains__(session_id)
+
+    def _sync(self) -> None:
+        """Load the revocations stored since the last sync, if the counter moved."""
+        version = self._version.get()
+        with self._sync_lock:
+            if version == self._synced_version:
+                return
+            for id_, key, expires_at in self._repository.get_since(
+                self._last_id, self._clock()
+            ):
+                self._remember(key, expires_at)
+                self._last_id = id_
+            self._synced_version = version
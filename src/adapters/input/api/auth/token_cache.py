@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set
+
+
+class VerifiedTokenCache:
+    """
+    LRU cache of JWTs whose signature has already been verified.
+
+    Entries are keyed by a SHA-256 digest of the token, so raw tokens are never
+    kept in memory, and hold the decoded payload with its ``exp`` claim. A hit
+    is only returned while ``exp`` is in the future, matching PyJWT's own
+    expiry check, and entries of a session are dropped when it logs out.
+    """
+
+    def __init__(self, max_size: int = 4096, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._by_session: Dict[str, Set[bytes]] = {}
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the payload of a verified, unexpired token, or None on a miss."""
+        key = self._key(token)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None or self._clock() >= payload["exp"]:
+                if payload is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """Remember a token whose signature and expiry were just verified."""
+        if self.max_size <= 0 or "exp" not in payload:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            session_id = payload.get("session_id")
+            if session_id is not None:
+                self._by_session.setdefault(session_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Forget every cached token of a session, e.g. on logout."""
+        with self._lock:
+            for key in self._by_session.pop(session_id, ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every cached token."""
+        with self._lock:
+            self._entries.clear()
+            self._by_session.clear()
+
+    def _remove(self, key: bytes) -> None:
+        payload = self._entries.pop(key)
+        keys = self._by_session.get(payload.get("session_id"))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_session[payload["session_id"]]
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from domain.models.user import User
+
+
+class UserCache:
+    """
+    Read-through LRU cache of users by email, with a time-to-live.
+
+    Only existing users are cached, so a registration is visible at once.
+    Writes in this process invalidate their entry explicitly; the TTL bounds
+    how long other processes can serve a user changed elsewhere.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        # Bumped by every invalidation, so a load that raced with one isn't stored
+        self._generation = 0
+
+    def get(self, email: str, load: Callable[[str], Optional[User]]) -> Optional[User]:
+        """Get a user, calling ``load`` on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and self._clock() < entry[1]:
+                self._entries.move_to_end(email)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        user = load(email)
+        if user is not None and self.max_size > 0:
+            with self._lock:
+                if generation != self._generation:
+                    return user
+                self._entries[email] = (user, self._clock() + self.ttl)
+                self._entries.move_to_end(email)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, email: str) -> None:
+        """Drop a user after it was created or changed."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        """Forget every cached user."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
@@ -1,15 +1,25 @@
+import os
 import uuid
 from typing import Optional
 
 from flask import session
 
+from adapters.input.api.auth.user_cache import UserCache
 from adapters.output.persistence.sqlalchemy.models.user import UserModel
 from domain.models.user import User
+from infrastructure.database import db
+
+# Users recently looked up by email; the TTL in seconds bounds how long other
+# processes may serve a user after a password change (size 0 disables caching)
+user_cache = UserCache(
+    max_size=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "30")),
+)
 
 
 def get_user_by_email(email: str) -> Optional[User]:
     """
-    Retrieves a user from the database by email.
+    Retrieves a user by email, from the user cache or the database.
 
     Args:
         email (str): The email of the user.
@@ -17,6 +27,34 @@ def get_user_by_email(email: str) -> Optional[User]:
     Returns:
         Optional[User]: The user if found, None otherwise.
     """
+    return user_cache.get(email, _load_user)
+
+
+def user_exists(email: str) -> bool:
+    """
+    Checks whether an email is registered with an EXISTS probe, without
+    loading the user row.
+
+    Args:
+        email (str): The email to check.
+
+    Returns:
+        bool: True if a user has this email.
+    """
+    return db.session.query(UserModel.query.filter_by(email=email).exists()).scalar()
+
+
+def invalidate_user(email: str) -> None:
+    """
+    Drops a user from the cache after it was created or changed.
+
+    Args:
+        email (str): The email of the user.
+    """
+    user_cache.invalidate(email)
+
+
+def _load_user(email: str) -> Optional[User]:
     user = UserModel.query.filter_by(email=email).first()
     if not user:
         return None
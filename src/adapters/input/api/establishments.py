@@ -1,6 +1,11 @@
-from flask import request
-from flask_restx import Resource, Namespace, fields
+import json
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 
+from flask import Response, current_app, request, stream_with_context
+from flask_restx import Resource, Namespace, fields, marshal
+
+from adapters.input.api.fast_json import compile_model, dumps, json_response
 from adapters.input.api.schemas import create_establishment_schemas
 from adapters.input.api.auth.security import login_required, admin_required
 from domain.ports.input.establishment_service import EstablishmentServicePort
@@ -28,6 +33,17 @@ comment_model = api.model(
     },
 )
 
+rating_stats_model = api.model(
+    "RatingStats",
+    {
+        "count": fields.Integer(description="Number of ratings"),
+        "average": fields.Float(description="Mean rating, null without ratings"),
+        "histogram": fields.List(
+            fields.Integer, description="Number of ratings of 1 through 10"
+        ),
+    },
+)
+
 establishment_model = api.model(
     "Establishment",
     {
@@ -40,9 +56,16 @@ establishment_model = api.model(
             fields.Nested(tag_model), required=True, description="Establishment tags"
         ),
         "comments": fields.List(
-            fields.Nested(comment_model), description="Establishment comments"
+            fields.Nested(comment_model),
+            description="Latest comments; page through the rest at /<id>/comments",
+        ),
+        "comment_count": fields.Integer(
+            attribute="rating_stats.count", description="Number of comments"
         ),
         "score": fields.Float(description="Search relevance score"),
+        "rating_stats": fields.Nested(
+            rating_stats_model, allow_null=True, description="Rating aggregate"
+        ),
     },
 )
 
@@ -61,6 +84,33 @@ add_tag_model = api.model(
     {"tag_name": fields.String(required=True, description="Name of the tag to add")},
 )
 
+tag_event_model = api.model(
+    "TagEvent",
+    {
+        "establishment_id": fields.Integer(required=True),
+        "tag_name": fields.String(required=True),
+    },
+)
+
+tag_batch_request = api.model(
+    "TagBatchRequest",
+    {
+        "events": fields.List(
+            fields.Nested(tag_event_model),
+            required=True,
+            description="Tagging events; repeated pairs add up",
+        ),
+    },
+)
+
+tag_batch_response = api.model(
+    "TagBatchResponse",
+    {
+        "events": fields.Integer(description="Number of events applied"),
+        "updated": fields.Integer(description="Establishment tag counts changed"),
+    },
+)
+
 success_response = api.model(
     "SuccessResponse",
     {
@@ -82,6 +132,14 @@ search_request = api.model(
             default=10,
             description="Maximum number of results to return",
         ),
+        "include_comments": fields.Boolean(
+            required=False,
+            default=True,
+            description=(
+                "Whether to include the latest comments of each result; "
+                "false skips loading full establishments and is faster"
+            ),
+        ),
     },
 )
 
@@ -101,8 +159,55 @@ comment_input_model = api.model(
     },
 )
 
+search_cache_stats_model = api.model(
+    "SearchCacheStats",
+    {
+        "hits": fields.Integer(description="Searches served from the cache"),
+        "misses": fields.Integer(description="Searches computed from scratch"),
+        "size": fields.Integer(description="Cached result sets"),
+    },
+)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_COMMENT_PAGE_SIZE = 20
+MAX_COMMENT_PAGE_SIZE = 100
+NDJSON_MIMETYPE = "application/x-ndjson"
+
 _service = None
 
+# Compiled renderers of the read-heavy models, used when FAST_JSON is enabled
+_render = {
+    "Establishment": compile_model(establishment_model),
+    "Comment": compile_model(comment_model),
+}
+
+
+def _respond(data, model, status: int = 200, headers=None):
+    """
+    Render objects with a model, through the compiled renderer if FAST_JSON
+    is enabled and with ``marshal`` otherwise.
+    """
+    if current_app.config["FAST_JSON"] and data is not None:
+        return json_response(data, _render[model.name], status, headers)
+    return marshal(data, model), status, headers
+
+
+def _int_arg(name: str, default: Optional[int] = None) -> Optional[int]:
+    """
+    Get an integer query parameter, or the default if it is missing.
+
+    Raises:
+        ValueError: If the parameter isn't an integer
+    """
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+
 
 def init_api(establishment_service: EstablishmentService):
     """Initialize the API with required services."""
@@ -123,62 +228,243 @@ class EstablishmentList(Resource):
         )
         return establishment
 
-    @api.marshal_list_with(establishment_model)
+    @api.doc(
+        params={
+            "limit": f"Page size (default {DEFAULT_PAGE_SIZE}, max {MAX_PAGE_SIZE})",
+            "after": "Return establishments with an ID greater than this cursor",
+            "format": "Set to 'ndjson' to stream the whole catalog",
+            "include_comments": "Set to 'false' to omit comments",
+        }
+    )
+    @api.response(200, "Success", [establishment_model])
+    @api.response(400, "Invalid paging parameters")
     @login_required
     def get(self):
-        """Get all establishments. Requires authentication."""
-        return _service.get_all_establishments()
+        """
+        Get establishments ordered by ID. Requires authentication.
+
+        Pages are keyset-paginated: pass the X-Next-After header of a response as
+        ``after`` to get the next page. With ``format=ndjson`` (or an
+        ``Accept: application/x-ndjson`` header) all establishments are streamed
+        one JSON object per line.
+        """
+        include_comments = request.args.get("include_comments", "true") != "false"
+        if (
+            request.args.get("format") == "ndjson"
+            or request.accept_mimetypes.best == NDJSON_MIMETYPE
+        ):
+            return Response(
+                stream_with_context(_stream_ndjson(include_comments)),
+                mimetype=NDJSON_MIMETYPE,
+            )
+
+        try:
+            limit = _int_arg("limit", DEFAULT_PAGE_SIZE)
+            after = _int_arg("after")
+        except ValueError as error:
+            return {"message": str(error)}, 400
+        if limit < 1:
+            return {"message": "Limit must be positive"}, 400
+
+        establishments = _service.get_establishments_page(
+            min(limit, MAX_PAGE_SIZE), after, include_comments
+        )
+        headers = {}
+        if len(establishments) == min(limit, MAX_PAGE_SIZE):
+            headers["X-Next-After"] = str(establishments[-1].id)
+
+        return _respond(establishments, establishment_model, headers=headers)
+
+
+def _stream_ndjson(include_comments: bool = True):
+    """Yield establishments as newline-delimited JSON."""
+    establishments = _service.iter_establishments(include_comments=include_comments)
+    if current_app.config["FAST_JSON"]:
+        render = _render[establishment_model.name]
+        for establishment in establishments:
+            yield dumps(render(establishment)) + b"\n"
+        return
+
+    for establishment in establishments:
+        yield json.dumps(marshal(establishment, establishment_model)) + "\n"
 
 
 @api.route("/<int:id>")
 class EstablishmentResource(Resource):
-    @api.marshal_with(establishment_model)
+    @api.response(200, "Success", establishment_model)
     @login_required
     def get(self, id):
         """Get an establishment by ID. Requires authentication."""
         establishment = _service.get_establishment(id)
-        return establishment
+        return _respond(establishment, establishment_model)
 
 
 @api.route("/<int:id>/tags")
 class EstablishmentTags(Resource):
     @api.expect(add_tag_model)
-    @api.marshal_with(success_response)
+    @api.response(200, "Success", success_response)
+    @api.response(404, "Establishment not found")
     @admin_required
     def post(self, id):
         """Add a tag to an establishment. Admin only."""
         data = request.json
-        _service.add_tag_to_establishment(
-            establishment_id=id, tag_name=data["tag_name"]
-        )
+        try:
+            _service.add_tag_to_establishment(
+                establishment_id=id, tag_name=data["tag_name"]
+            )
+        except ValueError as error:
+            return {"message": str(error)}, 404
         # Return success message with updated establishment
-        return {
-            "message": f"Tag '{data['tag_name']}' successfully added to establishment",
-            "establishment": _service.get_establishment(id),
-        }
+        return marshal(
+            {
+                "message": (
+                    f"Tag '{data['tag_name']}' successfully added to establishment"
+                ),
+                "establishment": _service.get_establishment(id),
+            },
+            success_response,
+        )
+
+
+def _tag_event_pairs(data) -> List[Tuple[int, str]]:
+    """
+    Validate a batch request body into (establishment_id, tag_name) pairs.
+
+    Raises:
+        ValueError: If the body or one of its events is malformed
+    """
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list):
+        raise ValueError("Body must be an object with an events list")
+
+    pairs = []
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            event = {}
+        establishment_id = event.get("establishment_id")
+        tag_name = event.get("tag_name")
+        # bool is an int subclass, so compare the exact type
+        if type(establishment_id) is not int or not isinstance(tag_name, str):
+            raise ValueError(
+                f"Event {index} needs an integer establishment_id and a tag_name"
+            )
+        if not tag_name:
+            raise ValueError(f"Event {index} has an empty tag_name")
+        pairs.append((establishment_id, tag_name))
+    return pairs
+
+
+@api.route("/tags:batch")
+class EstablishmentTagBatch(Resource):
+    @api.expect(tag_batch_request)
+    @api.response(200, "Success", tag_batch_response)
+    @api.response(400, "Invalid batch")
+    @admin_required
+    def post(self):
+        """Add many tags to establishments in one transaction. Admin only."""
+        try:
+            pairs = _tag_event_pairs(request.get_json(silent=True))
+            tag_counts = _service.add_tags_to_establishments(pairs)
+        except ValueError as error:
+            return {"message": str(error)}, 400
+
+        return {"events": len(pairs), "updated": len(tag_counts)}
 
 
 @api.route("/search")
 class EstablishmentSearch(Resource):
     @api.expect(search_request)
-    @api.marshal_list_with(establishment_model)
+    @api.response(200, "Success", [establishment_model])
     @login_required
     def post(self):
-        """Search establishments by tags. Requires authentication."""
+        """
+        Search establishments by tags. Requires authentication.
+
+        Results are built from full establishments by default. Pass
+        ``include_comments: false`` to get them, without comments, from a
+        lighter column-only query.
+        """
         data = request.json
         tag_names = data.get("tag_names", [])
         limit = data.get("limit", 10)
 
+        include_comments = data.get("include_comments", True)
+
         tag_weights = {tag_name: 1.0 for tag_name in tag_names}
 
-        establishments = _service.search_establishments(tag_weights, limit)
-        return establishments
+        establishments = _service.search_establishments(
+            tag_weights, limit, include_comments
+        )
+        return _respond(establishments, establishment_model)
+
+
+@api.route("/search/cache")
+class SearchCacheStats(Resource):
+    @api.marshal_with(search_cache_stats_model)
+    @admin_required
+    def get(self):
+        """Get search result cache hit/miss counters. Admin only."""
+        return _service.get_search_cache_stats()
 
 
 @api.route("/<int:id>/comments")
 class EstablishmentComments(Resource):
     """Endpoint for managing establishment comments."""
 
+    @api.doc(
+        params={
+            "limit": (
+                f"Page size (default {DEFAULT_COMMENT_PAGE_SIZE}, "
+                f"max {MAX_COMMENT_PAGE_SIZE})"
+            ),
+            "before": "Return comments created before this ISO 8601 timestamp",
+            "before_id": "With before, also return older comments at that timestamp",
+        }
+    )
+    @api.response(200, "Success", [comment_model])
+    @api.response(400, "Invalid paging parameters")
+    @api.response(404, "Establishment not found")
+    @login_required
+    def get(self, id):
+        """
+        Get comments of an establishment, newest first. Requires authentication.
+
+        Pages are keyset-paginated on (created_at, id): pass the X-Next-Before
+        and X-Next-Before-Id headers of a response as ``before`` and
+        ``before_id`` to get the next page.
+        """
+        try:
+            limit = _int_arg("limit", DEFAULT_COMMENT_PAGE_SIZE)
+            before_id = _int_arg("before_id")
+        except ValueError as error:
+            return {"message": str(error)}, 400
+        if limit < 1:
+            return {"message": "Limit must be positive"}, 400
+
+        before = request.args.get("before")
+        if before is not None:
+            try:
+                before = datetime.fromisoformat(before)
+            except ValueError:
+                return {"message": "before must be an ISO 8601 timestamp"}, 400
+            if before.tzinfo is not None:
+                # Comment times are stored as naive UTC
+                before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        elif before_id is not None:
+            return {"message": "before_id requires before"}, 400
+
+        limit = min(limit, MAX_COMMENT_PAGE_SIZE)
+        comments = _service.get_comments_page(id, limit, before, before_id)
+        if comments is None:
+            return {"message": f"Establishment with id {id} not found"}, 404
+
+        headers = {}
+        if len(comments) == limit:
+            headers["X-Next-Before"] = comments[-1].created_at.isoformat()
+            headers["X-Next-Before-Id"] = str(comments[-1].id)
+
+        return _respond(comments, comment_model, headers=headers)
+
     @api.expect(comment_input_model)
     @api.marshal_with(comment_model)
     def post(self, id):
@@ -0,0 +1,140 @@
+"""
+Fast JSON responses for flask-restx models.
+
+``marshal`` interprets a model field by field for every object it renders.
+``compile_model`` turns a model into a plain function once, so rendering an
+object is a handful of attribute reads, and ``dumps`` encodes the result with
+orjson when it is installed, falling back to the standard library. The
+models stay the single definition of the payloads and of their Swagger docs.
+"""
+
+import json
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional
+
+from flask import Response
+from flask_restx import fields
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+Serializer = Callable[[Any], Optional[Dict[str, Any]]]
+
+
+def compile_model(model) -> Serializer:
+    """
+    Compile a flask-restx model into a function rendering one object.
+
+    Produces the same dictionaries as ``marshal`` for attribute-based objects
+    such as the domain models, for the field types the API models use:
+    strings, integers, floats, booleans, datetimes, nested models and lists.
+    """
+    getters = [(key, _compile_field(key, field)) for key, field in model.items()]
+
+    def serialize(obj):
+        return {key: getter(obj) for key, getter in getters}
+
+    return serialize
+
+
+def dumps(data) -> bytes:
+    """Encode rendered data as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_default, separators=(",", ":")).encode()
+
+
+def json_response(
+    data, serialize: Serializer, status: int = 200, headers=None
+) -> Response:
+    """Render an object or a list of objects and wrap the bytes in a response."""
+    if isinstance(data, (list, tuple)):
+        rendered = [serialize(item) for item in data]
+    else:
+        rendered = serialize(data)
+    return Response(
+        dumps(rendered), status=status, headers=headers, mimetype="application/json"
+    )
+
+
+def _compile_field(key: str, field) -> Callable[[Any], Any]:
+    if isinstance(field, type):
+        field = field()
+    read = _reader(field.attribute or key)
+
+    if isinstance(field, fields.Nested):
+        nested = compile_model(field.nested)
+        empty = {name: None for name in field.nested}
+        allow_null = field.allow_null
+
+        def nested_value(obj):
+            value = read(obj)
+            if value is None:
+                return None if allow_null else dict(empty)
+            return nested(value)
+
+        return nested_value
+
+    if isinstance(field, fields.List):
+        item = _format_item(field.container)
+
+        def list_value(obj):
+            value = read(obj)
+            if value is None:
+                return None
+            if item is None:
+                return list(value)
+            return [item(element) for element in value]
+
+        return list_value
+
+    convert = _format_item(field)
+    if convert is None:
+        return read
+
+    def converted_value(obj):
+        value = read(obj)
+        return None if value is None else convert(value)
+
+    return converted_value
+
+
+def _format_item(field) -> Optional[Callable[[Any], Any]]:
+    """Conversion of a single value, or None if the value is used as is."""
+    if isinstance(field, type):
+        field = field()
+    if isinstance(field, fields.Nested):
+        return compile_model(field.nested)
+    if isinstance(field, fields.Float):
+        return float
+    if isinstance(field, fields.Integer):
+        return int
+    return None
+
+
+def _reader(attribute: str) -> Callable[[Any], Any]:
+    """Read a possibly dotted attribute, yielding None past a missing link."""
+    if "." not in attribute:
+        return attrgetter(attribute)
+
+    path = [attrgetter(name) for name in attribute.split(".")]
+
+    def read(obj):
+        for step in path:
+            if obj is None:
+                return None
+            obj = step(obj)
+        return obj
+
+    return read
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,95 @@
+import json
+import os
+import struct
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from domain.ports.output.mood_graph_snapshot import MoodGraphSnapshotPort
+
+MAGIC = b"MOODGRF1"
+HEADER_LENGTH = struct.Struct("<I")
+PREFIX_LENGTH = len(MAGIC) + HEADER_LENGTH.size
+ALIGNMENT = 64
+DTYPE = np.dtype("<f8")
+
+
+def _matrix_offset(header_length: int) -> int:
+    """Offset of the matrix data, aligned for memory mapping."""
+    return -(-(PREFIX_LENGTH + header_length) // ALIGNMENT) * ALIGNMENT
+
+
+class FileMoodGraphSnapshotStore(MoodGraphSnapshotPort):
+    """
+    Mood graph closures stored as memory-mappable binary files.
+
+    File layout: magic, little-endian header length, JSON header with the
+    version and tag names, space padding up to a 64-byte boundary, then the
+    closure as a row-major float64 matrix. Workers map the matrix read-only, so
+    every process on the host shares the same page-cache copy.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, version: str) -> str:
+        return os.path.join(self.directory, f"mood_graph-{version}.bin")
+
+    def load(self, version: str) -> Optional[Tuple[List[str], np.ndarray]]:
+        """Map the snapshot for a relationships version, if one exists."""
+        path = self._path(version)
+        try:
+            with open(path, "rb") as snapshot:
+                if snapshot.read(len(MAGIC)) != MAGIC:
+                    return None
+                (length,) = HEADER_LENGTH.unpack(snapshot.read(HEADER_LENGTH.size))
+                header = json.loads(snapshot.read(length))
+        except (OSError, ValueError, struct.error):
+            return None
+
+        if header.get("version") != version:
+            return None
+
+        nodes = header["nodes"]
+        if not nodes:
+            return nodes, np.zeros((0, 0), dtype=DTYPE)
+
+        matrix = np.memmap(
+            path,
+            dtype=DTYPE,
+            mode="r",
+            offset=_matrix_offset(length),
+            shape=(len(nodes), len(nodes)),
+        )
+        return nodes, matrix
+
+    def save(self, version: str, nodes: List[str], matrix: np.ndarray) -> None:
+        """Atomically write the snapshot and drop snapshots of older versions."""
+        os.makedirs(self.directory, exist_ok=True)
+
+        header = json.dumps({"version": version, "nodes": list(nodes)}).encode()
+        padding = _matrix_offset(len(header)) - PREFIX_LENGTH - len(header)
+        encoded = header + b" " * padding
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as snapshot:
+                snapshot.write(MAGIC)
+                snapshot.write(HEADER_LENGTH.pack(len(encoded)))
+                snapshot.write(encoded)
+                snapshot.write(np.ascontiguousarray(matrix, dtype=DTYPE).tobytes())
+            os.replace(tmp_path, self._path(version))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        current = os.path.basename(self._path(version))
+        for name in os.listdir(self.directory):
+            if name.startswith("mood_graph-") and name != current:
+                try:
+                    # Mapped pages stay valid for workers still using them
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
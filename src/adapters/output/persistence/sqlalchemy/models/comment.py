@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from infrastructure.database import db
@@ -10,6 +10,14 @@ class CommentModel(db.Model):
     """SQLAlchemy model for comments."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        Index(
+            "ix_comments_establishment_id_created_at_id",
+            "establishment_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     establishment_id = Column(Integer, ForeignKey("establishments.id"), nullable=False)
@@ -1,10 +1,36 @@
 from datetime import datetime
+from functools import lru_cache
 from typing import List
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import aliased, relationship
 
+from domain.models.comment import MAX_RATING, MIN_RATING, RatingStats
 from domain.models.establishment import Establishment, EstablishmentTag
 from .base import Base
+from .comment import CommentModel
+
+# Most recent comments embedded in establishment payloads; older ones are
+# paginated through the comments endpoint
+LATEST_COMMENTS = 3
+
+# Comments numbered from newest to oldest within each establishment
+_comments = CommentModel.__table__
+_comment_recency = select(
+    _comments,
+    func.row_number()
+    .over(
+        partition_by=_comments.c.establishment_id,
+        order_by=(_comments.c.created_at.desc(), _comments.c.id.desc()),
+    )
+    .label("recency"),
+).subquery("comment_recency")
+
+
+@lru_cache(maxsize=None)
+def _recent_comment():
+    """CommentModel mapped onto the recency subquery, built once on first use."""
+    return aliased(CommentModel, _comment_recency)
 
 
 class EstablishmentModel(Base):
@@ -19,18 +45,42 @@ class EstablishmentModel(Base):
 
     tags = relationship("EstablishmentTagModel", back_populates="establishment")
     comments = relationship("CommentModel", back_populates="establishment")
+    latest_comments = relationship(
+        _recent_comment,
+        primaryjoin=lambda: and_(
+            _recent_comment().establishment_id == EstablishmentModel.id,
+            _comment_recency.c.recency <= LATEST_COMMENTS,
+        ),
+        order_by=lambda: _comment_recency.c.recency,
+        viewonly=True,
+    )
+    rating_stats = relationship(
+        "EstablishmentRatingStatsModel", uselist=False, viewonly=True
+    )
     _score = None  # Transient attribute for score
 
-    def to_domain(self) -> Establishment:
-        """Convert to domain model."""
+    def to_domain(self, include_comments: bool = True) -> Establishment:
+        """
+        Convert to domain model, optionally without touching comments.
+
+        Only the latest LATEST_COMMENTS comments are included; the total is
+        carried by the rating aggregate.
+        """
+        comments = None
+        if include_comments:
+            comments = [comment.to_domain() for comment in self.latest_comments]
+
         return Establishment(
             id=self.id,
             name=self.name,
             description=self.description,
             tags=[tag.to_domain() for tag in self.tags],
-            comments=[comment.to_domain() for comment in self.comments],
+            comments=comments,
             score=self._score,
             created_at=self.created_at,
+            rating_stats=(
+                self.rating_stats.to_domain() if self.rating_stats else RatingStats()
+            ),
         )
 
     @staticmethod
@@ -48,6 +98,15 @@ class EstablishmentTagModel(Base):
     """SQLAlchemy model for establishment tags."""
 
     __tablename__ = "establishment_tags"
+    __table_args__ = (
+        # Tag lookups in searches; count is carried along for index-only scans
+        Index(
+            "ix_establishment_tags_tag_name_establishment_id",
+            "tag_name",
+            "establishment_id",
+            postgresql_include=["count"],
+        ),
+    )
 
     establishment_id = Column(
         Integer, ForeignKey("establishments.id"), primary_key=True
@@ -61,3 +120,66 @@ class EstablishmentTagModel(Base):
     def to_domain(self) -> EstablishmentTag:
         """Convert to domain model."""
         return EstablishmentTag(tag_name=self.tag_name, count=self.count)
+
+
+class EstablishmentMoodScoreModel(Base):
+    """
+    SQLAlchemy model for materialized mood affinities of establishments.
+
+    Holds sum(count(tag) * closure(mood, tag)) over the tags of an
+    establishment, the tag itself counting with weight 1.
+    """
+
+    __tablename__ = "establishment_mood_scores"
+    __table_args__ = (
+        Index(
+            "ix_establishment_mood_scores_tag_name_establishment_id",
+            "tag_name",
+            "establishment_id",
+            postgresql_include=["score"],
+        ),
+    )
+
+    establishment_id = Column(
+        Integer, ForeignKey("establishments.id"), primary_key=True
+    )
+    tag_name = Column(String(50), ForeignKey("tags.name"), primary_key=True)
+    score = Column(Float, nullable=False, default=0.0)
+
+
+RATING_COLUMNS = [f"rating_{rating}" for rating in range(MIN_RATING, MAX_RATING + 1)]
+
+
+class EstablishmentRatingStatsModel(Base):
+    """
+    SQLAlchemy model for rating aggregates of establishments.
+
+    Maintained by the comment repository in the same transaction as each
+    comment, with one histogram column per possible rating.
+    """
+
+    __tablename__ = "establishment_rating_stats"
+
+    establishment_id = Column(
+        Integer, ForeignKey("establishments.id"), primary_key=True
+    )
+    rating_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    rating_6 = Column(Integer, nullable=False, default=0)
+    rating_7 = Column(Integer, nullable=False, default=0)
+    rating_8 = Column(Integer, nullable=False, default=0)
+    rating_9 = Column(Integer, nullable=False, default=0)
+    rating_10 = Column(Integer, nullable=False, default=0)
+
+    def to_domain(self) -> RatingStats:
+        """Convert to domain model."""
+        return RatingStats(
+            count=self.rating_count,
+            total=self.rating_sum,
+            histogram=[getattr(self, name) for name in RATING_COLUMNS],
+        )
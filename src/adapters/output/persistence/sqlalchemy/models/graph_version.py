@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+
+from .base import Base
+
+MOOD_GRAPH = "mood_graph"
+SESSION_REVOCATIONS = "session_revocations"
+
+
+class GraphVersionModel(Base):
+    """SQLAlchemy model for generation counters of data workers cache."""
+
+    __tablename__ = "graph_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Float, Integer, LargeBinary
+
+from .base import Base
+
+
+class RevokedSessionModel(Base):
+    """SQLAlchemy model for logged out sessions of stateless authentication."""
+
+    __tablename__ = "revoked_sessions"
+
+    id = Column(Integer, primary_key=True)
+    session_key = Column(LargeBinary(16), nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
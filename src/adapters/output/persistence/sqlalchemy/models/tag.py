@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, ForeignKey
+from sqlalchemy import Column, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from domain.models.tag import Tag, TagRelationship
@@ -27,6 +27,13 @@ class TagRelationshipModel(Base):
     """SQLAlchemy model for tag relationships."""
 
     __tablename__ = "tag_relationships"
+    __table_args__ = (
+        Index(
+            "ix_tag_relationships_target_tag_name_source_tag_name",
+            "target_tag_name",
+            "source_tag_name",
+        ),
+    )
 
     source_tag_name = Column(String(50), ForeignKey("tags.name"), primary_key=True)
     target_tag_name = Column(String(50), ForeignKey("tags.name"), primary_key=True)
@@ -38,7 +45,17 @@ class TagRelationshipModel(Base):
     def to_domain(self) -> TagRelationship:
         """Convert to domain model."""
         return TagRelationship(
+            id=None,
             source_tag_name=self.source_tag_name,
             target_tag_name=self.target_tag_name,
             weight=self.weight,
         )
+
+    @staticmethod
+    def from_domain(relationship: TagRelationship) -> "TagRelationshipModel":
+        """Create from domain model."""
+        return TagRelationshipModel(
+            source_tag_name=relationship.source_tag_name,
+            target_tag_name=relationship.target_tag_name,
+            weight=relationship.weight,
+        )
@@ -1,9 +1,16 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
-from domain.models.comment import Comment
+from domain.models.comment import Comment, RatingStats
 from domain.ports.output.comment_repository import CommentRepositoryPort
 from adapters.output.persistence.sqlalchemy.models.comment import CommentModel
+from adapters.output.persistence.sqlalchemy.models.establishment import (
+    RATING_COLUMNS,
+    EstablishmentRatingStatsModel,
+)
+from adapters.output.persistence.sqlalchemy.repositories.upsert import dialect_insert
 
 
 class SQLAlchemyCommentRepository(CommentRepositoryPort):
@@ -13,9 +20,10 @@ class SQLAlchemyCommentRepository(CommentRepositoryPort):
         self.session = session
 
     def save(self, comment: Comment) -> Comment:
-        """Save a comment to the database."""
+        """Save a comment and count its rating in the same transaction."""
         comment_model = CommentModel.from_domain(comment)
         self.session.add(comment_model)
+        self._add_rating(comment.establishment_id, comment.rating)
         self.session.commit()
         return comment_model.to_domain()
 
@@ -26,4 +34,78 @@ class SQLAlchemyCommentRepository(CommentRepositoryPort):
             .filter_by(establishment_id=establishment_id)
             .all()
         )
-        return [model.to_domain() for model in comment_models] 
\ No newline at end of file
+        return [model.to_domain() for model in comment_models]
+
+    def get_page(
+        self,
+        establishment_id: int,
+        limit: int,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+    ) -> List[Comment]:
+        """Get comments newest first, seeking on (establishment_id, created_at, id)."""
+        query = self.session.query(CommentModel).filter(
+            CommentModel.establishment_id == establishment_id
+        )
+        if before is not None:
+            if before_id is None:
+                query = query.filter(CommentModel.created_at < before)
+            else:
+                query = query.filter(
+                    or_(
+                        CommentModel.created_at < before,
+                        and_(
+                            CommentModel.created_at == before,
+                            CommentModel.id < before_id,
+                        ),
+                    )
+                )
+
+        comment_models = (
+            query.order_by(CommentModel.created_at.desc(), CommentModel.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [model.to_domain() for model in comment_models]
+
+    def get_rating_stats(self, establishment_id: int) -> RatingStats:
+        """Get the rating aggregate of an establishment."""
+        stats_model = self.session.get(EstablishmentRatingStatsModel, establishment_id)
+        return stats_model.to_domain() if stats_model else RatingStats()
+
+    def _add_rating(self, establishment_id: int, rating: int) -> None:
+        """Increment the rating aggregate with a single upsert, without committing."""
+        stats = EstablishmentRatingStatsModel
+        bucket = f"rating_{rating}"
+        insert = dialect_insert(self.session)
+        if insert is None:
+            stats_model = self.session.get(stats, establishment_id)
+            if stats_model is None:
+                stats_model = stats(
+                    establishment_id=establishment_id,
+                    rating_count=0,
+                    rating_sum=0,
+                    **{name: 0 for name in RATING_COLUMNS},
+                )
+                self.session.add(stats_model)
+            stats_model.rating_count += 1
+            stats_model.rating_sum += rating
+            setattr(stats_model, bucket, getattr(stats_model, bucket) + 1)
+            return
+
+        statement = insert(stats).values(
+            establishment_id=establishment_id,
+            rating_count=1,
+            rating_sum=rating,
+            **{bucket: 1},
+        )
+        self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[stats.establishment_id],
+                set_={
+                    "rating_count": stats.rating_count + 1,
+                    "rating_sum": stats.rating_sum + rating,
+                    bucket: getattr(stats, bucket) + 1,
+                },
+            )
+        )
@@ -1,22 +1,112 @@
-from typing import List, Optional, Dict
+import json
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Tuple
 
-from sqlalchemy import func, case, Float, cast, and_, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, case, Float, cast, and_, or_, select
+from sqlalchemy import Integer, String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, joinedload, noload, selectinload
 
 from adapters.output.persistence.sqlalchemy.models.establishment import (
     EstablishmentModel,
+    EstablishmentMoodScoreModel,
+    EstablishmentRatingStatsModel,
     EstablishmentTagModel,
+    RATING_COLUMNS,
+)
+from adapters.output.persistence.sqlalchemy.models.tag import (
+    TagModel,
+    TagRelationshipModel,
+)
+from adapters.output.persistence.sqlalchemy.models.graph_version import MOOD_GRAPH
+from adapters.output.persistence.sqlalchemy.repositories.mood_scores import (
+    add_mood_scores,
+)
+from adapters.output.persistence.sqlalchemy.repositories.upsert import dialect_insert
+from adapters.output.persistence.sqlalchemy.repositories.versions import get_version
+from adapters.output.search.scoring_engine import ScoringEngine
+from domain.services.graph_version import CachedVersion
+from domain.models.comment import RatingStats
+from domain.models.establishment import (
+    Establishment,
+    EstablishmentSearchResult,
+    EstablishmentTag,
+    SearchHit,
 )
-from adapters.output.persistence.sqlalchemy.models.tag import TagRelationshipModel
-from domain.models.establishment import Establishment, EstablishmentTag
 from domain.ports.output.establishment_repository import EstablishmentRepositoryPort
 
+# Rows per upsert statement; 3 bind parameters per row stays below the
+# 32766 parameter limit of SQLite and the 65535 limit of PostgreSQL
+MAX_UPSERT_ROWS = 10000
+
+# Same scoring as the generic get_by_tags query, with the query tags passed as
+# two bound arrays so the statement text never changes and PostgreSQL can reuse
+# one prepared plan. Per tag, the multiplier is its own weight (counted once
+# per relationship leading to it from another query tag, at least once) plus
+# relationship weight * source weight over relationships from query tags.
+POSTGRESQL_RANKED_BY_TAGS = text("""
+    WITH query AS (
+        SELECT q.tag_name, q.weight
+        FROM unnest(:tag_names, :weights) AS q(tag_name, weight)
+    ),
+    related AS (
+        SELECT r.target_tag_name AS tag_name, r.weight * q.weight AS multiplier
+        FROM tag_relationships r
+        JOIN query q ON q.tag_name = r.source_tag_name
+    ),
+    multipliers AS (
+        SELECT tag_name, sum(multiplier) AS multiplier
+        FROM (
+            SELECT
+                q.tag_name,
+                q.weight * greatest(
+                    1, (SELECT count(*) FROM related WHERE related.tag_name = q.tag_name)
+                ) AS multiplier
+            FROM query q
+            UNION ALL
+            SELECT tag_name, multiplier FROM related
+        ) AS contributions
+        GROUP BY tag_name
+    )
+    SELECT et.establishment_id AS id, sum(et.count * m.multiplier) AS total_score
+    FROM establishment_tags et
+    JOIN multipliers m ON m.tag_name = et.tag_name
+    GROUP BY et.establishment_id
+    HAVING sum(et.count * m.multiplier) > 0
+    ORDER BY total_score DESC, et.establishment_id
+    LIMIT :limit
+    """).bindparams(
+    bindparam("tag_names", type_=ARRAY(String)),
+    bindparam("weights", type_=ARRAY(Float)),
+    bindparam("limit", type_=Integer),
+)
+
 
 class SQLAlchemyEstablishmentRepository(EstablishmentRepositoryPort):
-    """SQLAlchemy implementation of EstablishmentRepositoryPort."""
+    """
+    SQLAlchemy implementation of EstablishmentRepositoryPort.
+
+    Given ``mood_affinities`` (tag name -> closure weight of every mood leading
+    to it), tag writes also maintain the establishment_mood_scores table in the
+    same transaction, and searches become a single indexed sum over it.
+    """
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        scoring_engine: Optional[ScoringEngine] = None,
+        version_ttl: float = 5.0,
+        reload_interval: float = 60.0,
+        mood_affinities: Optional[Callable[[str], Dict[str, float]]] = None,
+    ):
         self.session = session
+        self.scoring_engine = scoring_engine
+        self.mood_affinities = mood_affinities
+        self.reload_interval = reload_interval
+        self._engine_loaded_at: Optional[float] = None
+        self._engine_graph_version: Optional[int] = None
+        self._graph_version = CachedVersion(self._get_graph_version, ttl=version_ttl)
 
     def save(self, establishment: Establishment) -> Establishment:
         """Save an establishment to the database."""
@@ -25,17 +115,63 @@ class SQLAlchemyEstablishmentRepository(EstablishmentRepositoryPort):
         self.session.commit()
         return establishment_model.to_domain()
 
-    def get_by_id(self, establishment_id: int) -> Optional[Establishment]:
+    def get_by_id(
+        self, establishment_id: int, include_comments: bool = True
+    ) -> Optional[Establishment]:
         """Get an establishment by ID."""
         establishment_model = (
             self.session.query(EstablishmentModel)
-            .options(joinedload(EstablishmentModel.tags))
+            .options(*self._loader_options(include_comments))
             .get(establishment_id)
         )
-        return establishment_model.to_domain() if establishment_model else None
+        if not establishment_model:
+            return None
+        return establishment_model.to_domain(include_comments=include_comments)
+
+    def get_all(self, include_comments: bool = True) -> List[Establishment]:
+        """Get all establishments."""
+        establishment_models = (
+            self.session.query(EstablishmentModel)
+            .options(*self._loader_options(include_comments))
+            .order_by(EstablishmentModel.id)
+            .all()
+        )
+        return [
+            model.to_domain(include_comments=include_comments)
+            for model in establishment_models
+        ]
+
+    def get_page(
+        self, limit: int, after: Optional[int] = None, include_comments: bool = True
+    ) -> List[Establishment]:
+        """Get establishments ordered by ID, using keyset pagination."""
+        query = self.session.query(EstablishmentModel).options(
+            *self._loader_options(include_comments)
+        )
+        if after is not None:
+            query = query.filter(EstablishmentModel.id > after)
+
+        establishment_models = query.order_by(EstablishmentModel.id).limit(limit).all()
+        return [
+            model.to_domain(include_comments=include_comments)
+            for model in establishment_models
+        ]
+
+    def iter_all(
+        self, batch_size: int = 500, include_comments: bool = True
+    ) -> Iterator[Establishment]:
+        """Stream all establishments ordered by ID, fetching them in batches."""
+        query = (
+            self.session.query(EstablishmentModel)
+            .options(*self._loader_options(include_comments, streaming=True))
+            .order_by(EstablishmentModel.id)
+            .yield_per(batch_size)
+        )
+        for establishment_model in query:
+            yield establishment_model.to_domain(include_comments=include_comments)
 
     def add_tag(self, establishment_id: int, tag_name: str) -> EstablishmentTag:
-        """Add or increment a tag count for an establishment."""
+        """Add or increment a tag count for an establishment, creating the tag."""
         tag_model = (
             self.session.query(EstablishmentTagModel)
             .filter_by(establishment_id=establishment_id, tag_name=tag_name)
@@ -45,17 +181,151 @@ class SQLAlchemyEstablishmentRepository(EstablishmentRepositoryPort):
         if tag_model:
             tag_model.count += 1
         else:
+            if self.get_missing_ids([establishment_id]):
+                raise ValueError(f"Establishment with id {establishment_id} not found")
+            if self.session.get(TagModel, tag_name) is None:
+                self.session.add(TagModel(name=tag_name))
             tag_model = EstablishmentTagModel(
                 establishment_id=establishment_id, tag_name=tag_name, count=1
             )
             self.session.add(tag_model)
 
+        if self.mood_affinities is not None:
+            add_mood_scores(
+                self.session,
+                self._mood_score_increments({(establishment_id, tag_name): 1}),
+            )
         self.session.commit()
+
+        if self.scoring_engine is not None and self._engine_loaded_at is not None:
+            self.scoring_engine.add_tag(establishment_id, tag_name)
+
         return tag_model.to_domain()
 
+    def add_tags(self, tag_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Increment many tag counts in a single transaction.
+
+        Missing tags are created with one INSERT ... ON CONFLICT DO NOTHING and
+        all counts are applied with one INSERT ... ON CONFLICT DO UPDATE (split
+        every MAX_UPSERT_ROWS rows to stay under bind parameter limits), on
+        PostgreSQL and SQLite alike. Other databases fall back to updating
+        rows one at a time, still within the same transaction.
+
+        Raises:
+            ValueError: If a referenced establishment doesn't exist
+        """
+        if not tag_counts:
+            return
+
+        # Checked up front: SQLite doesn't enforce foreign keys by default
+        missing_ids = self.get_missing_ids(
+            {establishment_id for establishment_id, _ in tag_counts}
+        )
+        if missing_ids:
+            raise ValueError(f"Establishments with ids {missing_ids} not found")
+
+        # Sorted rows make concurrent batches lock rows in the same order
+        tag_names = sorted({tag_name for _, tag_name in tag_counts})
+        rows = [
+            {"establishment_id": establishment_id, "tag_name": tag_name, "count": count}
+            for (establishment_id, tag_name), count in sorted(tag_counts.items())
+        ]
+
+        insert = dialect_insert(self.session)
+        try:
+            if insert is not None:
+                self.session.execute(
+                    insert(TagModel)
+                    .values([{"name": tag_name} for tag_name in tag_names])
+                    .on_conflict_do_nothing(index_elements=[TagModel.name])
+                )
+                for start in range(0, len(rows), MAX_UPSERT_ROWS):
+                    statement = insert(EstablishmentTagModel).values(
+                        rows[start : start + MAX_UPSERT_ROWS]
+                    )
+                    self.session.execute(
+                        statement.on_conflict_do_update(
+                            index_elements=[
+                                EstablishmentTagModel.establishment_id,
+                                EstablishmentTagModel.tag_name,
+                            ],
+                            set_={
+                                "count": EstablishmentTagModel.count
+                                + statement.excluded.count
+                            },
+                        )
+                    )
+            else:
+                self._add_tags_row_by_row(tag_names, rows)
+            if self.mood_affinities is not None:
+                add_mood_scores(self.session, self._mood_score_increments(tag_counts))
+            self.session.commit()
+        except IntegrityError:
+            # An establishment was deleted since the check
+            self.session.rollback()
+            raise ValueError("Batch references an establishment that doesn't exist")
+
+        if self.scoring_engine is not None and self._engine_loaded_at is not None:
+            for (establishment_id, tag_name), count in tag_counts.items():
+                self.scoring_engine.add_tag(establishment_id, tag_name, count)
+
+    def get_missing_ids(self, establishment_ids: Iterable[int]) -> List[int]:
+        """Get the IDs among the given ones that no establishment has, ascending."""
+        ids = sorted(set(establishment_ids))
+        existing = set()
+        for start in range(0, len(ids), MAX_UPSERT_ROWS):
+            existing.update(
+                id_
+                for (id_,) in self.session.query(EstablishmentModel.id).filter(
+                    EstablishmentModel.id.in_(ids[start : start + MAX_UPSERT_ROWS])
+                )
+            )
+        return [id_ for id_ in ids if id_ not in existing]
+
+    def _mood_score_increments(
+        self, tag_counts: Dict[Tuple[int, str], int]
+    ) -> Dict[Tuple[int, str], float]:
+        """Mood score changes caused by tag count increments."""
+        affinities: Dict[str, Dict[str, float]] = {}
+        increments: Dict[Tuple[int, str], float] = {}
+        for (establishment_id, tag_name), count in tag_counts.items():
+            if tag_name not in affinities:
+                affinities[tag_name] = self.mood_affinities(tag_name)
+            for mood, weight in affinities[tag_name].items():
+                key = (establishment_id, mood)
+                increments[key] = increments.get(key, 0.0) + count * weight
+        return increments
+
+    def _add_tags_row_by_row(self, tag_names: List[str], rows: List[Dict]) -> None:
+        """Portable version of the batch upsert, without committing."""
+        existing = {
+            name
+            for (name,) in self.session.query(TagModel.name).filter(
+                TagModel.name.in_(tag_names)
+            )
+        }
+        self.session.add_all(
+            TagModel(name=tag_name)
+            for tag_name in tag_names
+            if tag_name not in existing
+        )
+        for row in rows:
+            tag_model = self.session.query(EstablishmentTagModel).get(
+                (row["establishment_id"], row["tag_name"])
+            )
+            if tag_model:
+                tag_model.count += row["count"]
+            else:
+                self.session.add(EstablishmentTagModel(**row))
+        self.session.flush()
+
     def get_by_tags(
-        self, tag_weights: Dict[str, float], limit: int = 10
-    ) -> List[Establishment]:
+        self,
+        tag_weights: Dict[str, float],
+        limit: int = 10,
+        include_comments: bool = True,
+    ) -> List[SearchHit]:
         """
         Get establishments by tags and their weights, considering tag relationships.
 
@@ -64,7 +334,34 @@ class SQLAlchemyEstablishmentRepository(EstablishmentRepositoryPort):
         2. Calculates scores based on both direct matches and related tags
         3. Orders results by the total weighted score
         4. Returns the top N results with their scores
+
+        With an in-process scoring engine configured, scoring happens in memory
+        and only the top N establishments are loaded from the database. With
+        materialized mood scores, scoring is one indexed sum over them and uses
+        the full mood graph closure instead of direct relationships only.
+
+        On PostgreSQL, tags and weights are bound as arrays and unnested in a
+        constant statement (see POSTGRESQL_RANKED_BY_TAGS); other databases
+        build the weights into CASE expressions.
+
+        Without comments, results are lightweight EstablishmentSearchResult
+        objects built from a column-only projection instead of ORM models.
         """
+        if self.scoring_engine is not None or self.mood_affinities is not None:
+            if self.scoring_engine is not None:
+                self._refresh_scoring_engine()
+                ranked = self.scoring_engine.top_k(tag_weights, limit)
+            else:
+                ranked = self._rank_by_mood_scores(tag_weights, limit)
+            if not include_comments and ranked:
+                ids = [id_ for id_, _ in ranked]
+                score = case(dict(ranked), value=EstablishmentModel.id)
+                return self._project(score, EstablishmentModel.id.in_(ids))
+            return self._hydrate(ranked, include_comments)
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            return self._get_by_tags_postgresql(tag_weights, limit, include_comments)
+
         direct_score_cases = []
         for tag_name, weight in tag_weights.items():
             direct_score_cases.append(
@@ -104,38 +401,246 @@ class SQLAlchemyEstablishmentRepository(EstablishmentRepositoryPort):
 
         total_score = (direct_score + related_score).label("total_score")
 
+        relationship_join = and_(
+            TagRelationshipModel.source_tag_name.in_(tag_weights.keys()),
+            EstablishmentTagModel.tag_name == TagRelationshipModel.target_tag_name,
+        )
+        tag_filter = or_(
+            EstablishmentTagModel.tag_name.in_(tag_weights.keys()),
+            relationship_join,
+        )
+
+        if not include_comments:
+            ranked = (
+                select(
+                    EstablishmentTagModel.establishment_id.label("id"),
+                    total_score,
+                )
+                .outerjoin(TagRelationshipModel, relationship_join)
+                .where(tag_filter)
+                .group_by(EstablishmentTagModel.establishment_id)
+                .having(total_score > 0)
+                .order_by(total_score.desc())
+                .limit(limit)
+                .subquery()
+            )
+            return self._project(
+                ranked.c.total_score, ranked.c.id == EstablishmentModel.id, ranked
+            )
+
         query = (
             self.session.query(EstablishmentModel, total_score)
             .join(EstablishmentTagModel)
-            .outerjoin(
-                TagRelationshipModel,
-                and_(
-                    TagRelationshipModel.source_tag_name.in_(tag_weights.keys()),
-                    EstablishmentTagModel.tag_name
-                    == TagRelationshipModel.target_tag_name,
-                ),
-            )
-            .filter(
-                or_(
-                    EstablishmentTagModel.tag_name.in_(tag_weights.keys()),
-                    and_(
-                        TagRelationshipModel.source_tag_name.in_(tag_weights.keys()),
-                        EstablishmentTagModel.tag_name
-                        == TagRelationshipModel.target_tag_name,
-                    ),
-                )
-            )
+            .outerjoin(TagRelationshipModel, relationship_join)
+            .filter(tag_filter)
             .group_by(EstablishmentModel)
             .having(total_score > 0)
             .order_by(total_score.desc())
             .limit(limit)
         )
 
-        results = query.options(joinedload(EstablishmentModel.tags)).all()
+        results = query.options(*self._loader_options(include_comments)).all()
 
         establishments = []
         for establishment_model, score in results:
             establishment_model._score = float(score)
-            establishments.append(establishment_model.to_domain())
+            establishments.append(
+                establishment_model.to_domain(include_comments=include_comments)
+            )
+
+        return establishments
+
+    def _project(
+        self, score, condition, ranked=None
+    ) -> List[EstablishmentSearchResult]:
+        """
+        Build search results from plain column tuples, best score first.
+
+        Selects only id, name, description, score, the rating aggregate and the
+        tags aggregated into one JSON array per establishment (a correlated
+        subquery, so no GROUP BY over the outer columns is needed), skipping
+        ORM identity-map and attribute instrumentation work entirely.
+
+        Args:
+            score: Column expression holding each establishment's score
+            condition: Restricts establishments to the ranked ones
+            ranked: Ranked subquery to join on, if the score comes from one
+        """
+        tags = aliased(EstablishmentTagModel)
+        if self.session.get_bind().dialect.name == "postgresql":
+            tags_json = func.json_agg(
+                func.json_build_object("tag_name", tags.tag_name, "count", tags.count)
+            )
+        else:
+            tags_json = func.json_group_array(
+                func.json_object("tag_name", tags.tag_name, "count", tags.count)
+            )
+
+        tags_json = (
+            select(tags_json)
+            .where(tags.establishment_id == EstablishmentModel.id)
+            .scalar_subquery()
+        )
+        stats = EstablishmentRatingStatsModel
+        query = select(
+            EstablishmentModel.id,
+            EstablishmentModel.name,
+            EstablishmentModel.description,
+            score,
+            tags_json,
+            stats.rating_count,
+            stats.rating_sum,
+            *[getattr(stats, name) for name in RATING_COLUMNS],
+        ).order_by(score.desc(), EstablishmentModel.id)
+        if ranked is not None:
+            query = query.join(ranked, condition)
+        else:
+            query = query.where(condition)
+        query = query.outerjoin(stats, stats.establishment_id == EstablishmentModel.id)
+
+        results = []
+        for row in self.session.execute(query):
+            id_, name, description, row_score, tag_rows, count, total = row[:7]
+            if isinstance(tag_rows, str):
+                tag_rows = json.loads(tag_rows)
+            rating_stats = RatingStats()
+            if count is not None:
+                rating_stats = RatingStats(count, total, list(row[7:]))
+            results.append(
+                EstablishmentSearchResult(
+                    id=id_,
+                    name=name,
+                    description=description,
+                    tags=[
+                        EstablishmentTag(tag_name=tag["tag_name"], count=tag["count"])
+                        for tag in tag_rows
+                    ],
+                    score=float(row_score),
+                    rating_stats=rating_stats,
+                )
+            )
+        return results
+
+    def _get_by_tags_postgresql(
+        self, tag_weights: Dict[str, float], limit: int, include_comments: bool
+    ) -> List[SearchHit]:
+        """Score with the constant, array-parameterized PostgreSQL statement."""
+        ranked = POSTGRESQL_RANKED_BY_TAGS.bindparams(
+            tag_names=list(tag_weights.keys()),
+            weights=[float(weight) for weight in tag_weights.values()],
+            limit=limit,
+        ).columns(id=Integer, total_score=Float)
+
+        if not include_comments:
+            ranked = ranked.subquery("ranked")
+            return self._project(
+                ranked.c.total_score, ranked.c.id == EstablishmentModel.id, ranked
+            )
+
+        rows = self.session.execute(ranked)
+        return self._hydrate(
+            [(id_, float(score)) for id_, score in rows], include_comments
+        )
+
+    def _rank_by_mood_scores(
+        self, tag_weights: Dict[str, float], limit: int
+    ) -> List[Tuple[int, float]]:
+        """Best (establishment_id, score) pairs from the materialized mood scores."""
+        scores = EstablishmentMoodScoreModel
+        total_score = func.sum(
+            scores.score * case(tag_weights, value=scores.tag_name, else_=0.0)
+        )
+        rows = (
+            self.session.query(scores.establishment_id, total_score)
+            .filter(scores.tag_name.in_(tag_weights.keys()))
+            .group_by(scores.establishment_id)
+            .having(total_score > 0)
+            .order_by(total_score.desc(), scores.establishment_id)
+            .limit(limit)
+        )
+        return [(establishment_id, float(score)) for establishment_id, score in rows]
+
+    @staticmethod
+    def _loader_options(include_comments: bool, streaming: bool = False) -> list:
+        """
+        Eager loading strategy for establishment relationships.
+
+        Tags and rating aggregates are always needed and are joined in, except
+        for streamed queries where joined collections can't be combined with
+        yield_per. The latest comments are either loaded with one extra IN query
+        for the whole result set or not loaded at all, so a query never fires
+        one lazy load per establishment.
+        """
+        tags = EstablishmentModel.tags
+        stats = EstablishmentModel.rating_stats
+        if streaming:
+            options = [selectinload(tags), selectinload(stats)]
+        else:
+            options = [joinedload(tags), joinedload(stats)]
+        if include_comments:
+            options.append(selectinload(EstablishmentModel.latest_comments))
+        else:
+            options.append(noload(EstablishmentModel.latest_comments))
+        return options
+
+    def _hydrate(
+        self, ranked: List[Tuple[int, float]], include_comments: bool = True
+    ) -> List[Establishment]:
+        """Load establishments for (id, score) pairs, keeping their order."""
+        if not ranked:
+            return []
+
+        models = (
+            self.session.query(EstablishmentModel)
+            .options(*self._loader_options(include_comments))
+            .filter(EstablishmentModel.id.in_([id_ for id_, _ in ranked]))
+            .all()
+        )
+        by_id = {model.id: model for model in models}
+
+        establishments = []
+        for establishment_id, score in ranked:
+            establishment_model = by_id.get(establishment_id)
+            if establishment_model is None:
+                continue
+            establishment_model._score = score
+            establishments.append(
+                establishment_model.to_domain(include_comments=include_comments)
+            )
 
         return establishments
+
+    def _refresh_scoring_engine(self) -> None:
+        """
+        Load the scoring engine on first use and periodically afterwards.
+
+        Writes made by this process are applied to the engine directly; the
+        periodic reload picks up tags added by other processes, and relationship
+        changes are detected through the graph version counter.
+        """
+        now = time.monotonic()
+        if (
+            self._engine_loaded_at is None
+            or now - self._engine_loaded_at >= self.reload_interval
+        ):
+            version = self._graph_version.get()
+            tag_counts = self.session.query(
+                EstablishmentTagModel.establishment_id,
+                EstablishmentTagModel.tag_name,
+                EstablishmentTagModel.count,
+            ).all()
+            self.scoring_engine.load(tag_counts, self._get_relationships())
+            self._engine_graph_version = version
+            self._engine_loaded_at = now
+            return
+
+        version = self._graph_version.get()
+        if version != self._engine_graph_version:
+            self.scoring_engine.set_relationships(self._get_relationships())
+            self._engine_graph_version = version
+
+    def _get_relationships(self):
+        return [model.to_domain() for model in self.session.query(TagRelationshipModel)]
+
+    def _get_graph_version(self) -> int:
+        return get_version(self.session, MOOD_GRAPH)
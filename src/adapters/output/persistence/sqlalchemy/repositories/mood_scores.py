@@ -0,0 +1,111 @@
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session
+
+from adapters.output.persistence.sqlalchemy.models.establishment import (
+    EstablishmentMoodScoreModel,
+    EstablishmentTagModel,
+)
+from adapters.output.persistence.sqlalchemy.repositories.upsert import dialect_insert
+
+MOOD_SCORE_KEYS = [
+    EstablishmentMoodScoreModel.establishment_id,
+    EstablishmentMoodScoreModel.tag_name,
+]
+
+
+def add_mood_scores(session: Session, scores: Dict[Tuple[int, str], float]) -> None:
+    """
+    Add to materialized mood scores, creating missing rows. Doesn't commit.
+
+    Args:
+        session: Session whose transaction the change joins
+        scores: Score to add per (establishment_id, mood) pair
+    """
+    if not scores:
+        return
+
+    rows = [
+        {"establishment_id": establishment_id, "tag_name": mood, "score": score}
+        for (establishment_id, mood), score in sorted(scores.items())
+    ]
+    insert = dialect_insert(session)
+    if insert is None:
+        for row in rows:
+            _add_row(session, row["establishment_id"], row["tag_name"], row["score"])
+        session.flush()
+        return
+
+    statement = insert(EstablishmentMoodScoreModel).values(rows)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=MOOD_SCORE_KEYS,
+            set_={
+                "score": EstablishmentMoodScoreModel.score + statement.excluded.score
+            },
+        )
+    )
+
+
+def apply_affinity_changes(
+    session: Session, changes: Dict[Tuple[str, str], float]
+) -> None:
+    """
+    Propagate changed mood -> tag affinities to every establishment. Doesn't commit.
+
+    Each change adds ``count * increase`` to the mood score of every
+    establishment carrying the tag, computed by the database with one
+    INSERT ... SELECT per changed pair.
+
+    Args:
+        session: Session whose transaction the change joins
+        changes: Affinity increase per (mood, tag) pair
+    """
+    insert = dialect_insert(session)
+    for (mood, tag_name), increase in sorted(changes.items()):
+        source = select(
+            EstablishmentTagModel.establishment_id,
+            literal(mood),
+            EstablishmentTagModel.count * increase,
+        ).where(EstablishmentTagModel.tag_name == tag_name)
+
+        if insert is None:
+            for establishment_id, _, score in session.execute(source):
+                _add_row(session, establishment_id, mood, score)
+            session.flush()
+            continue
+
+        statement = insert(EstablishmentMoodScoreModel).from_select(
+            ["establishment_id", "tag_name", "score"], source
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=MOOD_SCORE_KEYS,
+                set_={
+                    "score": EstablishmentMoodScoreModel.score
+                    + statement.excluded.score
+                },
+            )
+        )
+
+
+def rebuild_mood_scores(
+    session: Session, affinities: Iterable[Tuple[Tuple[str, str], float]]
+) -> None:
+    """Recompute all materialized mood scores from scratch. Doesn't commit."""
+    affinities = dict(affinities)
+    session.query(EstablishmentMoodScoreModel).delete(synchronize_session=False)
+    apply_affinity_changes(session, affinities)
+
+
+def _add_row(session: Session, establishment_id: int, mood: str, score: float) -> None:
+    model = session.get(EstablishmentMoodScoreModel, (establishment_id, mood))
+    if model is None:
+        session.add(
+            EstablishmentMoodScoreModel(
+                establishment_id=establishment_id, tag_name=mood, score=score
+            )
+        )
+    else:
+        model.score += score
@@ -0,0 +1,58 @@
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from adapters.output.persistence.sqlalchemy.models.graph_version import (
+    SESSION_REVOCATIONS,
+)
+from adapters.output.persistence.sqlalchemy.models.revoked_session import (
+    RevokedSessionModel,
+)
+from adapters.output.persistence.sqlalchemy.repositories.versions import (
+    bump_version,
+    get_version,
+)
+
+
+class SQLAlchemySessionRevocationRepository:
+    """Revoked sessions shared by every worker, behind a generation counter."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(self, session_key: bytes, expires_at: float, now: float) -> None:
+        """
+        Record a revocation and forget the ones that expired before ``now``.
+
+        The counter is bumped before inserting: its row lock makes revocations
+        commit in id order, so a reader that has loaded up to some id never
+        misses a lower one committed later.
+        """
+        bump_version(self.session, SESSION_REVOCATIONS)
+        self.session.add(
+            RevokedSessionModel(session_key=session_key, expires_at=expires_at)
+        )
+        self.session.query(RevokedSessionModel).filter(
+            RevokedSessionModel.expires_at <= now
+        ).delete(synchronize_session=False)
+        self.session.commit()
+
+    def get_version(self) -> int:
+        """Get the counter bumped by every revocation."""
+        return get_version(self.session, SESSION_REVOCATIONS)
+
+    def get_since(self, after_id: int, now: float) -> List[Tuple[int, bytes, float]]:
+        """Get (id, session_key, expires_at) of live revocations after an id."""
+        rows = (
+            self.session.query(
+                RevokedSessionModel.id,
+                RevokedSessionModel.session_key,
+                RevokedSessionModel.expires_at,
+            )
+            .filter(
+                RevokedSessionModel.id > after_id,
+                RevokedSessionModel.expires_at > now,
+            )
+            .order_by(RevokedSessionModel.id)
+        )
+        return [tuple(row) for row in rows]
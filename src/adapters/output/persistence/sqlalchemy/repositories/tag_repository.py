@@ -1,4 +1,5 @@
-from typing import List, Optional
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
@@ -6,6 +7,15 @@ from adapters.output.persistence.sqlalchemy.models.tag import (
     TagModel,
     TagRelationshipModel,
 )
+from adapters.output.persistence.sqlalchemy.models.graph_version import MOOD_GRAPH
+from adapters.output.persistence.sqlalchemy.repositories.mood_scores import (
+    apply_affinity_changes,
+    rebuild_mood_scores,
+)
+from adapters.output.persistence.sqlalchemy.repositories.versions import (
+    bump_version,
+    get_version,
+)
 from domain.models.tag import Tag, TagRelationship
 from domain.ports.output.tag_repository import TagRepositoryPort
 
@@ -33,10 +43,31 @@ class SQLAlchemyTagRepository(TagRepositoryPort):
         tag_models = self.session.query(TagModel).all()
         return [model.to_domain() for model in tag_models]
 
-    def save_relationship(self, relationship: TagRelationship) -> TagRelationship:
-        """Save a tag relationship to the database."""
+    def save_relationship(
+        self,
+        relationship: TagRelationship,
+        on_saved: Optional[
+            Callable[[TagRelationship, int], Dict[Tuple[str, str], float]]
+        ] = None,
+    ) -> TagRelationship:
+        """
+        Save a tag relationship to the database.
+
+        The version bump locks the graph_versions row until commit, so
+        ``on_saved`` runs after every earlier save has committed and before
+        any later one can.
+        """
         rel_model = TagRelationshipModel.from_domain(relationship)
         self.session.add(rel_model)
+        bump_version(self.session, MOOD_GRAPH)
+        if on_saved is not None:
+            try:
+                self.session.flush()
+                changes = on_saved(rel_model.to_domain(), self.get_graph_version())
+                apply_affinity_changes(self.session, changes)
+            except Exception:
+                self.session.rollback()
+                raise
         self.session.commit()
         return rel_model.to_domain()
 
@@ -44,3 +75,34 @@ class SQLAlchemyTagRepository(TagRepositoryPort):
         """Get all tag relationships."""
         rel_models = self.session.query(TagRelationshipModel).all()
         return [model.to_domain() for model in rel_models]
+
+    def get_relationships_fingerprint(self) -> str:
+        """Get a hash identifying the current contents of all tag relationships."""
+        rows = self.session.query(
+            TagRelationshipModel.source_tag_name,
+            TagRelationshipModel.target_tag_name,
+            TagRelationshipModel.weight,
+        ).order_by(
+            TagRelationshipModel.source_tag_name, TagRelationshipModel.target_tag_name
+        )
+
+        digest = hashlib.sha256()
+        for source, target, weight in rows:
+            digest.update(f"{source}\0{target}\0{weight!r}\n".encode())
+        return digest.hexdigest()[:16]
+
+    def get_graph_version(self, lock: bool = False) -> int:
+        """
+        Get the generation counter of the tag relationships graph.
+
+        With ``lock``, the row is read FOR SHARE: saving a relationship bumps
+        it, so the save waits for the current transaction to end.
+        """
+        return get_version(self.session, MOOD_GRAPH, lock)
+
+    def rebuild_mood_scores(
+        self, affinities: Iterable[Tuple[Tuple[str, str], float]]
+    ) -> None:
+        """Recompute all materialized mood scores in one transaction."""
+        rebuild_mood_scores(self.session, affinities)
+        self.session.commit()
@@ -0,0 +1,11 @@
+from typing import Callable, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_insert(session: Session) -> Optional[Callable]:
+    """Get the INSERT construct supporting ON CONFLICT for the session's database."""
+    return DIALECT_INSERTS.get(session.get_bind().dialect.name)
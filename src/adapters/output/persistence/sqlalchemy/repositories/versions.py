@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Session
+
+from adapters.output.persistence.sqlalchemy.models.graph_version import (
+    GraphVersionModel,
+)
+
+
+def get_version(session: Session, name: str, lock: bool = False) -> int:
+    """
+    Get a generation counter, 0 if it was never bumped.
+
+    With ``lock``, the row is read FOR SHARE, so bumps wait for the current
+    transaction to end.
+    """
+    query = session.query(GraphVersionModel).filter_by(name=name)
+    if lock:
+        query = query.with_for_update(read=True)
+    version_model = query.first()
+    return version_model.version if version_model else 0
+
+
+def bump_version(session: Session, name: str) -> None:
+    """
+    Increment a generation counter in the current transaction. Doesn't commit.
+
+    The update locks the row until commit, serializing writers of the data
+    the counter stands for.
+    """
+    updated = (
+        session.query(GraphVersionModel)
+        .filter_by(name=name)
+        .update(
+            {GraphVersionModel.version: GraphVersionModel.version + 1},
+            synchronize_session=False,
+        )
+    )
+    if not updated:
+        session.add(GraphVersionModel(name=name, version=1))
@@ -0,0 +1,197 @@
+import logging
+from contextlib import nullcontext
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from adapters.output.persistence.write_behind.tag_count_buffer import (
+    TagCountBuffer,
+    TagCounts,
+)
+from domain.models.establishment import Establishment, EstablishmentTag, SearchHit
+from domain.ports.output.establishment_repository import EstablishmentRepositoryPort
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindEstablishmentRepository(EstablishmentRepositoryPort):
+    """
+    Establishment repository that buffers tag increments in memory.
+
+    ``add_tag`` and ``add_tags`` only update a TagCountBuffer; its flusher
+    writes them to the wrapped repository with one batch upsert. Establishments
+    read through this repository get the buffered counts added to their tags,
+    and searches flush first so their scores include them. Increments still
+    buffered when the process dies without running ``close`` are lost.
+
+    Increments are only buffered for establishments known to exist; the IDs
+    checked are remembered, so each establishment is looked up once.
+
+    Flushes run inside ``flush_context()``, which lets the background thread
+    set up whatever the wrapped repository's session needs.
+    """
+
+    def __init__(
+        self,
+        repository: EstablishmentRepositoryPort,
+        interval: float = 0.2,
+        max_events: int = 1000,
+        flush_context: Callable[[], ContextManager] = nullcontext,
+    ):
+        self.repository = repository
+        self.flush_context = flush_context
+        self.buffer = TagCountBuffer(self._write, interval, max_events)
+        self._known_ids: Set[int] = set()
+
+    def start(self) -> None:
+        """Start flushing buffered increments in the background."""
+        self.buffer.start()
+
+    def close(self) -> None:
+        """Stop the background flusher and write the remaining increments."""
+        self.buffer.close()
+
+    def save(self, establishment: Establishment) -> Establishment:
+        """Save an establishment to the database."""
+        return self.repository.save(establishment)
+
+    def get_by_id(
+        self, establishment_id: int, include_comments: bool = True
+    ) -> Optional[Establishment]:
+        """Get an establishment by ID, including buffered tag counts."""
+        establishment = self.repository.get_by_id(establishment_id, include_comments)
+        if establishment is not None:
+            self._apply_pending([establishment])
+        return establishment
+
+    def get_all(self, include_comments: bool = True) -> List[Establishment]:
+        """Get all establishments, including buffered tag counts."""
+        return self._apply_pending(self.repository.get_all(include_comments))
+
+    def get_page(
+        self, limit: int, after: Optional[int] = None, include_comments: bool = True
+    ) -> List[Establishment]:
+        """Get a page of establishments, including buffered tag counts."""
+        return self._apply_pending(
+            self.repository.get_page(limit, after, include_comments)
+        )
+
+    def iter_all(
+        self, batch_size: int = 500, include_comments: bool = True
+    ) -> Iterator[Establishment]:
+        """Stream all establishments, including buffered tag counts."""
+        pending = self._pending_by_establishment()
+        for establishment in self.repository.iter_all(batch_size, include_comments):
+            if establishment.id in pending:
+                self._merge_tags(establishment, pending[establishment.id])
+            yield establishment
+
+    def get_missing_ids(self, establishment_ids: Iterable[int]) -> List[int]:
+        """Get the IDs among the given ones that no establishment has, ascending."""
+        return self.repository.get_missing_ids(establishment_ids)
+
+    def add_tag(self, establishment_id: int, tag_name: str) -> EstablishmentTag:
+        """
+        Buffer a tag increment.
+
+        The returned count is the increment not yet written to the database,
+        since the stored count isn't read.
+
+        Raises:
+            ValueError: If the establishment doesn't exist
+        """
+        self._check_known([establishment_id])
+        count = self.buffer.add(establishment_id, tag_name)
+        return EstablishmentTag(tag_name=tag_name, count=count)
+
+    def add_tags(self, tag_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Buffer many tag increments.
+
+        Raises:
+            ValueError: If a referenced establishment doesn't exist
+        """
+        self._check_known(establishment_id for establishment_id, _ in tag_counts)
+        self.buffer.add_many(tag_counts)
+
+    def _check_known(self, establishment_ids: Iterable[int]) -> None:
+        unknown = set(establishment_ids) - self._known_ids
+        if not unknown:
+            return
+
+        missing_ids = self.repository.get_missing_ids(unknown)
+        if missing_ids:
+            raise ValueError(f"Establishments with ids {missing_ids} not found")
+        self._known_ids.update(unknown)
+
+    def get_by_tags(
+        self,
+        tag_weights: Dict[str, float],
+        limit: int = 10,
+        include_comments: bool = True,
+    ) -> List[SearchHit]:
+        """Search by tags after writing buffered increments."""
+        self.buffer.flush()
+        return self.repository.get_by_tags(tag_weights, limit, include_comments)
+
+    def _write(self, tag_counts: TagCounts) -> None:
+        """
+        Write a flushed batch, isolating establishments that no longer exist.
+
+        A rejected batch is retried per establishment, so one bad ID can't keep
+        the rest of the buffer from being written.
+        """
+        with self.flush_context():
+            try:
+                self.repository.add_tags(tag_counts)
+            except ValueError:
+                self._write_per_establishment(tag_counts)
+
+    def _write_per_establishment(self, tag_counts: TagCounts) -> None:
+        by_establishment: Dict[int, TagCounts] = {}
+        for (establishment_id, tag_name), count in tag_counts.items():
+            by_establishment.setdefault(establishment_id, {})[
+                (establishment_id, tag_name)
+            ] = count
+        for establishment_id, counts in by_establishment.items():
+            try:
+                self.repository.add_tags(counts)
+            except ValueError:
+                logger.warning(
+                    "Dropping tag counts of missing establishment %s", establishment_id
+                )
+
+    def _pending_by_establishment(self) -> Dict[int, Dict[str, int]]:
+        pending: Dict[int, Dict[str, int]] = {}
+        for (establishment_id, tag_name), count in self.buffer.pending().items():
+            pending.setdefault(establishment_id, {})[tag_name] = count
+        return pending
+
+    def _apply_pending(
+        self, establishments: List[Establishment]
+    ) -> List[Establishment]:
+        pending = self._pending_by_establishment()
+        if pending:
+            for establishment in establishments:
+                if establishment.id in pending:
+                    self._merge_tags(establishment, pending[establishment.id])
+        return establishments
+
+    @staticmethod
+    def _merge_tags(establishment: Establishment, counts: Dict[str, int]) -> None:
+        counts = dict(counts)
+        for tag in establishment.tags:
+            if tag.tag_name in counts:
+                tag.count += counts.pop(tag.tag_name)
+        establishment.tags.extend(
+            EstablishmentTag(tag_name=tag_name, count=count)
+            for tag_name, count in counts.items()
+        )
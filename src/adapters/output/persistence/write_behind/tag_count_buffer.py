@@ -0,0 +1,115 @@
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TagCounts = Dict[Tuple[int, str], int]
+
+
+class TagCountBuffer:
+    """
+    In-process map of tag count increments, flushed in the background.
+
+    Increments are merged under a lock into one counter per
+    (establishment_id, tag_name) pair. A daemon thread hands the accumulated
+    counts to ``flush`` every ``interval`` seconds, or as soon as
+    ``max_events`` increments are waiting. Counts being flushed stay visible
+    through ``pending`` until the flush returns, and are put back if it fails.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[TagCounts], None],
+        interval: float = 0.2,
+        max_events: int = 1000,
+    ):
+        self._flush = flush
+        self.interval = interval
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: TagCounts = {}
+        self._in_flight: TagCounts = {}
+        self._events = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background flusher thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="tag-count-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def add(self, establishment_id: int, tag_name: str, count: int = 1) -> int:
+        """Buffer an increment and get the pair's not yet flushed count."""
+        with self._lock:
+            key = (establishment_id, tag_name)
+            self._pending[key] = self._pending.get(key, 0) + count
+            self._events += 1
+            if self._events >= self.max_events:
+                self._wakeup.set()
+            return self._pending[key] + self._in_flight.get(key, 0)
+
+    def add_many(self, tag_counts: TagCounts) -> None:
+        """Buffer aggregated increments."""
+        with self._lock:
+            for key, count in tag_counts.items():
+                self._pending[key] = self._pending.get(key, 0) + count
+            self._events += len(tag_counts)
+            if self._events >= self.max_events:
+                self._wakeup.set()
+
+    def pending(self) -> TagCounts:
+        """Get a copy of all increments not yet written to the database."""
+        with self._lock:
+            if not self._in_flight:
+                return dict(self._pending)
+            merged = dict(self._in_flight)
+            for key, count in self._pending.items():
+                merged[key] = merged.get(key, 0) + count
+            return merged
+
+    def flush(self) -> None:
+        """Write buffered increments now, waiting for a running flush first."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._in_flight, self._pending = self._pending, {}
+                self._events = 0
+
+            try:
+                self._flush(self._in_flight)
+            except Exception:
+                with self._lock:
+                    for key, count in self._in_flight.items():
+                        self._pending[key] = self._pending.get(key, 0) + count
+                    self._in_flight = {}
+                raise
+
+            with self._lock:
+                self._in_flight = {}
+
+    def close(self) -> None:
+        """Stop the flusher thread and write whatever is still buffered."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing tag counts failed, retrying later")
@@ -0,0 +1,138 @@
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from adapters.output.search.scoring_engine import (
+    ScoringEngine,
+    build_outgoing,
+    effective_tag_weights,
+)
+from domain.models.tag import TagRelationship
+
+
+class CsrScoringEngine(ScoringEngine):
+    """
+    Establishment x tag count matrix in CSR form, scored with one mat-vec.
+
+    Query weights are turned into a dense per-tag multiplier vector, the score
+    of every establishment is the sparse matrix-vector product, and the top
+    results are selected with ``argpartition``. Increments from ``add_tag`` go
+    to a small delta map that is folded into the CSR arrays once it grows.
+    """
+
+    def __init__(self, compact_threshold: int = 1024):
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self.load((), ())
+
+    def load(
+        self,
+        tag_counts: Iterable[Tuple[int, str, int]],
+        relationships: Iterable[TagRelationship],
+    ) -> None:
+        """Replace all state with (establishment_id, tag_name, count) rows."""
+        with self._lock:
+            self._ids: List[int] = []
+            self._rows: Dict[int, int] = {}
+            self._tags: Dict[str, int] = {}
+            self._delta: Dict[Tuple[int, int], int] = {}
+            self._outgoing = build_outgoing(relationships)
+
+            for establishment_id, tag_name, count in tag_counts:
+                key = (self._row(establishment_id), self._column(tag_name))
+                self._delta[key] = self._delta.get(key, 0) + count
+
+            self._indptr = np.zeros(1, dtype=np.int64)
+            self._indices = np.zeros(0, dtype=np.int64)
+            self._data = np.zeros(0, dtype=np.float64)
+            self._compact()
+
+    def set_relationships(self, relationships: Iterable[TagRelationship]) -> None:
+        """Replace the tag relationships used to expand query weights."""
+        outgoing = build_outgoing(relationships)
+        with self._lock:
+            self._outgoing = outgoing
+
+    def add_tag(self, establishment_id: int, tag_name: str, count: int = 1) -> None:
+        """Add to the count of a tag on an establishment."""
+        with self._lock:
+            key = (self._row(establishment_id), self._column(tag_name))
+            self._delta[key] = self._delta.get(key, 0) + count
+            if len(self._delta) > max(self.compact_threshold, len(self._data) // 8):
+                self._compact()
+
+    def top_k(
+        self, tag_weights: Dict[str, float], limit: int = 10
+    ) -> List[Tuple[int, float]]:
+        """Get the best scoring establishments, best first."""
+        if limit <= 0:
+            return []
+
+        with self._lock:
+            vector = np.zeros(len(self._tags), dtype=np.float64)
+            for tag_name, weight in effective_tag_weights(
+                tag_weights, self._outgoing
+            ).items():
+                column = self._tags.get(tag_name)
+                if column is not None:
+                    vector[column] = weight
+
+            scores = np.zeros(len(self._ids), dtype=np.float64)
+            indptr = self._indptr
+            if len(self._data):
+                products = self._data * vector[self._indices]
+                nonempty = np.flatnonzero(indptr[1:] > indptr[:-1])
+                scores[nonempty] = np.add.reduceat(products, indptr[nonempty])
+            for (row, column), count in self._delta.items():
+                scores[row] += count * vector[column]
+
+            ids = self._ids
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            best = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[best]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [(ids[row], float(scores[row])) for row in order]
+
+    def _row(self, establishment_id: int) -> int:
+        row = self._rows.get(establishment_id)
+        if row is None:
+            row = self._rows[establishment_id] = len(self._ids)
+            self._ids.append(establishment_id)
+        return row
+
+    def _column(self, tag_name: str) -> int:
+        column = self._tags.get(tag_name)
+        if column is None:
+            column = self._tags[tag_name] = len(self._tags)
+        return column
+
+    def _compact(self) -> None:
+        """Merge pending increments into freshly built CSR arrays."""
+        n_rows = len(self._ids)
+        old_rows = len(self._indptr) - 1
+        row_of = np.repeat(np.arange(old_rows), np.diff(self._indptr))
+
+        if self._delta:
+            keys = np.array(list(self._delta.keys()), dtype=np.int64)
+            counts = np.array(list(self._delta.values()), dtype=np.float64)
+            row_of = np.concatenate([row_of, keys[:, 0]])
+            columns = np.concatenate([self._indices, keys[:, 1]])
+            data = np.concatenate([self._data, counts])
+        else:
+            columns, data = self._indices, self._data
+
+        # Sum duplicate (row, column) entries and sort by row, then column
+        linear = row_of * max(len(self._tags), 1) + columns
+        unique, inverse = np.unique(linear, return_inverse=True)
+        summed = np.bincount(inverse, weights=data, minlength=len(unique))
+
+        rows = unique // max(len(self._tags), 1)
+        self._indices = unique % max(len(self._tags), 1)
+        self._data = summed
+        self._indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=self._indptr[1:])
+        self._delta = {}
@@ -0,0 +1,176 @@
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from adapters.output.search.scoring_engine import (
+    ScoringEngine,
+    build_outgoing,
+    effective_tag_weights,
+)
+from domain.models.tag import TagRelationship
+
+
+class PostingList:
+    """Establishment ids carrying a tag, sorted, with their tag counts."""
+
+    __slots__ = ("ids", "counts", "max_count")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.counts = array("q")
+        self.max_count = 0
+
+    def add(self, establishment_id: int, count: int) -> None:
+        position = bisect_left(self.ids, establishment_id)
+        if position < len(self.ids) and self.ids[position] == establishment_id:
+            self.counts[position] += count
+        else:
+            self.ids.insert(position, establishment_id)
+            self.counts.insert(position, count)
+        self.max_count = max(self.max_count, self.counts[position])
+
+
+class InvertedTagIndex(ScoringEngine):
+    """
+    Inverted index from tag name to posting lists, searched with MaxScore.
+
+    Each query term gets an upper bound ``multiplier * max_count``. Terms are
+    ordered by that bound; the weakest ones whose bounds together cannot beat
+    the current k-th best score are "non-essential" and only probed (by binary
+    search) for candidates found in the essential lists, so most postings of
+    weak terms are never visited once the top-k heap fills up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, PostingList] = {}
+        self._outgoing: Dict[str, List[Tuple[str, float]]] = {}
+
+    def load(
+        self,
+        tag_counts: Iterable[Tuple[int, str, int]],
+        relationships: Iterable[TagRelationship],
+    ) -> None:
+        """Replace all state with (establishment_id, tag_name, count) rows."""
+        postings: Dict[str, PostingList] = {}
+        for establishment_id, tag_name, count in sorted(tag_counts):
+            postings.setdefault(tag_name, PostingList()).add(establishment_id, count)
+        outgoing = build_outgoing(relationships)
+
+        with self._lock:
+            self._postings = postings
+            self._outgoing = outgoing
+
+    def set_relationships(self, relationships: Iterable[TagRelationship]) -> None:
+        """Replace the tag relationships used to expand query weights."""
+        outgoing = build_outgoing(relationships)
+        with self._lock:
+            self._outgoing = outgoing
+
+    def add_tag(self, establishment_id: int, tag_name: str, count: int = 1) -> None:
+        """Add to the count of a tag on an establishment."""
+        with self._lock:
+            self._postings.setdefault(tag_name, PostingList()).add(
+                establishment_id, count
+            )
+
+    def top_k(
+        self, tag_weights: Dict[str, float], limit: int = 10
+    ) -> List[Tuple[int, float]]:
+        """Get the best scoring establishments, best first."""
+        if limit <= 0:
+            return []
+
+        with self._lock:
+            terms = []
+            for tag_name, multiplier in effective_tag_weights(
+                tag_weights, self._outgoing
+            ).items():
+                postings = self._postings.get(tag_name)
+                if postings is not None and len(postings.ids) and multiplier:
+                    terms.append(
+                        (multiplier * postings.max_count, multiplier, postings)
+                    )
+
+            if any(multiplier < 0 for _, multiplier, _ in terms):
+                results = self._exhaustive(terms, limit)
+            else:
+                results = self._max_score(terms, limit)
+
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results
+
+    def _exhaustive(self, terms, limit: int) -> List[Tuple[int, float]]:
+        """Score every posting; needed when negative weights void the bounds."""
+        scores: Dict[int, float] = {}
+        for _, multiplier, postings in terms:
+            for establishment_id, count in zip(postings.ids, postings.counts):
+                scores[establishment_id] = (
+                    scores.get(establishment_id, 0.0) + count * multiplier
+                )
+        positive = [(id_, score) for id_, score in scores.items() if score > 0]
+        return heapq.nlargest(limit, positive, key=lambda result: result[1])
+
+    def _max_score(self, terms, limit: int) -> List[Tuple[int, float]]:
+        """Document-at-a-time MaxScore over the query posting lists."""
+        terms.sort(key=lambda term: term[0])
+        bounds = [bound for bound, _, _ in terms]
+        prefix_bounds = []
+        total = 0.0
+        for bound in bounds:
+            total += bound
+            prefix_bounds.append(total)
+
+        positions = [0] * len(terms)
+        heap: List[Tuple[float, int]] = []
+        threshold = 0.0
+        first_essential = 0
+
+        while first_essential < len(terms):
+            candidate = None
+            for i in range(first_essential, len(terms)):
+                ids = terms[i][2].ids
+                if positions[i] < len(ids) and (
+                    candidate is None or ids[positions[i]] < candidate
+                ):
+                    candidate = ids[positions[i]]
+            if candidate is None:
+                break
+
+            score = 0.0
+            for i in range(first_essential, len(terms)):
+                postings = terms[i][2]
+                position = positions[i]
+                if position < len(postings.ids) and postings.ids[position] == candidate:
+                    score += postings.counts[position] * terms[i][1]
+                    positions[i] = position + 1
+
+            for i in range(first_essential - 1, -1, -1):
+                if len(heap) == limit and score + prefix_bounds[i] <= threshold:
+                    break
+                postings = terms[i][2]
+                position = bisect_left(postings.ids, candidate, positions[i])
+                positions[i] = position
+                if position < len(postings.ids) and postings.ids[position] == candidate:
+                    score += postings.counts[position] * terms[i][1]
+
+            if score <= 0:
+                continue
+            if len(heap) < limit:
+                heapq.heappush(heap, (score, -candidate))
+            elif score > threshold:
+                heapq.heapreplace(heap, (score, -candidate))
+            else:
+                continue
+
+            if len(heap) == limit:
+                threshold = heap[0][0]
+                while (
+                    first_essential < len(terms)
+                    and prefix_bounds[first_essential] <= threshold
+                ):
+                    first_essential += 1
+
+        return [(-negative_id, score) for score, negative_id in heap]
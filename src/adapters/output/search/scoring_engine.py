@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Tuple
+
+from domain.models.tag import TagRelationship
+
+
+def build_outgoing(
+    relationships: Iterable[TagRelationship],
+) -> Dict[str, List[Tuple[str, float]]]:
+    """Index relationship edges by source tag."""
+    outgoing: Dict[str, List[Tuple[str, float]]] = {}
+    for rel in relationships:
+        outgoing.setdefault(rel.source_tag_name, []).append(
+            (rel.target_tag_name, rel.weight)
+        )
+    return outgoing
+
+
+def effective_tag_weights(
+    tag_weights: Dict[str, float], outgoing: Dict[str, List[Tuple[str, float]]]
+) -> Dict[str, float]:
+    """
+    Collapse query weights and relationships into one multiplier per tag.
+
+    Mirrors the SQL scoring of ``get_by_tags``: an establishment tag row is
+    joined with every relationship from a query tag into it, so its direct
+    weight counts once per such relationship, and each relationship adds
+    ``relationship weight * source query weight``. An establishment's score is
+    then the sum of ``count * multiplier`` over its tags.
+    """
+    matches: Dict[str, int] = {}
+    related: Dict[str, float] = {}
+
+    for source, weight in tag_weights.items():
+        for target, relationship_weight in outgoing.get(source, ()):
+            matches[target] = matches.get(target, 0) + 1
+            related[target] = related.get(target, 0.0) + relationship_weight * weight
+
+    multipliers = {
+        tag_name: weight * max(1, matches.get(tag_name, 0))
+        for tag_name, weight in tag_weights.items()
+    }
+    for target, weight in related.items():
+        multipliers[target] = multipliers.get(target, 0.0) + weight
+
+    return multipliers
+
+
+class ScoringEngine(ABC):
+    """In-process scorer for establishment searches by weighted tags."""
+
+    @abstractmethod
+    def load(
+        self,
+        tag_counts: Iterable[Tuple[int, str, int]],
+        relationships: Iterable[TagRelationship],
+    ) -> None:
+        """Replace all state with (establishment_id, tag_name, count) rows."""
+        pass
+
+    @abstractmethod
+    def set_relationships(self, relationships: Iterable[TagRelationship]) -> None:
+        """Replace the tag relationships used to expand query weights."""
+        pass
+
+    @abstractmethod
+    def add_tag(self, establishment_id: int, tag_name: str, count: int = 1) -> None:
+        """Add to the count of a tag on an establishment."""
+        pass
+
+    @abstractmethod
+    def top_k(
+        self, tag_weights: Dict[str, float], limit: int = 10
+    ) -> List[Tuple[int, float]]:
+        """
+        Get the best scoring establishments.
+
+        Returns:
+            (establishment_id, score) pairs with a positive score, best first
+        """
+        pass
@@ -1,3 +1,5 @@
+import atexit
+
 from flask import Flask
 from flask_restx import Api
 
@@ -7,6 +9,7 @@ from adapters.input.api.establishments import (
 )
 from adapters.input.api.tags import api as tags_api, init_api as init_tags_api
 from adapters.input.api.auth.routes import api as auth_api
+from adapters.input.api.auth.security import configure_bcrypt_rounds
 from adapters.output.persistence.sqlalchemy.repositories.establishment_repository import (
     SQLAlchemyEstablishmentRepository,
 )
@@ -16,7 +19,16 @@ from adapters.output.persistence.sqlalchemy.repositories.tag_repository import (
 from adapters.output.persistence.sqlalchemy.repositories.comment_repository import (
     SQLAlchemyCommentRepository,
 )
+from adapters.output.persistence.write_behind.establishment_repository import (
+    WriteBehindEstablishmentRepository,
+)
+from adapters.output.persistence.snapshot.mood_graph_snapshot import (
+    FileMoodGraphSnapshotStore,
+)
+from adapters.output.search.csr_scoring_engine import CsrScoringEngine
+from adapters.output.search.inverted_index import InvertedTagIndex
 from domain.services.establishment_service import EstablishmentService
+from domain.services.search_cache import SearchCache
 from domain.services.tag_service import TagService
 
 from infrastructure.config import Config
@@ -40,18 +52,69 @@ def create_app():
         description="API for searching establishments by mood",
     )
 
+    # Pick the bcrypt cost for this machine before serving logins
+    configure_bcrypt_rounds()
+
     # Initialize services
     tag_repository = SQLAlchemyTagRepository(db.session)
-    tag_service = TagService(tag_repository)
+    snapshot_store = None
+    if app.config["MOOD_GRAPH_SNAPSHOT_DIR"]:
+        snapshot_store = FileMoodGraphSnapshotStore(
+            app.config["MOOD_GRAPH_SNAPSHOT_DIR"]
+        )
+    materialized = app.config["SEARCH_ENGINE"] == "materialized"
+    tag_service = TagService(
+        tag_repository,
+        graph_backend=app.config["MOOD_GRAPH_BACKEND"],
+        related_min_weight=app.config["MOOD_INDEX_MIN_WEIGHT"],
+        related_top_k=app.config["MOOD_INDEX_TOP_K"],
+        snapshot_store=snapshot_store,
+        version_ttl=app.config["MOOD_GRAPH_VERSION_TTL"],
+        materialize_mood_scores=materialized,
+    )
 
     comment_repository = SQLAlchemyCommentRepository(db.session)
-    establishment_repository = SQLAlchemyEstablishmentRepository(db.session)
+    scoring_engine = None
+    if app.config["SEARCH_ENGINE"] == "csr":
+        scoring_engine = CsrScoringEngine()
+    elif app.config["SEARCH_ENGINE"] == "inverted":
+        scoring_engine = InvertedTagIndex()
+    elif app.config["SEARCH_ENGINE"] not in ("sql", "materialized"):
+        raise ValueError(f"Unknown search engine: {app.config['SEARCH_ENGINE']}")
+    establishment_repository = SQLAlchemyEstablishmentRepository(
+        db.session,
+        scoring_engine=scoring_engine,
+        version_ttl=app.config["MOOD_GRAPH_VERSION_TTL"],
+        reload_interval=app.config["SEARCH_ENGINE_RELOAD_INTERVAL"],
+        mood_affinities=tag_service.get_mood_affinities if materialized else None,
+    )
+    if app.config["TAG_WRITE_BEHIND"]:
+        establishment_repository = WriteBehindEstablishmentRepository(
+            establishment_repository,
+            interval=app.config["TAG_FLUSH_INTERVAL_MS"] / 1000,
+            max_events=app.config["TAG_FLUSH_MAX_EVENTS"],
+            flush_context=app.app_context,
+        )
+        establishment_repository.start()
+        atexit.register(establishment_repository.close)
+    search_cache = None
+    if app.config["SEARCH_CACHE_SIZE"] > 0:
+        search_cache = SearchCache(
+            max_size=app.config["SEARCH_CACHE_SIZE"],
+            ttl=app.config["SEARCH_CACHE_TTL"],
+        )
     establishment_service = EstablishmentService(
         establishment_repository=establishment_repository,
         comment_repository=comment_repository,
         tag_service=tag_service,
+        search_cache=search_cache,
     )
 
+    @app.cli.command("rebuild-mood-scores")
+    def rebuild_mood_scores():
+        """Recompute the materialized establishment mood scores."""
+        tag_service.rebuild_mood_scores()
+
     # Initialize and register APIs
     init_establishments_api(establishment_service)
     init_tags_api(tag_service)
@@ -0,0 +1,89 @@
+"""
+Memory and construction time of the slotted domain models.
+
+Times ``to_domain`` over 100k transient ORM rows, then compares constructing
+the slotted dataclasses with ``__dict__``-based twins of the same fields.
+Memory is what the built objects retain, divided by their number.
+
+Usage (from src/):
+    python -m benchmarks.domain_models --rows 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from domain.models.comment import Comment
+from domain.models.establishment import EstablishmentTag
+from domain.models.tag import Tag
+
+
+def dict_twin(cls):
+    """Same dataclass without slots, i.e. with a per-instance __dict__."""
+    spec = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+        else:
+            spec.append((f.name, f.type))
+    return dataclasses.make_dataclass(cls.__name__ + "WithDict", spec)
+
+
+def measure(name: str, build) -> None:
+    """Print the construction time and retained memory per object of ``build()``."""
+    gc.collect()
+    started = time.perf_counter()
+    objects = build()
+    elapsed = time.perf_counter() - started
+    del objects
+
+    # Traced separately, tracemalloc slows allocation down considerably
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_object = retained / max(len(objects), 1)
+    print(f"  {name:<28} {elapsed * 1000:8.1f} ms {per_object:8.1f} B/object")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    from adapters.output.persistence.sqlalchemy.models.comment import CommentModel
+    from adapters.output.persistence.sqlalchemy.models.establishment import (
+        EstablishmentTagModel,
+    )
+    from adapters.output.persistence.sqlalchemy.models.tag import TagModel
+
+    now = datetime.utcnow()
+    rows = {
+        Comment: [
+            CommentModel(
+                id=i, establishment_id=i, text="Nice", rating=7, created_at=now
+            )
+            for i in range(args.rows)
+        ],
+        EstablishmentTag: [
+            EstablishmentTagModel(establishment_id=i, tag_name="Cozy", count=i)
+            for i in range(args.rows)
+        ],
+        Tag: [TagModel(name=f"Mood{i}", description="") for i in range(args.rows)],
+    }
+
+    for cls, models in rows.items():
+        twin = dict_twin(cls)
+        values = [dataclasses.astuple(model.to_domain()) for model in models]
+        print(f"{cls.__name__} x {len(models)}")
+        measure("to_domain", lambda: [model.to_domain() for model in models])
+        measure("construct (slots)", lambda: [cls(*row) for row in values])
+        measure("construct (__dict__)", lambda: [twin(*row) for row in values])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Response rendering time of flask-restx marshal against the compiled renderer.
+
+Renders search-sized payloads of establishments with tags, their latest
+comments and rating aggregates, the way the API does it: ``marshal`` followed
+by ``json.dumps``, or ``compile_model`` followed by ``dumps`` (orjson when
+installed, the standard library otherwise).
+
+Usage (from src/):
+    python -m benchmarks.json_serialization --results 100
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from flask_restx import marshal
+
+from adapters.input.api import fast_json
+from adapters.input.api.establishments import establishment_model
+from adapters.input.api.fast_json import compile_model
+from domain.models.comment import Comment, RatingStats
+from domain.models.establishment import Establishment, EstablishmentTag
+
+
+def payload(results: int, tags: int, comments: int) -> list:
+    """Establishments shaped like search results with comments included."""
+    now = datetime(2026, 1, 1)
+    establishments = []
+    for i in range(results):
+        stats = RatingStats()
+        for rating in range(1, 11):
+            stats.add(rating)
+        establishments.append(
+            Establishment(
+                id=i,
+                name=f"Establishment {i}",
+                description="A quiet place with good coffee",
+                tags=[EstablishmentTag(f"Mood{t}", t + 1) for t in range(tags)],
+                comments=[
+                    Comment(
+                        id=i * comments + c,
+                        establishment_id=i,
+                        text="Great atmosphere, would come again",
+                        rating=8,
+                        created_at=now - timedelta(minutes=c),
+                    )
+                    for c in range(comments)
+                ],
+                score=1.0 / (i + 1),
+                created_at=now,
+                rating_stats=stats,
+            )
+        )
+    return establishments
+
+
+def stdlib_dumps(data) -> bytes:
+    """fast_json.dumps with orjson disabled."""
+    orjson, fast_json.orjson = fast_json.orjson, None
+    try:
+        return fast_json.dumps(data)
+    finally:
+        fast_json.orjson = orjson
+
+
+def timed(name: str, render, repeat: int) -> float:
+    """Print and return the mean time of ``render()``."""
+    render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {name:<32} {elapsed * 1000:8.3f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--comments", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    establishments = payload(args.results, args.tags, args.comments)
+    render = compile_model(establishment_model)
+    print(f"{args.results} establishments, {args.tags} tags, {args.comments} comments")
+
+    baseline = timed(
+        "marshal + json.dumps",
+        lambda: json.dumps(marshal(establishments, establishment_model)).encode(),
+        args.repeat,
+    )
+    timings = {
+        f"compiled + {fast_json.JSON_BACKEND}": lambda: fast_json.dumps(
+            [render(e) for e in establishments]
+        )
+    }
+    if fast_json.orjson is not None:
+        timings["compiled + json"] = lambda: stdlib_dumps(
+            [render(e) for e in establishments]
+        )
+    for name, run in timings.items():
+        elapsed = timed(name, run, args.repeat)
+        print(f"  {'':<32} {baseline / elapsed:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
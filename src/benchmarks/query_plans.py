@@ -0,0 +1,177 @@
+"""
+Query plans and timings of mood search and comment queries, with and without
+the search indexes.
+
+Captures the statements the repositories actually issue, then explains and
+times them twice inside one transaction: once after dropping the indexes and
+once after recreating them. The transaction is rolled back, so the schema is
+left as it was.
+
+Usage (from src/):
+    python -m benchmarks.query_plans --database-url sqlite:////tmp/bench.db --seed
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from sqlalchemy import event
+
+from infrastructure.config import Config
+
+SEARCH_INDEXES = [
+    "ix_establishment_tags_tag_name_establishment_id",
+    "ix_tag_relationships_target_tag_name_source_tag_name",
+    "ix_comments_establishment_id_created_at_id",
+]
+QUERY_TAGS = {"Happy": 1.0, "Cozy": 1.0}
+
+
+def seed(db, establishments: int, tags: int, comments: int) -> None:
+    """Fill an empty database with random establishments, tags and comments."""
+    from adapters.output.persistence.sqlalchemy.models.comment import CommentModel
+    from adapters.output.persistence.sqlalchemy.models.establishment import (
+        EstablishmentModel,
+        EstablishmentTagModel,
+    )
+    from adapters.output.persistence.sqlalchemy.models.tag import (
+        TagModel,
+        TagRelationshipModel,
+    )
+
+    rng = random.Random(0)
+    db.drop_all()
+    db.create_all()
+
+    tag_names = ["Happy", "Cozy"] + [f"Mood{i}" for i in range(tags - 2)]
+    db.session.bulk_insert_mappings(TagModel, [{"name": n} for n in tag_names])
+    db.session.bulk_insert_mappings(
+        TagRelationshipModel,
+        [
+            {"source_tag_name": source, "target_tag_name": target, "weight": 0.5}
+            for source in tag_names
+            for target in rng.sample(tag_names, 3)
+            if source != target
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        EstablishmentModel,
+        [
+            {"id": i, "name": f"Establishment {i}", "description": ""}
+            for i in range(1, establishments + 1)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        EstablishmentTagModel,
+        [
+            {"establishment_id": i, "tag_name": name, "count": rng.randint(1, 50)}
+            for i in range(1, establishments + 1)
+            for name in rng.sample(tag_names, 5)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        CommentModel,
+        [
+            {
+                "establishment_id": rng.randint(1, establishments),
+                "text": "Nice",
+                "rating": rng.randint(1, 10),
+            }
+            for _ in range(comments)
+        ],
+    )
+    db.session.commit()
+
+
+def capture_statements(engine, run) -> List[Tuple[str, object]]:
+    """Record the statements and parameters executed by ``run``."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def explain(connection, statement: str, parameters, repeat: int) -> None:
+    """Print the plan of a statement and its mean execution time."""
+    if connection.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+
+    for row in connection.exec_driver_sql(prefix + statement, parameters):
+        print("    " + " | ".join(str(column) for column in row))
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        connection.exec_driver_sql(statement, parameters).fetchall()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"    mean {elapsed * 1000:.3f} ms over {repeat} runs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--seed", action="store_true", help="Recreate with data")
+    parser.add_argument("--establishments", type=int, default=20000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Config.SQLALCHEMY_DATABASE_URI = args.database_url
+    Config.SEARCH_ENGINE = "sql"
+    Config.SEARCH_CACHE_SIZE = 0
+
+    from app import create_app
+    from adapters.input.api import establishments
+    from infrastructure.database import db
+
+    app = create_app()
+    with app.app_context():
+        if args.seed:
+            seed(db, args.establishments, args.tags, args.comments)
+
+        service = establishments._service
+        queries = {
+            "search": lambda: service.search_establishments(QUERY_TAGS, 10, False),
+            "establishment with comments": lambda: service.get_establishment(1),
+            "comments page": lambda: service.get_comments_page(1, 20),
+        }
+        captured = {
+            name: capture_statements(db.engine, run) for name, run in queries.items()
+        }
+        db.session.rollback()
+
+        with db.engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                for phase in ("without indexes", "with indexes"):
+                    if phase == "without indexes":
+                        for index in SEARCH_INDEXES:
+                            connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+                    else:
+                        for table in db.metadata.sorted_tables:
+                            for index in table.indexes:
+                                if index.name in SEARCH_INDEXES:
+                                    index.create(connection, checkfirst=True)
+                    connection.exec_driver_sql("ANALYZE")
+
+                    print(f"=== {phase} ===")
+                    for name, statements in captured.items():
+                        for statement, parameters in statements:
+                            print(f"  [{name}] {' '.join(statement.split())[:100]}")
+                            explain(connection, statement, parameters, args.repeat)
+            finally:
+                transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
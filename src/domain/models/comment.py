@@ -1,9 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
+MIN_RATING = 1
+MAX_RATING = 10
 
-@dataclass
+
+@dataclass(slots=True)
 class Comment:
     """Domain model for Comment."""
 
@@ -11,7 +14,31 @@ class Comment:
     establishment_id: int
     text: str
     rating: int  # Rating from 1 to 10
-    created_at: datetime = datetime.utcnow()
+    # Only called when omitted; to_domain always passes the stored value
+    created_at: datetime = field(default_factory=datetime.utcnow)
 
     def __str__(self) -> str:
-        return f"<Comment {self.id} for establishment {self.establishment_id}>" 
\ No newline at end of file
+        return f"<Comment {self.id} for establishment {self.establishment_id}>"
+
+
+@dataclass(slots=True)
+class RatingStats:
+    """Aggregate of all comment ratings of an establishment."""
+
+    count: int = 0
+    total: int = 0
+    # histogram[i] is the number of ratings equal to MIN_RATING + i
+    histogram: List[int] = field(
+        default_factory=lambda: [0] * (MAX_RATING - MIN_RATING + 1)
+    )
+
+    @property
+    def average(self) -> Optional[float]:
+        """Mean rating, or None without ratings."""
+        return self.total / self.count if self.count else None
+
+    def add(self, rating: int) -> None:
+        """Count one more rating."""
+        self.count += 1
+        self.total += rating
+        self.histogram[rating - MIN_RATING] += 1
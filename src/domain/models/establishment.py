@@ -1,10 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
-from .comment import Comment
+from typing import Optional, List, Union
+from .comment import Comment, RatingStats
 
 
-@dataclass
+@dataclass(slots=True)
 class EstablishmentTag:
     """Tag associated with an establishment."""
 
@@ -12,7 +12,7 @@ class EstablishmentTag:
     count: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Establishment:
     """Domain model for Establishment."""
 
@@ -22,7 +22,49 @@ class Establishment:
     tags: List[EstablishmentTag]
     comments: List[Comment] = None
     score: Optional[float] = None
-    created_at: datetime = datetime.utcnow()
+    # Only called when omitted; to_domain always passes the stored value
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    rating_stats: Optional[RatingStats] = None
 
     def __str__(self) -> str:
         return f"<Establishment {self.name}>"
+
+
+class EstablishmentSearchResult:
+    """Compact search hit built directly from projected columns."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "tags",
+        "score",
+        "comments",
+        "rating_stats",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        description: str,
+        tags: List[EstablishmentTag],
+        score: float,
+        rating_stats: Optional[RatingStats] = None,
+    ):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.tags = tags
+        self.score = score
+        self.comments = None
+        self.rating_stats = rating_stats
+
+    def __str__(self) -> str:
+        return f"<EstablishmentSearchResult {self.name}>"
+
+
+# A tag search returns full establishments when comments are requested and
+# projected EstablishmentSearchResult objects otherwise; both expose id, name,
+# description, tags, score, comments and rating_stats
+SearchHit = Union[Establishment, EstablishmentSearchResult]
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Tag:
     """Domain model for Tag (mood)."""
 
@@ -13,7 +13,7 @@ class Tag:
         return f"<Tag {self.name}>"
 
 
-@dataclass
+@dataclass(slots=True)
 class TagRelationship:
     """Domain model for relationship between tags with weights."""
 
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from domain.models.establishment import Establishment
+from domain.models.comment import Comment
+from domain.models.establishment import Establishment, SearchHit
 
 
 class EstablishmentServicePort(ABC):
@@ -19,14 +21,53 @@ class EstablishmentServicePort(ABC):
         """Add a tag count to an establishment."""
         pass
 
+    @abstractmethod
+    def add_tags_to_establishments(
+        self, events: Iterable[Tuple[int, str]]
+    ) -> Dict[Tuple[int, str], int]:
+        """Apply many (establishment_id, tag_name) tagging events at once."""
+        pass
+
     @abstractmethod
     def search_by_moods(
-        self, tag_names: List[str], limit: int = 10
-    ) -> List[Establishment]:
+        self, tag_names: List[str], limit: int = 10, include_comments: bool = True
+    ) -> List[SearchHit]:
         """Search establishments by mood tags, using the mood graph for related moods."""
         pass
 
     @abstractmethod
-    def get_establishment(self, establishment_id: int) -> Optional[Establishment]:
+    def get_establishment(
+        self, establishment_id: int, include_comments: bool = True
+    ) -> Optional[Establishment]:
         """Get establishment by ID."""
         pass
+
+    @abstractmethod
+    def get_establishments_page(
+        self, limit: int, after: Optional[int] = None, include_comments: bool = True
+    ) -> List[Establishment]:
+        """Get a page of establishments ordered by ID, starting after a cursor."""
+        pass
+
+    @abstractmethod
+    def get_comments_page(
+        self,
+        establishment_id: int,
+        limit: int,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+    ) -> Optional[List[Comment]]:
+        """Get an establishment's comments newest first, created before a cursor."""
+        pass
+
+    @abstractmethod
+    def iter_establishments(
+        self, batch_size: int = 500, include_comments: bool = True
+    ) -> Iterator[Establishment]:
+        """Stream all establishments without loading them all into memory."""
+        pass
+
+    @abstractmethod
+    def get_search_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters of the search result cache."""
+        pass
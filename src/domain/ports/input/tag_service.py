@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import FrozenSet, Iterable, List, Dict, Optional
 
 from domain.models.tag import Tag, TagRelationship
 
@@ -38,3 +38,28 @@ class TagServicePort(ABC):
     def get_mood_graph(self) -> Dict[str, Dict[str, float]]:
         """Get the complete mood graph with computed weights using Floyd-Warshall."""
         pass
+
+    @abstractmethod
+    def get_related_moods(self, tag_name: str) -> Dict[str, float]:
+        """Get the strongest moods related to a tag with their weights."""
+        pass
+
+    @abstractmethod
+    def get_scored_tags(self, tag_names: Iterable[str]) -> FrozenSet[str]:
+        """Get the tags whose counts can change the score of a search for tags."""
+        pass
+
+    @abstractmethod
+    def get_graph_version(self) -> int:
+        """Get the generation counter of the mood graph."""
+        pass
+
+    @abstractmethod
+    def get_mood_affinities(self, tag_name: str) -> Dict[str, float]:
+        """Get the closure weight from every mood to a tag, the tag counting 1."""
+        pass
+
+    @abstractmethod
+    def rebuild_mood_scores(self) -> None:
+        """Recompute the materialized establishment mood scores from scratch."""
+        pass
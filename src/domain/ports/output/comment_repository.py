@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 
-from domain.models.comment import Comment
+from domain.models.comment import Comment, RatingStats
 
 
 class CommentRepositoryPort(ABC):
@@ -9,10 +10,35 @@ class CommentRepositoryPort(ABC):
 
     @abstractmethod
     def save(self, comment: Comment) -> Comment:
-        """Save a comment."""
+        """Save a comment, updating the establishment's rating aggregate."""
         pass
 
     @abstractmethod
     def get_by_establishment_id(self, establishment_id: int) -> List[Comment]:
         """Get all comments for an establishment."""
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_page(
+        self,
+        establishment_id: int,
+        limit: int,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+    ) -> List[Comment]:
+        """
+        Get an establishment's comments newest first, using keyset pagination.
+
+        Args:
+            establishment_id: Establishment whose comments to get
+            limit: Maximum number of comments
+            before: Only return comments created before this time
+            before_id: With ``before``, also return comments created exactly at
+                that time whose ID is lower
+        """
+        pass
+
+    @abstractmethod
+    def get_rating_stats(self, establishment_id: int) -> RatingStats:
+        """Get the rating count, sum and histogram of an establishment."""
+        pass
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from domain.models.establishment import Establishment, EstablishmentTag
+from domain.models.establishment import Establishment, EstablishmentTag, SearchHit
 
 
 class EstablishmentRepositoryPort(ABC):
@@ -13,24 +13,85 @@ class EstablishmentRepositoryPort(ABC):
         pass
 
     @abstractmethod
-    def get_by_id(self, establishment_id: int) -> Optional[Establishment]:
-        """Get an establishment by ID."""
+    def get_by_id(
+        self, establishment_id: int, include_comments: bool = True
+    ) -> Optional[Establishment]:
+        """Get an establishment by ID, optionally without its comments."""
+        pass
+
+    @abstractmethod
+    def get_all(self, include_comments: bool = True) -> List[Establishment]:
+        """Get all establishments."""
+        pass
+
+    @abstractmethod
+    def get_page(
+        self, limit: int, after: Optional[int] = None, include_comments: bool = True
+    ) -> List[Establishment]:
+        """
+        Get establishments ordered by ID, using keyset pagination.
+
+        Args:
+            limit: Maximum number of establishments to return
+            after: Only return establishments with an ID greater than this one
+            include_comments: Whether to load comments (None when skipped)
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(
+        self, batch_size: int = 500, include_comments: bool = True
+    ) -> Iterator[Establishment]:
+        """Stream all establishments ordered by ID, fetching them in batches."""
+        pass
+
+    @abstractmethod
+    def get_missing_ids(self, establishment_ids: Iterable[int]) -> List[int]:
+        """Get the IDs among the given ones that no establishment has, ascending."""
         pass
 
     @abstractmethod
     def add_tag(self, establishment_id: int, tag_name: str) -> EstablishmentTag:
-        """Add or increment a tag count for an establishment."""
+        """
+        Add or increment a tag count for an establishment.
+
+        The tag is created if it doesn't exist yet.
+
+        Raises:
+            ValueError: If the establishment doesn't exist
+        """
+        pass
+
+    @abstractmethod
+    def add_tags(self, tag_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Increment many tag counts in a single transaction.
+
+        Args:
+            tag_counts: Count to add per (establishment_id, tag_name) pair;
+                tags that don't exist yet are created
+
+        Raises:
+            ValueError: If a referenced establishment doesn't exist
+        """
         pass
 
     @abstractmethod
     def get_by_tags(
-        self, tag_weights: Dict[str, float], limit: int = 10
-    ) -> List[Establishment]:
+        self,
+        tag_weights: Dict[str, float],
+        limit: int = 10,
+        include_comments: bool = True,
+    ) -> List[SearchHit]:
         """
         Get establishments by tags and their weights.
 
+        Without comments, implementations may return lightweight
+        EstablishmentSearchResult objects instead of full establishments.
+
         Args:
             tag_weights: Dictionary mapping tag names to their weights
             limit: Maximum number of results to return
+            include_comments: Whether to load comments (None when skipped)
         """
         pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class MoodGraphSnapshotPort(ABC):
+    """Interface for storing computed mood graph closures between processes."""
+
+    @abstractmethod
+    def load(self, version: str) -> Optional[Tuple[List[str], np.ndarray]]:
+        """
+        Load the closure stored for a relationships version.
+
+        Returns:
+            Tag names and their read-only closure matrix, or None if there is no
+            snapshot for this version.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, version: str, nodes: List[str], matrix: np.ndarray) -> None:
+        """Store the closure computed for a relationships version."""
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from domain.models.tag import Tag, TagRelationship
 
@@ -23,11 +23,55 @@ class TagRepositoryPort(ABC):
         pass
 
     @abstractmethod
-    def save_relationship(self, relationship: TagRelationship) -> TagRelationship:
-        """Save a tag relationship to the database."""
+    def save_relationship(
+        self,
+        relationship: TagRelationship,
+        on_saved: Optional[
+            Callable[[TagRelationship, int], Dict[Tuple[str, str], float]]
+        ] = None,
+    ) -> TagRelationship:
+        """
+        Save a tag relationship and bump the graph version in one transaction.
+
+        Args:
+            relationship: Relationship to save
+            on_saved: Called within the transaction, once the version bump has
+                serialized concurrent saves, with the saved relationship and
+                its graph version; the mood score changes it returns (closure
+                increase per (mood, tag) pair) are stored in the same transaction
+        """
         pass
 
     @abstractmethod
     def get_all_relationships(self) -> List[TagRelationship]:
         """Get all tag relationships."""
         pass
+
+    @abstractmethod
+    def get_relationships_fingerprint(self) -> str:
+        """Get a hash identifying the current contents of all tag relationships."""
+        pass
+
+    @abstractmethod
+    def get_graph_version(self, lock: bool = False) -> int:
+        """
+        Get the generation counter bumped on every relationship change.
+
+        Args:
+            lock: Keep relationships from being saved until the current
+                transaction ends
+        """
+        pass
+
+    @abstractmethod
+    def rebuild_mood_scores(
+        self, affinities: Iterable[Tuple[Tuple[str, str], float]]
+    ) -> None:
+        """
+        Recompute all materialized establishment mood scores.
+
+        Args:
+            affinities: ((mood, tag), weight) for every non-zero affinity,
+                including (tag, tag) with weight 1
+        """
+        pass
@@ -1,12 +1,15 @@
-from typing import List, Dict, Optional
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, List, Dict, Iterator, Optional, Tuple
 
-from domain.models.establishment import Establishment, EstablishmentTag
+from domain.models.establishment import Establishment, EstablishmentTag, SearchHit
 from domain.models.comment import Comment
 from domain.ports.input.establishment_service import EstablishmentServicePort
 from domain.ports.output.establishment_repository import EstablishmentRepositoryPort
 from domain.ports.output.comment_repository import CommentRepositoryPort
 from domain.ports.input.tag_service import TagServicePort
 from domain.services.tag_service import TagService
+from domain.services.search_cache import SearchCache
 
 
 class EstablishmentService(EstablishmentServicePort):
@@ -17,10 +20,12 @@ class EstablishmentService(EstablishmentServicePort):
         establishment_repository: EstablishmentRepositoryPort,
         comment_repository: CommentRepositoryPort,
         tag_service: TagService,
+        search_cache: Optional[SearchCache] = None,
     ):
         self.establishment_repository = establishment_repository
         self.comment_repository = comment_repository
         self.tag_service = tag_service
+        self.search_cache = search_cache
 
     def create_establishment(self, data: Dict) -> Establishment:
         """Create a new establishment."""
@@ -29,57 +34,159 @@ class EstablishmentService(EstablishmentServicePort):
         )
         return self.establishment_repository.save(establishment)
 
-    def get_establishment(self, establishment_id: int) -> Optional[Establishment]:
+    def get_establishment(
+        self, establishment_id: int, include_comments: bool = True
+    ) -> Optional[Establishment]:
         """Get an establishment by ID."""
-        return self.establishment_repository.get_by_id(establishment_id)
+        return self.establishment_repository.get_by_id(
+            establishment_id, include_comments
+        )
 
-    def get_all_establishments(self) -> List[Establishment]:
+    def get_all_establishments(
+        self, include_comments: bool = True
+    ) -> List[Establishment]:
         """Get all establishments."""
-        return self.establishment_repository.get_all()
+        return self.establishment_repository.get_all(include_comments)
+
+    def get_establishments_page(
+        self, limit: int, after: Optional[int] = None, include_comments: bool = True
+    ) -> List[Establishment]:
+        """Get a page of establishments ordered by ID, starting after a cursor."""
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+
+        return self.establishment_repository.get_page(limit, after, include_comments)
+
+    def iter_establishments(
+        self, batch_size: int = 500, include_comments: bool = True
+    ) -> Iterator[Establishment]:
+        """Stream all establishments without loading them all into memory."""
+        return self.establishment_repository.iter_all(batch_size, include_comments)
 
     def add_tag_to_establishment(
         self, establishment_id: int, tag_name: str
     ) -> EstablishmentTag:
-        """Add a tag to an establishment."""
-        self.tag_service.create_tag_if_not_exists(tag_name)
-        return self.establishment_repository.add_tag(establishment_id, tag_name)
+        """Add a tag to an establishment, creating the tag if needed."""
+        tag = self.establishment_repository.add_tag(establishment_id, tag_name)
+
+        if self.search_cache is not None:
+            self.search_cache.invalidate_tags([tag_name])
+            self.search_cache.invalidate_establishment(establishment_id)
+
+        return tag
+
+    def add_tags_to_establishments(
+        self, events: Iterable[Tuple[int, str]]
+    ) -> Dict[Tuple[int, str], int]:
+        """
+        Apply many (establishment_id, tag_name) tagging events at once.
+
+        Events are aggregated into one count per pair before they reach the
+        repository, which writes the whole batch in a single transaction.
+
+        Returns:
+            Count added per (establishment_id, tag_name) pair
+        """
+        tag_counts = dict(Counter(events))
+        if not tag_counts:
+            raise ValueError("At least one tag event must be provided")
+
+        self.establishment_repository.add_tags(tag_counts)
+
+        if self.search_cache is not None:
+            self.search_cache.invalidate_tags({name for _, name in tag_counts})
+            for establishment_id in {id_ for id_, _ in tag_counts}:
+                self.search_cache.invalidate_establishment(establishment_id)
+
+        return tag_counts
 
     def search_establishments(
-        self, tag_weights: Dict[str, float], limit: int = 10
-    ) -> List[Establishment]:
+        self,
+        tag_weights: Dict[str, float],
+        limit: int = 10,
+        include_comments: bool = True,
+    ) -> List[SearchHit]:
         """Search establishments by tags and their weights."""
         if not tag_weights:
             raise ValueError("At least one tag must be provided")
 
-        return self.establishment_repository.get_by_tags(tag_weights, limit)
+        return self._search(tag_weights, limit, include_comments)
 
     def search_by_moods(
-        self, tag_names: List[str], limit: int = 10
-    ) -> List[Establishment]:
+        self, tag_names: List[str], limit: int = 10, include_comments: bool = True
+    ) -> List[SearchHit]:
         """Search establishments by mood tags, using the mood graph for related moods."""
-        mood_graph = self.tag_service.get_mood_graph()
-
         tag_weights: Dict[str, float] = {}
 
         for tag_name in tag_names:
             tag_weights[tag_name] = 1.0
 
-            if tag_name in mood_graph:
-                for related_name, weight in mood_graph[tag_name].items():
-                    if (
-                        related_name not in tag_weights
-                        or weight > tag_weights[related_name]
-                    ):
-                        tag_weights[related_name] = weight
+            related_moods = self.tag_service.get_related_moods(tag_name)
+            for related_name, weight in related_moods.items():
+                if (
+                    related_name not in tag_weights
+                    or weight > tag_weights[related_name]
+                ):
+                    tag_weights[related_name] = weight
+
+        return self._search(tag_weights, limit, include_comments)
+
+    def get_search_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters of the search result cache."""
+        if self.search_cache is None:
+            return {"hits": 0, "misses": 0, "size": 0}
+        return self.search_cache.stats()
+
+    def _search(
+        self, tag_weights: Dict[str, float], limit: int, include_comments: bool
+    ) -> List[SearchHit]:
+        """Run a tag search through the result cache, if one is configured."""
+        if self.search_cache is None:
+            return self.establishment_repository.get_by_tags(
+                tag_weights, limit, include_comments
+            )
+
+        key = SearchCache.make_key(tag_weights, limit, include_comments)
+        graph_version = self.tag_service.get_graph_version()
+        results = self.search_cache.get(key, graph_version)
+        if results is not None:
+            return results
+
+        results = self.establishment_repository.get_by_tags(
+            tag_weights, limit, include_comments
+        )
+        tags = self.tag_service.get_scored_tags(tag_weights)
+        self.search_cache.put(key, graph_version, results, tags)
+        return results
 
-        return self.establishment_repository.get_by_tags(tag_weights, limit)
+    def get_comments_page(
+        self,
+        establishment_id: int,
+        limit: int,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+    ) -> Optional[List[Comment]]:
+        """
+        Get a page of an establishment's comments, newest first.
+
+        Returns None if the establishment doesn't exist. Existence is only
+        checked for empty pages, so a non-empty page costs a single query.
+        """
+        comments = self.comment_repository.get_page(
+            establishment_id, limit, before, before_id
+        )
+        if not comments and not self.get_establishment(
+            establishment_id, include_comments=False
+        ):
+            return None
+        return comments
 
     def add_comment(self, establishment_id: int, text: str, rating: int) -> Comment:
         """Add a comment to an establishment."""
         if not 1 <= rating <= 10:
             raise ValueError("Rating must be between 1 and 10")
 
-        establishment = self.get_establishment(establishment_id)
+        establishment = self.get_establishment(establishment_id, include_comments=False)
         if not establishment:
             raise ValueError(f"Establishment with id {establishment_id} not found")
 
@@ -89,4 +196,9 @@ class EstablishmentService(EstablishmentServicePort):
             text=text,
             rating=rating,
         )
-        return self.comment_repository.save(comment)
+        comment = self.comment_repository.save(comment)
+
+        if self.search_cache is not None:
+            self.search_cache.invalidate_establishment(establishment_id)
+
+        return comment
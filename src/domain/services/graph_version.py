@@ -0,0 +1,37 @@
+import time
+from typing import Callable, Optional
+
+
+class CachedVersion:
+    """
+    Generation counter read through a short-lived cache.
+
+    Reading the counter is a single primary-key lookup, but doing it on every
+    request still costs a round-trip; within ``ttl`` seconds the last value is
+    reused, which bounds how long a process can serve stale derived data.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], int],
+        ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._clock = clock
+        self._value: Optional[int] = None
+        self._expires_at = 0.0
+
+    def get(self) -> int:
+        """Get the counter, fetching it if the cached value expired."""
+        now = self._clock()
+        if self._value is None or now >= self._expires_at:
+            self._value = self._fetch()
+            self._expires_at = now + self._ttl
+        return self._value
+
+    def set(self, value: int) -> None:
+        """Record a value this process has just read or written."""
+        self._value = value
+        self._expires_at = self._clock() + self._ttl
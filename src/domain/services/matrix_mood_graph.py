@@ -0,0 +1,148 @@
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from domain.models.tag import TagRelationship
+
+
+class MatrixMoodGraph:
+    """Mood relationship graph backed by a dense NumPy weight matrix.
+
+    Drop-in alternative to ``MoodGraph``: the closure is the same max-product
+    Floyd-Warshall, but each pivot is applied as a single broadcast update over
+    the whole matrix instead of a Python triple loop.
+    """
+
+    def __init__(self, relationships: List[TagRelationship]):
+        self.nodes: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.matrix = self._build_matrix(relationships)
+        self._compute_transitive_relationships()
+
+    @classmethod
+    def from_matrix(cls, nodes: List[str], matrix: np.ndarray) -> "MatrixMoodGraph":
+        """Wrap an already computed closure, e.g. a memory-mapped snapshot."""
+        graph = cls.__new__(cls)
+        graph.nodes = list(nodes)
+        graph.index = {name: i for i, name in enumerate(graph.nodes)}
+        graph.matrix = matrix
+        return graph
+
+    def _build_matrix(self, relationships: List[TagRelationship]) -> np.ndarray:
+        """Build the initial adjacency matrix and the tag name <-> index map."""
+        for rel in relationships:
+            for name in (rel.source_tag_name, rel.target_tag_name):
+                if name not in self.index:
+                    self.index[name] = len(self.nodes)
+                    self.nodes.append(name)
+
+        matrix = np.zeros((len(self.nodes), len(self.nodes)), dtype=np.float64)
+        for rel in relationships:
+            matrix[self.index[rel.source_tag_name], self.index[rel.target_tag_name]] = (
+                rel.weight
+            )
+
+        return matrix
+
+    def _compute_transitive_relationships(self) -> None:
+        """
+        Compute transitive relationships using Floyd-Warshall algorithm.
+
+        For every pivot k the candidate path strengths i -> k -> j form the outer
+        product of column k and row k; the matrix keeps the element-wise maximum.
+        """
+        matrix = self.matrix
+        for k in range(len(self.nodes)):
+            np.maximum(matrix, np.outer(matrix[:, k], matrix[k, :]), out=matrix)
+
+    def _ensure_node(self, name: str) -> int:
+        """Return the index of a tag, growing the matrix for unseen tags."""
+        if name not in self.index:
+            self.index[name] = len(self.nodes)
+            self.nodes.append(name)
+            self.matrix = np.pad(self.matrix, ((0, 1), (0, 1)))
+        return self.index[name]
+
+    def add_relationship(
+        self, relationship: TagRelationship
+    ) -> Dict[Tuple[str, str], float]:
+        """
+        Fold a new edge into the already computed closure in O(n^2).
+
+        Every path that the edge u -> v can improve has the form i ~> u -> v ~> j,
+        so the update is the outer product of column u and row v scaled by the
+        edge weight. Relationships are insert-only, so an edge is never weakened.
+
+        Returns:
+            Increase of every closure weight the edge changed, by (source, target)
+        """
+        if not self.matrix.flags.writeable:
+            # Snapshots are mapped read-only; switch to a private copy first
+            self.matrix = np.array(self.matrix)
+
+        u = self._ensure_node(relationship.source_tag_name)
+        v = self._ensure_node(relationship.target_tag_name)
+        weight = relationship.weight
+
+        matrix = self.matrix
+        if weight <= matrix[u, v]:
+            return {}
+
+        head = matrix[:, u] * weight
+        head[u] = weight
+        tail = matrix[v, :].copy()
+        tail[v] = 1.0
+        candidate = np.outer(head, tail)
+        increase = candidate - matrix
+        rows, columns = np.nonzero(increase > 0)
+        np.maximum(matrix, candidate, out=matrix)
+
+        return {
+            (self.nodes[i], self.nodes[j]): float(increase[i, j])
+            for i, j in zip(rows.tolist(), columns.tolist())
+        }
+
+    def get_mood_affinities(self, tag_name: str) -> Dict[str, float]:
+        """
+        Get how strongly each mood relates to a tag, the tag itself counting 1.
+
+        This is the closure column of the tag: the moods a search can start from
+        to reach establishments carrying it.
+        """
+        affinities = {}
+        if tag_name in self.index:
+            column = self.matrix[:, self.index[tag_name]]
+            (sources,) = np.nonzero(column > 0)
+            affinities = {self.nodes[i]: float(column[i]) for i in sources.tolist()}
+        affinities[tag_name] = 1.0
+        return affinities
+
+    def __contains__(self, mood_id: str) -> bool:
+        return mood_id in self.index
+
+    def get_all_relationships(self) -> Dict[str, Dict[str, float]]:
+        """Get all mood relationships."""
+        rows = self.matrix.tolist()
+        return {
+            source: dict(zip(self.nodes, row)) for source, row in zip(self.nodes, rows)
+        }
+
+    def get_related_moods(
+        self, mood_id: str, min_weight: float = 0.1
+    ) -> Dict[str, float]:
+        """
+        Get all moods related to the given mood with weights above the minimum threshold.
+
+        Args:
+            mood_id: ID of the mood to find relationships for
+            min_weight: Minimum weight threshold (default 0.1)
+
+        Returns:
+            Dictionary mapping related mood IDs to their relationship weights
+        """
+        if mood_id not in self.index:
+            return {}
+
+        row = self.matrix[self.index[mood_id]]
+        (targets,) = np.nonzero(row >= min_weight)
+        return {self.nodes[j]: float(row[j]) for j in targets}
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from domain.models.tag import TagRelationship
 
 
@@ -48,6 +48,65 @@ class MoodGraph:
                     if path_strength > self.graph[i][j]:
                         self.graph[i][j] = path_strength
 
+    def add_relationship(
+        self, relationship: TagRelationship
+    ) -> Dict[Tuple[str, str], float]:
+        """
+        Fold a new edge into the already computed closure in O(n^2).
+
+        Every path that the edge u -> v can improve has the form i ~> u -> v ~> j,
+        where i ~> u and v ~> j are already optimal in the current closure.
+        Relationships are insert-only, so an existing edge is never weakened.
+
+        Returns:
+            Increase of every closure weight the edge changed, by (source, target)
+        """
+        source = relationship.source_tag_name
+        target = relationship.target_tag_name
+        weight = relationship.weight
+
+        for name in (source, target):
+            if name not in self.graph:
+                for row in self.graph.values():
+                    row[name] = 0
+                self.graph[name] = {node: 0 for node in self.graph}
+                self.graph[name][name] = 0
+
+        changes: Dict[Tuple[str, str], float] = {}
+        if weight <= self.graph[source][target]:
+            return changes
+
+        outgoing = dict(self.graph[target])
+        outgoing[target] = 1.0
+
+        for i, row in self.graph.items():
+            head = 1.0 if i == source else row[source]
+            if head == 0:
+                continue
+            strength = head * weight
+            for j, tail in outgoing.items():
+                path_strength = strength * tail
+                if path_strength > row[j]:
+                    changes[(i, j)] = path_strength - row[j]
+                    row[j] = path_strength
+
+        return changes
+
+    def get_mood_affinities(self, tag_name: str) -> Dict[str, float]:
+        """
+        Get how strongly each mood relates to a tag, the tag itself counting 1.
+
+        This is the closure column of the tag: the moods a search can start from
+        to reach establishments carrying it.
+        """
+        affinities = {
+            source: row[tag_name]
+            for source, row in self.graph.items()
+            if source != tag_name and row.get(tag_name, 0) > 0
+        }
+        affinities[tag_name] = 1.0
+        return affinities
+
     def get_all_relationships(self) -> Dict[str, Dict[str, float]]:
         """Get all mood relationships."""
         return self.graph
@@ -0,0 +1,119 @@
+import heapq
+from array import array
+from typing import List, Dict, Optional, Tuple
+
+from domain.models.tag import TagRelationship
+
+
+class MoodIndex:
+    """
+    Sparse index of the strongest related moods for every tag.
+
+    Instead of materializing the dense all-pairs closure, each source tag runs a
+    best-first (Dijkstra-style) max-product search over the relationship edges.
+    Because weights are in [0, 1], path strength never grows along a path, so the
+    search can stop as soon as it drops below ``min_weight`` or ``top_k`` moods
+    have been settled. Results are kept as parallel arrays sorted by weight.
+    """
+
+    def __init__(
+        self,
+        relationships: List[TagRelationship],
+        min_weight: float = 0.0,
+        top_k: Optional[int] = None,
+    ):
+        self.min_weight = min_weight
+        self.top_k = top_k
+        self._adjacency = self._build_adjacency(relationships)
+        self._related: Dict[str, Tuple[Tuple[str, ...], array]] = {
+            source: self._search(source) for source in self._adjacency
+        }
+
+    def _build_adjacency(
+        self, relationships: List[TagRelationship]
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """Build outgoing edge lists from relationships."""
+        adjacency: Dict[str, List[Tuple[str, float]]] = {}
+
+        for rel in relationships:
+            adjacency.setdefault(rel.source_tag_name, []).append(
+                (rel.target_tag_name, rel.weight)
+            )
+
+        return adjacency
+
+    def add_relationship(self, relationship: TagRelationship) -> None:
+        """
+        Add a relationship, searching again only from the sources it can affect.
+
+        A new edge can only change the related moods of its source and of the
+        sources with a path to it, found by walking the edges backwards.
+        """
+        self._adjacency.setdefault(relationship.source_tag_name, []).append(
+            (relationship.target_tag_name, relationship.weight)
+        )
+
+        reverse: Dict[str, List[str]] = {}
+        for source, edges in self._adjacency.items():
+            for target, weight in edges:
+                if weight > 0:
+                    reverse.setdefault(target, []).append(source)
+
+        affected = {relationship.source_tag_name}
+        pending = [relationship.source_tag_name]
+        while pending:
+            for source in reverse.get(pending.pop(), ()):
+                if source not in affected:
+                    affected.add(source)
+                    pending.append(source)
+
+        for source in affected:
+            if source in self._adjacency:
+                self._related[source] = self._search(source)
+
+    def _search(self, source: str) -> Tuple[Tuple[str, ...], array]:
+        """Find the strongest paths from source, strongest first."""
+        names: List[str] = []
+        weights = array("d")
+        best: Dict[str, float] = {source: 1.0}
+        settled = set()
+        heap = [(-1.0, source)]
+
+        while heap:
+            negative_strength, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+
+            strength = -negative_strength
+            if node != source:
+                names.append(node)
+                weights.append(strength)
+                if self.top_k is not None and len(names) >= self.top_k:
+                    break
+
+            for target, weight in self._adjacency.get(node, ()):
+                path_strength = strength * weight
+                if path_strength <= 0 or path_strength < self.min_weight:
+                    continue
+                if path_strength > best.get(target, 0.0):
+                    best[target] = path_strength
+                    heapq.heappush(heap, (-path_strength, target))
+
+        return tuple(names), weights
+
+    def __contains__(self, mood_id: str) -> bool:
+        return mood_id in self._related
+
+    def related(self, mood_id: str) -> Tuple[Tuple[str, ...], array]:
+        """Get related mood names and weights, sorted by descending weight."""
+        return self._related.get(mood_id, ((), array("d")))
+
+    def get_related_moods(self, mood_id: str) -> Dict[str, float]:
+        """Get related moods of the given mood mapped to their weights."""
+        names, weights = self.related(mood_id)
+        return dict(zip(names, weights))
+
+    def targets(self, mood_id: str) -> List[str]:
+        """Get the moods a relationship leads to directly from the given mood."""
+        return [target for target, _ in self._adjacency.get(mood_id, ())]
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class _Entry:
+    __slots__ = ("results", "tags", "establishment_ids", "expires_at")
+
+    def __init__(self, results, tags, establishment_ids, expires_at):
+        self.results = results
+        self.tags = tags
+        self.establishment_ids = establishment_ids
+        self.expires_at = expires_at
+
+
+class SearchCache:
+    """
+    LRU cache of search results with a time-to-live.
+
+    Each entry remembers the tags whose counts can change its scores and the
+    establishments it returned, so a write only drops the
+    entries it can actually change. Entries are tagged with the mood graph
+    version they were computed under; a different version empties the cache.
+    Only the graph version is shared between processes: writes handled by
+    other workers show up here once the entries expire.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._graph_version: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        tag_weights: Dict[str, float], limit: int, include_comments: bool
+    ) -> Hashable:
+        """Normalize a query so equal queries map to the same entry."""
+        return tuple(sorted(tag_weights.items())), limit, include_comments
+
+    def get(self, key: Hashable, graph_version: int) -> Optional[List]:
+        """Get cached results, or None on a miss."""
+        with self._lock:
+            self._check_graph_version(graph_version)
+            entry = self._entries.get(key)
+            if entry is None or self._clock() >= entry.expires_at:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.results)
+
+    def put(
+        self,
+        key: Hashable,
+        graph_version: int,
+        results: List,
+        tags: Iterable[str],
+    ) -> None:
+        """Store results along with every tag that contributed to their scores."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._check_graph_version(graph_version)
+            self._entries[key] = _Entry(
+                list(results),
+                frozenset(tags),
+                frozenset(result.id for result in results),
+                self._clock() + self.ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_tags(self, tag_names: Iterable[str]) -> None:
+        """Drop entries whose scores depend on any of the tags."""
+        tag_names = frozenset(tag_names)
+        self._invalidate(lambda entry: not entry.tags.isdisjoint(tag_names))
+
+    def invalidate_establishment(self, establishment_id: int) -> None:
+        """Drop entries that returned the establishment."""
+        self._invalidate(lambda entry: establishment_id in entry.establishment_ids)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the current number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _invalidate(self, predicate: Callable[[_Entry], bool]) -> None:
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if predicate(entry)]
+            for key in stale:
+                del self._entries[key]
+
+    def _check_graph_version(self, graph_version: int) -> None:
+        if graph_version != self._graph_version:
+            self._entries.clear()
+            self._graph_version = graph_version
@@ -1,24 +1,61 @@
-from typing import List, Dict, Optional
+import math
+from typing import FrozenSet, Iterable, Iterator, List, Dict, Optional, Tuple
 
 from domain.models.tag import Tag, TagRelationship
 from domain.ports.input.tag_service import TagServicePort
 from domain.ports.output.tag_repository import TagRepositoryPort
+from domain.ports.output.mood_graph_snapshot import MoodGraphSnapshotPort
 from domain.services.mood_graph import MoodGraph
+from domain.services.matrix_mood_graph import MatrixMoodGraph
+from domain.services.mood_index import MoodIndex
+from domain.services.graph_version import CachedVersion
+
+MOOD_GRAPH_BACKENDS = {
+    "python": MoodGraph,
+    "numpy": MatrixMoodGraph,
+}
 
 
 class TagService(TagServicePort):
     """Implementation of tag service."""
 
-    def __init__(self, tag_repository: TagRepositoryPort):
+    def __init__(
+        self,
+        tag_repository: TagRepositoryPort,
+        graph_backend: str = "python",
+        related_min_weight: float = 0.0,
+        related_top_k: Optional[int] = None,
+        snapshot_store: Optional[MoodGraphSnapshotPort] = None,
+        version_ttl: float = 5.0,
+        materialize_mood_scores: bool = False,
+    ):
+        if graph_backend not in MOOD_GRAPH_BACKENDS:
+            raise ValueError(f"Unknown mood graph backend: {graph_backend}")
+        if snapshot_store is not None and graph_backend != "numpy":
+            raise ValueError("Mood graph snapshots require the numpy backend")
+
         self.tag_repository = tag_repository
+        self._mood_graph_class = MOOD_GRAPH_BACKENDS[graph_backend]
         self._mood_graph = None
+        self._mood_graph_version = None
+        self._related_min_weight = related_min_weight
+        self._related_top_k = related_top_k
+        self._mood_index = None
+        self._mood_index_version = None
+        self._snapshot_store = snapshot_store
+        self._materialize_mood_scores = materialize_mood_scores
+        self._graph_version = CachedVersion(
+            tag_repository.get_graph_version, ttl=version_ttl
+        )
 
     def create_tag(self, name: str, description: Optional[str] = None) -> Tag:
         """Create a new tag."""
         tag = Tag(name=name, description=description)
         return self.tag_repository.save(tag)
 
-    def create_tag_if_not_exists(self, name: str, description: Optional[str] = None) -> Tag:
+    def create_tag_if_not_exists(
+        self, name: str, description: Optional[str] = None
+    ) -> Tag:
         """Create a tag if it doesn't exist, otherwise return existing tag."""
         existing_tag = self.tag_repository.get_by_name(name)
         if existing_tag:
@@ -44,12 +81,66 @@ class TagService(TagServicePort):
             target_tag_name=target_name,
             weight=weight,
         )
-        saved_rel = self.tag_repository.save_relationship(relationship)
+        try:
+            saved_rel = self.tag_repository.save_relationship(
+                relationship, self._fold_relationship
+            )
+        except Exception:
+            # The local graph and index may hold a relationship that was rolled back
+            self._mood_graph = None
+            self._mood_index = None
+            raise
+        version = self.tag_repository.get_graph_version()
 
-        self._mood_graph = None
+        if self._mood_graph is not None and self._mood_graph_version == version:
+            self._save_snapshot()
+        self._graph_version.set(version)
 
         return saved_rel
 
+    def _fold_relationship(
+        self, relationship: TagRelationship, version: int
+    ) -> Dict[Tuple[str, str], float]:
+        """
+        Apply a relationship saved as graph version ``version`` locally.
+
+        Runs inside the saving transaction, after the version bump serialized
+        concurrent saves, so every other relationship is part of version - 1.
+        An up-to-date graph and mood index are patched in place. Otherwise,
+        with materialized mood scores, the graph of version - 1 is rebuilt in
+        memory to get the delta; anything else outdated is left to be reloaded
+        on next access.
+
+        Returns:
+            Mood score changes to store along with the relationship
+        """
+        if self._mood_index is not None and self._mood_index_version == version - 1:
+            self._mood_index.add_relationship(relationship)
+            self._mood_index_version = version
+
+        if self._mood_graph is None or self._mood_graph_version != version - 1:
+            if not self._materialize_mood_scores:
+                return {}
+            self._mood_graph = self._mood_graph_class(
+                [
+                    saved
+                    for saved in self.tag_repository.get_all_relationships()
+                    if (saved.source_tag_name, saved.target_tag_name)
+                    != (relationship.source_tag_name, relationship.target_tag_name)
+                ]
+            )
+
+        changes = self._mood_graph.add_relationship(relationship)
+        self._mood_graph_version = version
+        if not self._materialize_mood_scores:
+            return {}
+
+        # A tag always counts for itself with weight 1, whatever cycles
+        # through it do to the diagonal of the closure
+        return {
+            pair: increase for pair, increase in changes.items() if pair[0] != pair[1]
+        }
+
     def get_tag(self, name: str) -> Optional[Tag]:
         """Get tag by name."""
         return self.tag_repository.get_by_name(name)
@@ -60,8 +151,106 @@ class TagService(TagServicePort):
 
     def get_mood_graph(self) -> Dict[str, Dict[str, float]]:
         """Get the complete mood graph with computed weights using Floyd-Warshall."""
-        if self._mood_graph is None:
+        return self._current_mood_graph().get_all_relationships()
+
+    def get_mood_affinities(self, tag_name: str) -> Dict[str, float]:
+        """
+        Get the closure weight from every mood to a tag, the tag counting 1.
+
+        These weights are written into materialized mood scores, where an
+        outdated graph would never be corrected, so the graph version is read
+        rather than cached, and locked until the caller's transaction ends.
+        """
+        self._graph_version.set(self.tag_repository.get_graph_version(lock=True))
+        return self._current_mood_graph().get_mood_affinities(tag_name)
+
+    def rebuild_mood_scores(self) -> None:
+        """Recompute the materialized establishment mood scores from scratch."""
+        self._graph_version.set(self.tag_repository.get_graph_version(lock=True))
+        self.tag_repository.rebuild_mood_scores(self._iter_mood_affinities())
+
+    def _iter_mood_affinities(self) -> Iterator[Tuple[Tuple[str, str], float]]:
+        relationships = self._current_mood_graph().get_all_relationships()
+        for mood, row in relationships.items():
+            for tag_name, weight in row.items():
+                if weight > 0 and mood != tag_name:
+                    yield (mood, tag_name), weight
+        for tag in self.tag_repository.get_all():
+            yield (tag.name, tag.name), 1.0
+
+    def _current_mood_graph(self):
+        """Get the mood graph, rebuilt if the graph version moved on."""
+        version = self._graph_version.get()
+        if self._mood_graph is None or self._mood_graph_version != version:
+            self._mood_graph = self._load_mood_graph()
+            self._mood_graph_version = version
+
+        return self._mood_graph
+
+    def get_graph_version(self) -> int:
+        """Get the (briefly cached) generation counter of the mood graph."""
+        return self._graph_version.get()
+
+    def _load_mood_graph(self):
+        """Map the shared snapshot of the current version or compute the graph."""
+        if self._snapshot_store is not None:
+            version = self.tag_repository.get_relationships_fingerprint()
+            snapshot = self._snapshot_store.load(version)
+            if snapshot is not None:
+                return MatrixMoodGraph.from_matrix(*snapshot)
+
+        relationships = self.tag_repository.get_all_relationships()
+        mood_graph = self._mood_graph_class(relationships)
+
+        if self._snapshot_store is not None:
+            self._snapshot_store.save(version, mood_graph.nodes, mood_graph.matrix)
+
+        return mood_graph
+
+    def _save_snapshot(self) -> None:
+        """Publish the in-process graph so other workers can map it."""
+        if self._snapshot_store is None:
+            return
+
+        version = self.tag_repository.get_relationships_fingerprint()
+        self._snapshot_store.save(
+            version, self._mood_graph.nodes, self._mood_graph.matrix
+        )
+
+    def get_related_moods(self, tag_name: str) -> Dict[str, float]:
+        """Get the strongest moods related to a tag from the sparse mood index."""
+        return self._current_mood_index().get_related_moods(tag_name)
+
+    def get_scored_tags(self, tag_names: Iterable[str]) -> FrozenSet[str]:
+        """
+        Get the tags whose counts can change the score of a search for tags.
+
+        Materialized mood scores cover every tag a query tag reaches in the
+        closure; otherwise searches only follow relationships leading directly
+        from a query tag.
+        """
+        tags = set(tag_names)
+        if self._materialize_mood_scores:
+            mood_graph = self._current_mood_graph()
+            for tag_name in list(tags):
+                # Smallest positive weight: every tag the closure reaches at all
+                tags.update(mood_graph.get_related_moods(tag_name, math.ulp(0.0)))
+        else:
+            mood_index = self._current_mood_index()
+            for tag_name in list(tags):
+                tags.update(mood_index.targets(tag_name))
+        return frozenset(tags)
+
+    def _current_mood_index(self) -> MoodIndex:
+        """Get the related-mood index, rebuilt if the graph version moved on."""
+        version = self._graph_version.get()
+        if self._mood_index is None or self._mood_index_version != version:
             relationships = self.tag_repository.get_all_relationships()
-            self._mood_graph = MoodGraph(relationships)
+            self._mood_index = MoodIndex(
+                relationships,
+                min_weight=self._related_min_weight,
+                top_k=self._related_top_k,
+            )
+            self._mood_index_version = version
 
-        return self._mood_graph.get_all_relationships()
+        return self._mood_index
@@ -0,0 +1,78 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from adapters.output.persistence.sqlalchemy.models.establishment import (
+    EstablishmentRatingStatsModel,
+)
+from adapters.output.persistence.sqlalchemy.repositories import (
+    comment_repository as repository_module,
+)
+from domain.models.comment import RatingStats
+
+MIGRATION = (
+    Path(__file__).parents[2]
+    / "migrations"
+    / "versions"
+    / "d41a7c3e9b58_establishment_rating_stats.py"
+)
+
+
+@pytest.fixture(params=["upsert", "row_by_row"])
+def service(request, establishment_service, monkeypatch):
+    """Establishment service counting ratings with either strategy."""
+    if request.param == "row_by_row":
+        monkeypatch.setattr(repository_module, "dialect_insert", lambda session: None)
+    return establishment_service
+
+
+def add_ratings(service, ratings):
+    """Create one establishment per name and comment once per rating."""
+    ids = {}
+    for name, values in ratings.items():
+        ids[name] = service.create_establishment({"name": name}).id
+        for rating in values:
+            service.add_comment(ids[name], f"{name} review", rating)
+    return ids
+
+
+def test_saving_comments_counts_ratings(service):
+    """Test each saved comment lands in its establishment's count, sum and bucket."""
+    ids = add_ratings(service, {"Cafe": [9, 7, 9, 1], "Bar": [10]})
+    repository = service.comment_repository
+
+    cafe = repository.get_rating_stats(ids["Cafe"])
+    assert (cafe.count, cafe.total) == (4, 26)
+    assert cafe.histogram == [1, 0, 0, 0, 0, 0, 1, 0, 2, 0]
+
+    bar = repository.get_rating_stats(ids["Bar"])
+    assert (bar.count, bar.total) == (1, 10)
+    assert bar.histogram == [0] * 9 + [1]
+
+    assert repository.get_rating_stats(ids["Bar"] + 1) == RatingStats()
+
+
+def test_migration_backfills_stats_from_comments(establishment_service, db_session):
+    """Test the migration's backfill matches the incrementally kept stats."""
+    ids = add_ratings(
+        establishment_service, {"Cafe": [9, 7, 9, 1], "Bar": [10], "Club": []}
+    )
+    repository = establishment_service.comment_repository
+    expected = {name: repository.get_rating_stats(id) for name, id in ids.items()}
+
+    spec = importlib.util.spec_from_file_location("rating_stats", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    db_session.commit()
+    with db_session.get_bind().begin() as connection:
+        EstablishmentRatingStatsModel.__table__.drop(connection)
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+    db_session.expire_all()
+    assert {
+        name: repository.get_rating_stats(id) for name, id in ids.items()
+    } == expected
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.output.persistence.sqlalchemy.models.comment import CommentModel
+from adapters.output.persistence.sqlalchemy.models.establishment import (
+    LATEST_COMMENTS,
+)
+
+NOON = datetime(2024, 5, 1, 12, 0)
+
+
+def add_comments(service, session, establishment_id, times):
+    """Comment once per timestamp, returning comment ids in insertion order."""
+    ids = []
+    for i, created_at in enumerate(times):
+        comment = service.add_comment(establishment_id, f"Comment {i}", 5)
+        session.query(CommentModel).filter_by(id=comment.id).update(
+            {"created_at": created_at}
+        )
+        ids.append(comment.id)
+    session.commit()
+    return ids
+
+
+def test_get_page_seeks_newest_first(establishment_service, db_session):
+    """Test keyset pages walk comments from newest to oldest without gaps."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    times = [NOON + timedelta(minutes=i) for i in range(5)]
+    ids = add_comments(establishment_service, db_session, cafe.id, times)
+    repository = establishment_service.comment_repository
+
+    first = repository.get_page(cafe.id, 2)
+    second = repository.get_page(cafe.id, 2, first[-1].created_at, first[-1].id)
+    last = repository.get_page(cafe.id, 2, second[-1].created_at, second[-1].id)
+
+    assert [c.id for c in first + second + last] == ids[::-1]
+    assert repository.get_page(cafe.id, 2, times[0]) == []
+
+
+def test_get_page_breaks_ties_by_id(establishment_service, db_session):
+    """Test comments sharing a timestamp are neither skipped nor repeated."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    ids = add_comments(
+        establishment_service, db_session, cafe.id, [NOON - timedelta(hours=1)]
+    )
+    ids += add_comments(establishment_service, db_session, cafe.id, [NOON] * 3)
+    repository = establishment_service.comment_repository
+
+    first = repository.get_page(cafe.id, 2)
+    rest = repository.get_page(cafe.id, 10, first[-1].created_at, first[-1].id)
+
+    assert [c.id for c in first] == [ids[3], ids[2]]
+    assert [c.id for c in rest] == [ids[1], ids[0]]
+    # Without before_id, the whole timestamp is skipped
+    assert [c.id for c in repository.get_page(cafe.id, 10, NOON)] == [ids[0]]
+
+
+def test_establishment_embeds_latest_comments_and_count(
+    admin_client, establishment_service, db_session
+):
+    """Test each establishment embeds only its own latest comments."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    bar = establishment_service.create_establishment({"name": "Bar"})
+    times = [NOON + timedelta(minutes=i) for i in range(LATEST_COMMENTS + 2)]
+    cafe_ids = add_comments(establishment_service, db_session, cafe.id, times)
+    bar_ids = add_comments(establishment_service, db_session, bar.id, times[:1])
+    db_session.expire_all()
+
+    response = admin_client.get(f"/establishments/{cafe.id}")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [c["id"] for c in body["comments"]] == cafe_ids[::-1][:LATEST_COMMENTS]
+    assert body["comment_count"] == len(cafe_ids)
+
+    body = admin_client.get(f"/establishments/{bar.id}").get_json()
+    assert [c["id"] for c in body["comments"]] == bar_ids
+    assert body["comment_count"] == 1
+
+
+def test_comments_endpoint_pages_with_next_before_headers(
+    admin_client, establishment_service, db_session
+):
+    """Test the X-Next-Before headers of a full page lead to the next one."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    ids = add_comments(establishment_service, db_session, cafe.id, [NOON] * 3)
+    url = f"/establishments/{cafe.id}/comments"
+
+    response = admin_client.get(f"{url}?limit=2")
+    assert [c["id"] for c in response.get_json()] == ids[:0:-1]
+    next_page = {
+        "limit": 2,
+        "before": response.headers["X-Next-Before"],
+        "before_id": response.headers["X-Next-Before-Id"],
+    }
+
+    response = admin_client.get(url, query_string=next_page)
+    assert [c["id"] for c in response.get_json()] == ids[:1]
+    assert "X-Next-Before" not in response.headers
+
+
+def test_comments_endpoint_rejects_before_id_without_before(
+    admin_client, establishment_service
+):
+    """Test before_id alone is a bad request rather than silently ignored."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+
+    response = admin_client.get(f"/establishments/{cafe.id}/comments?before_id=5")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("query", ["limit=abc", "limit=0", "before=now"])
+def test_comments_endpoint_rejects_invalid_paging(
+    admin_client, establishment_service, query
+):
+    """Test malformed paging parameters are bad requests."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+
+    response = admin_client.get(f"/establishments/{cafe.id}/comments?{query}")
+    assert response.status_code == 400
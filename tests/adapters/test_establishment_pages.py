@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+
+def add_establishments(service, count):
+    return [
+        service.create_establishment({"name": f"Place {i}", "description": ""})
+        for i in range(count)
+    ]
+
+
+def test_repository_pages_by_id(establishment_service):
+    """Test keyset pages follow each other without gaps or overlaps."""
+    ids = [e.id for e in add_establishments(establishment_service, 5)]
+    repository = establishment_service.establishment_repository
+
+    first = repository.get_page(2)
+    second = repository.get_page(2, after=first[-1].id)
+    last = repository.get_page(2, after=second[-1].id)
+
+    assert [e.id for e in first + second + last] == ids
+    assert repository.get_page(2, after=ids[-1]) == []
+    assert [e.id for e in repository.iter_all(batch_size=2)] == ids
+
+
+def test_list_pages_with_next_after_header(admin_client, establishment_service):
+    """Test X-Next-After is set on full pages and leads to the next one."""
+    ids = [e.id for e in add_establishments(establishment_service, 3)]
+
+    response = admin_client.get("/establishments?limit=2")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.get_json()] == ids[:2]
+    assert response.headers["X-Next-After"] == str(ids[1])
+
+    response = admin_client.get(
+        f"/establishments?limit=2&after={response.headers['X-Next-After']}"
+    )
+    assert [item["id"] for item in response.get_json()] == ids[2:]
+    assert "X-Next-After" not in response.headers
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=abc", "after=abc", "after=1.5"])
+def test_list_rejects_invalid_paging(admin_client, query):
+    """Test a limit below 1 or a non-integer cursor is a bad request."""
+    assert admin_client.get(f"/establishments?{query}").status_code == 400
+
+
+def test_list_streams_ndjson(admin_client, establishment_service):
+    """Test the NDJSON format streams every establishment, one per line."""
+    ids = [e.id for e in add_establishments(establishment_service, 3)]
+
+    response = admin_client.get("/establishments?format=ndjson&include_comments=false")
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ids
+
+    response = admin_client.get(
+        "/establishments", headers={"Accept": "application/x-ndjson"}
+    )
+    assert len(response.get_data(as_text=True).splitlines()) == 3
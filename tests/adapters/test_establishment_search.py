@@ -0,0 +1,165 @@
+import pytest
+from sqlalchemy import create_mock_engine, event
+
+from adapters.output.persistence.sqlalchemy.repositories.establishment_repository import (
+    SQLAlchemyEstablishmentRepository,
+)
+from domain.models.establishment import EstablishmentSearchResult
+
+
+class PostgreSQLSession:
+    """Session stand-in on the PostgreSQL dialect that compiles what it executes."""
+
+    def __init__(self):
+        self.engine = create_mock_engine("postgresql://", None)
+        self.statements = []
+
+    def get_bind(self):
+        return self.engine
+
+    def execute(self, statement):
+        self.statements.append(statement.compile(dialect=self.engine.dialect))
+        return []
+
+
+def add_catalog(service):
+    """Three tagged and rated establishments, with Cozy related to Calm."""
+    tag_service = service.tag_service
+    for name in ("Cozy", "Calm", "Loud"):
+        tag_service.create_tag(name)
+    tag_service.create_relationship("Cozy", "Calm", 0.5)
+
+    for name, tags, ratings in [
+        ("Library", ["Calm", "Calm", "Cozy"], [9, 7]),
+        ("Cafe", ["Cozy", "Loud"], [6]),
+        ("Club", ["Loud", "Loud"], []),
+    ]:
+        establishment = service.create_establishment({"name": name})
+        for tag_name in tags:
+            service.add_tag_to_establishment(establishment.id, tag_name)
+        for rating in ratings:
+            service.add_comment(establishment.id, f"{name} review", rating)
+
+
+def summary(result):
+    return (
+        result.id,
+        result.name,
+        result.description,
+        sorted((tag.tag_name, tag.count) for tag in result.tags),
+        result.score,
+        result.rating_stats,
+    )
+
+
+def test_projected_results_match_hydrated(establishment_service):
+    """Test the column projection builds the same results as the ORM path."""
+    add_catalog(establishment_service)
+    tag_weights = {"Cozy": 1.0, "Loud": 0.5}
+
+    hydrated = establishment_service.search_establishments(tag_weights, 10, True)
+    projected = establishment_service.search_establishments(tag_weights, 10, False)
+
+    assert all(isinstance(result, EstablishmentSearchResult) for result in projected)
+    assert [result.comments for result in projected] == [None] * len(projected)
+    assert [summary(result) for result in projected] == [
+        summary(result) for result in hydrated
+    ]
+    assert [result.name for result in projected] == ["Library", "Cafe", "Club"]
+
+
+@pytest.mark.parametrize(
+    "establishment_service, transitive_tag_invalidates",
+    [
+        ({"search_cache": True}, False),
+        ({"materialized": True, "search_cache": True}, True),
+    ],
+    indirect=["establishment_service"],
+)
+def test_search_cache_only_drops_entries_a_tag_can_change(
+    establishment_service, transitive_tag_invalidates
+):
+    """Test tagging a mood the search doesn't score keeps its entry cached."""
+    service = establishment_service
+    tag_service = service.tag_service
+    for name in ("Cozy", "Calm", "Quiet", "Loud", "Party"):
+        tag_service.create_tag(name)
+    tag_service.create_relationship("Cozy", "Calm", 0.5)
+    tag_service.create_relationship("Calm", "Quiet", 0.5)
+    tag_service.create_relationship("Loud", "Party", 0.5)
+    library = service.create_establishment({"name": "Library"})
+    club = service.create_establishment({"name": "Club"})
+    service.add_tag_to_establishment(library.id, "Cozy")
+
+    def is_cached():
+        hits = service.get_search_cache_stats()["hits"]
+        service.search_establishments({"Cozy": 1.0}, 10, False)
+        return service.get_search_cache_stats()["hits"] > hits
+
+    service.search_establishments({"Cozy": 1.0}, 10, False)
+    service.add_tag_to_establishment(club.id, "Loud")
+    assert is_cached()
+
+    # Only materialized scores follow the closure beyond direct relationships
+    service.add_tag_to_establishment(club.id, "Quiet")
+    assert is_cached() is not transitive_tag_invalidates
+
+    service.add_tag_to_establishment(club.id, "Calm")
+    assert not is_cached()
+
+
+@pytest.mark.parametrize("include_comments", [True, False])
+def test_postgresql_search_text_does_not_depend_on_weights(include_comments):
+    """Test different tag sets reuse one statement, only the arrays change."""
+    compiled = []
+    for tag_weights in ({"Cozy": 1.0}, {"Calm": 0.3, "Loud": 0.7, "Party": 1.0}):
+        session = PostgreSQLSession()
+        repository = SQLAlchemyEstablishmentRepository(session)
+        assert repository.get_by_tags(tag_weights, 10, include_comments) == []
+        (statement,) = session.statements
+        compiled.append(statement)
+
+    assert compiled[0].string == compiled[1].string
+    assert "unnest" in compiled[0].string
+    assert compiled[1].params["tag_names"] == ["Calm", "Loud", "Party"]
+    assert compiled[1].params["weights"] == [0.3, 0.7, 1.0]
+
+
+def test_sqlite_search_builds_weights_into_case(establishment_service, db_session):
+    """Test other databases score with CASE expressions instead of arrays."""
+    add_catalog(establishment_service)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        results = establishment_service.search_establishments({"Cozy": 1.0}, 10, False)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert [result.name for result in results] == ["Library", "Cafe"]
+    (statement,) = statements
+    assert "CASE" in statement
+    assert "unnest" not in statement
+
+
+def test_relationship_patches_current_mood_index(establishment_service, monkeypatch):
+    """Test a new relationship updates the related-mood index without reloading."""
+    tag_service = establishment_service.tag_service
+    for name in ("Cozy", "Calm", "Quiet"):
+        tag_service.create_tag(name)
+    tag_service.create_relationship("Cozy", "Calm", 0.5)
+    assert tag_service.get_related_moods("Cozy") == {"Calm": 0.5}
+
+    def reload():
+        raise AssertionError("mood index reloaded")
+
+    monkeypatch.setattr(tag_service.tag_repository, "get_all_relationships", reload)
+    tag_service.create_relationship("Calm", "Quiet", 0.8)
+
+    assert tag_service.get_related_moods("Cozy") == pytest.approx(
+        {"Calm": 0.5, "Quiet": 0.4}
+    )
@@ -0,0 +1,171 @@
+import json
+from datetime import datetime
+
+import pytest
+from flask_restx import marshal
+
+from adapters.input.api import establishments as establishments_module
+from adapters.input.api.establishments import comment_model, establishment_model
+from adapters.input.api.fast_json import compile_model, dumps
+from domain.models.comment import Comment, RatingStats
+from domain.models.establishment import (
+    Establishment,
+    EstablishmentSearchResult,
+    EstablishmentTag,
+)
+
+
+def make_establishment(rating_stats=None):
+    comment = Comment(
+        id=7,
+        establishment_id=1,
+        text="Lovely",
+        rating=9,
+        created_at=datetime(2026, 1, 2, 3, 4, 5, 678),
+    )
+    return Establishment(
+        id=1,
+        name="Cafe",
+        description="Quiet place",
+        tags=[EstablishmentTag("Cozy", 3), EstablishmentTag("Calm", 1)],
+        comments=[comment],
+        score=2,
+        created_at=datetime(2026, 1, 1),
+        rating_stats=rating_stats,
+    )
+
+
+def test_compiled_model_matches_marshal():
+    """Test compiled rendering produces the same JSON as marshal."""
+    stats = RatingStats()
+    stats.add(9)
+    render = compile_model(establishment_model)
+
+    for establishment in (make_establishment(stats), make_establishment()):
+        expected = json.loads(json.dumps(marshal(establishment, establishment_model)))
+        assert json.loads(dumps(render(establishment))) == expected
+
+
+def test_compiled_model_handles_search_results_and_comments():
+    """Test slotted search results and comment lists render like marshal."""
+    result = EstablishmentSearchResult(
+        id=2, name="Bar", description="", tags=[], score=1.5
+    )
+    render = compile_model(establishment_model)
+    assert render(result) == json.loads(
+        json.dumps(marshal(result, establishment_model))
+    )
+
+    comments = make_establishment().comments
+    render_comment = compile_model(comment_model)
+    assert json.loads(dumps([render_comment(c) for c in comments])) == json.loads(
+        json.dumps(marshal(comments, comment_model))
+    )
+
+
+def test_dumps_without_orjson(monkeypatch):
+    """Test the standard library fallback encodes datetimes like orjson."""
+    monkeypatch.setattr("adapters.input.api.fast_json.orjson", None)
+    data = {"created_at": datetime(2026, 1, 2, 3, 4, 5, 678), "count": 3}
+
+    assert dumps(data) == b'{"created_at":"2026-01-02T03:04:05.000678","count":3}'
+
+
+def canonical(body: bytes) -> str:
+    """Re-encode a JSON body so responses compare regardless of whitespace."""
+    return json.dumps(json.loads(body))
+
+
+@pytest.fixture
+def fetch(admin_client, establishments_app, monkeypatch):
+    """Make a request with FAST_JSON off and on, returning both responses."""
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("marshal called with FAST_JSON enabled")
+
+    def request(method, url, **kwargs):
+        response = admin_client.open(url, method=method, **kwargs)
+        # Drain streamed bodies while the config they were rendered with holds
+        response.get_data()
+        response.close()
+        return response
+
+    def fetch(method, url, fast_marshal=False, **kwargs):
+        slow = request(method, url, **kwargs)
+        with monkeypatch.context() as patch:
+            patch.setitem(establishments_app.config, "FAST_JSON", True)
+            if not fast_marshal:
+                patch.setattr(establishments_module, "marshal", forbidden)
+            fast = request(method, url, **kwargs)
+        assert slow.status_code == fast.status_code == 200
+        return slow, fast
+
+    return fetch
+
+
+@pytest.fixture
+def catalog(establishment_service):
+    """Tagged and commented establishments, plus a bare one."""
+    service = establishment_service
+    cafe = service.create_establishment({"name": "Cafe", "description": "Quiet"})
+    bar = service.create_establishment({"name": "Bar"})
+    service.create_establishment({"name": "Club"})
+    for name in ("Cozy", "Calm"):
+        service.tag_service.create_tag(name)
+    service.tag_service.create_relationship("Cozy", "Calm", 0.5)
+    service.add_tags_to_establishments(
+        [(cafe.id, "Cozy"), (cafe.id, "Cozy"), (bar.id, "Calm")]
+    )
+    for rating in (9, 7, 4):
+        service.add_comment(cafe.id, f"Rated {rating}", rating)
+    return cafe.id
+
+
+@pytest.mark.parametrize(
+    "query", ["", "?limit=2", "?limit=2&after=2", "?include_comments=false"]
+)
+def test_fast_json_list_matches_marshal(fetch, catalog, query):
+    """Test establishment pages and their cursor header are the same."""
+    slow, fast = fetch("GET", f"/establishments{query}")
+
+    assert canonical(fast.data) == canonical(slow.data)
+    assert fast.headers.get("X-Next-After") == slow.headers.get("X-Next-After")
+
+
+def test_fast_json_get_matches_marshal(fetch, catalog):
+    """Test one establishment, and the fallback for a missing one, are the same."""
+    slow, fast = fetch("GET", f"/establishments/{catalog}")
+    assert canonical(fast.data) == canonical(slow.data)
+
+    # Nothing to compile for None, so marshal renders it on both paths
+    slow, fast = fetch("GET", "/establishments/999", fast_marshal=True)
+    assert canonical(fast.data) == canonical(slow.data)
+
+
+@pytest.mark.parametrize("include_comments", [True, False])
+def test_fast_json_search_matches_marshal(fetch, catalog, include_comments):
+    """Test hydrated and projected search results are the same."""
+    body = {"tag_names": ["Cozy", "Calm"], "include_comments": include_comments}
+    slow, fast = fetch("POST", "/establishments/search", json=body)
+
+    assert canonical(fast.data) == canonical(slow.data)
+
+
+def test_fast_json_ndjson_matches_marshal(fetch, catalog):
+    """Test the streamed catalog is the same line by line."""
+    slow, fast = fetch("GET", "/establishments?format=ndjson")
+
+    slow_lines = slow.data.splitlines()
+    assert len(slow_lines) == 3
+    assert [canonical(line) for line in fast.data.splitlines()] == [
+        canonical(line) for line in slow_lines
+    ]
+
+
+def test_fast_json_comments_match_marshal(fetch, catalog):
+    """Test comment pages and their cursor headers are the same."""
+    slow, fast = fetch("GET", f"/establishments/{catalog}/comments?limit=2")
+
+    assert canonical(fast.data) == canonical(slow.data)
+    for header in ("X-Next-Before", "X-Next-Before-Id"):
+        assert fast.headers[header] == slow.headers[header]
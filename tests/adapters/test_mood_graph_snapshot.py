@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from adapters.output.persistence.snapshot.mood_graph_snapshot import (
+    FileMoodGraphSnapshotStore,
+)
+from domain.models.tag import TagRelationship
+from domain.services.matrix_mood_graph import MatrixMoodGraph
+
+
+def make_graph():
+    return MatrixMoodGraph(
+        [
+            TagRelationship(id=None, source_tag_name=s, target_tag_name=t, weight=w)
+            for s, t, w in [("Happy", "Excited", 0.8), ("Excited", "Energetic", 0.9)]
+        ]
+    )
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test a saved closure is mapped back read-only with the same contents."""
+    store = FileMoodGraphSnapshotStore(str(tmp_path))
+    graph = make_graph()
+
+    store.save("v1", graph.nodes, graph.matrix)
+    nodes, matrix = store.load("v1")
+
+    assert nodes == graph.nodes
+    assert isinstance(matrix, np.memmap)
+    assert not matrix.flags.writeable
+    np.testing.assert_array_equal(matrix, graph.matrix)
+
+
+def test_snapshot_version_mismatch(tmp_path):
+    """Test only the snapshot of the requested version is used."""
+    store = FileMoodGraphSnapshotStore(str(tmp_path))
+    graph = make_graph()
+
+    store.save("v1", graph.nodes, graph.matrix)
+    store.save("v2", graph.nodes, graph.matrix)
+
+    assert store.load("v1") is None
+    assert store.load("v2") is not None
+    assert store.load("missing") is None
+
+
+def test_mapped_graph_copies_on_update(tmp_path):
+    """Test an incremental update never writes through to the shared mapping."""
+    store = FileMoodGraphSnapshotStore(str(tmp_path))
+    graph = make_graph()
+    store.save("v1", graph.nodes, graph.matrix)
+
+    mapped = MatrixMoodGraph.from_matrix(*store.load("v1"))
+    mapped.add_relationship(
+        TagRelationship(
+            id=None, source_tag_name="Energetic", target_tag_name="Happy", weight=0.5
+        )
+    )
+
+    assert mapped.get_all_relationships()["Excited"]["Happy"] == pytest.approx(0.45)
+    assert store.load("v1")[1][graph.index["Excited"], graph.index["Happy"]] == 0
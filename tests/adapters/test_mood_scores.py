@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import event
+
+from adapters.output.persistence.sqlalchemy.models.establishment import (
+    EstablishmentMoodScoreModel,
+)
+
+
+def stored_scores(session):
+    session.expire_all()
+    return {
+        (row.establishment_id, row.tag_name): row.score
+        for row in session.query(EstablishmentMoodScoreModel)
+    }
+
+
+@pytest.fixture
+def worker(make_establishment_service):
+    """Start a new worker scoring searches over materialized mood scores."""
+    return lambda: make_establishment_service(materialized=True)
+
+
+@pytest.fixture
+def catalog(worker):
+    """Tagged establishments and a worker that has loaded the mood graph."""
+    service = worker()
+    for name in ("Cozy", "Calm", "Quiet", "Loud", "Party"):
+        service.tag_service.create_tag(name)
+    library, cafe, club = [
+        service.create_establishment({"name": name}).id
+        for name in ("Library", "Cafe", "Club")
+    ]
+    service.add_tags_to_establishments(
+        [(library, "Quiet"), (library, "Quiet"), (library, "Calm"), (club, "Party")]
+    )
+    service.tag_service.create_relationship("Cozy", "Calm", 0.8)
+    service.add_tag_to_establishment(cafe, "Cozy")
+    return service, library, cafe, club
+
+
+def test_incremental_mood_scores_match_rebuild(db_session, catalog, worker):
+    """Test relationship and tag writes keep scores equal to a full rebuild."""
+    service, library, cafe, club = catalog
+
+    # Alternate between the warm worker and fresh ones without a local graph
+    service.tag_service.create_relationship("Calm", "Quiet", 0.5)
+    worker().tag_service.create_relationship("Quiet", "Cozy", 0.9)
+    service.tag_service.create_relationship("Loud", "Party", 0.7)
+    worker().tag_service.create_relationship("Cozy", "Quiet", 0.6)
+    service.add_tag_to_establishment(cafe, "Loud")
+    service.add_tags_to_establishments([(club, "Calm"), (library, "Cozy")])
+
+    incremental = stored_scores(db_session)
+    service.tag_service.rebuild_mood_scores()
+    rebuilt = stored_scores(db_session)
+
+    assert incremental.keys() == rebuilt.keys()
+    assert incremental == pytest.approx(rebuilt)
+    assert rebuilt[(library, "Cozy")] == pytest.approx(1 + 2 * 0.6 + 1 * 0.8)
+
+
+def test_fresh_worker_applies_delta_without_rebuilding(db_session, catalog, worker):
+    """Test a worker without a local graph doesn't rebuild the whole table."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        worker().tag_service.create_relationship("Calm", "Quiet", 0.5)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert not any(statement.startswith("DELETE") for statement in statements)
+    # Cozy -> Calm -> Quiet and Calm -> Quiet are the only new affinities
+    assert sum("INSERT INTO establishment_mood_scores" in s for s in statements) == 2
+
+
+def test_materialized_search_scores_over_the_closure(catalog):
+    """Test searches rank by the transitive closure of the mood graph."""
+    service, library, cafe, club = catalog
+    service.tag_service.create_relationship("Calm", "Quiet", 0.5)
+
+    results = service.search_establishments({"Cozy": 1.0}, 10, False)
+
+    # Library: Calm 0.8 + 2 * Quiet 0.4; Cafe: Cozy 1
+    assert [(result.id, result.score) for result in results] == [
+        (library, pytest.approx(1.6)),
+        (cafe, pytest.approx(1.0)),
+    ]
@@ -0,0 +1,81 @@
+import pytest
+
+from adapters.input.api.auth import security
+from adapters.input.api.auth.security import (
+    calibrate_bcrypt_rounds,
+    hash_password,
+    needs_rehash,
+    password_rounds,
+    verify_password,
+)
+from adapters.input.api.auth.utils import get_user_by_email
+from adapters.output.persistence.sqlalchemy.models.user import UserModel
+from infrastructure.database import db
+
+
+def test_calibration_picks_highest_cost_within_target():
+    """Test calibration extrapolates from the minimum cost, doubling per round."""
+    measured = []
+
+    def measure(rounds):
+        measured.append(rounds)
+        return 0.06  # 60 ms at the minimum cost
+
+    assert calibrate_bcrypt_rounds(0.25, 10, 16, measure) == 12
+    assert calibrate_bcrypt_rounds(0.01, 10, 16, measure) == 10
+    assert calibrate_bcrypt_rounds(100.0, 10, 16, measure) == 16
+    assert measured == [10, 10, 10]
+
+
+def test_hash_password_uses_requested_cost():
+    """Test hashes record their cost so logins can detect outdated ones."""
+    password_hash = hash_password("secret", rounds=4)
+
+    assert password_rounds(password_hash) == 4
+    assert verify_password("secret", password_hash)
+
+
+@pytest.fixture
+def calibrated(monkeypatch):
+    """Set a calibrated (not fixed) cost of 6 within [4, 8]."""
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", None)
+    monkeypatch.setattr(security, "BCRYPT_MIN_ROUNDS", 4)
+    monkeypatch.setattr(security, "BCRYPT_REHASH_TOLERANCE", 1)
+    monkeypatch.setattr(security, "bcrypt_rounds", 6)
+
+
+@pytest.mark.parametrize("rounds, expected", [(4, True), (5, False), (7, False)])
+def test_calibrated_cost_keeps_hashes_within_tolerance(calibrated, rounds, expected):
+    """Test workers calibrated a round apart don't rehash each other's hashes."""
+    assert needs_rehash(hash_password("secret", rounds=rounds)) is expected
+
+
+def test_fixed_cost_is_enforced_exactly(calibrated, monkeypatch):
+    """Test a pinned BCRYPT_ROUNDS replaces any hash of another cost."""
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 6)
+
+    assert needs_rehash(hash_password("secret", rounds=5))
+    assert not needs_rehash(hash_password("secret", rounds=6))
+
+
+def stored_rounds(email):
+    return password_rounds(UserModel.query.filter_by(email=email).one().password_hash)
+
+
+def test_login_rehashes_outdated_password(calibrated, auth_client):
+    """Test a login stores a new hash only when the cost is out of tolerance."""
+    credentials = {"email": "a@x.com", "password": "secret"}
+    db.session.add(
+        UserModel(email="a@x.com", password_hash=hash_password("secret", rounds=5))
+    )
+    db.session.commit()
+
+    assert auth_client.post("/auth/login", json=credentials).status_code == 200
+    assert stored_rounds("a@x.com") == 5
+
+    security.bcrypt_rounds = 7
+    assert auth_client.post("/auth/login", json=credentials).status_code == 200
+    assert stored_rounds("a@x.com") == 7
+    # The user cache serves the new hash, which still verifies
+    assert get_user_by_email("a@x.com").password_hash.startswith("$2b$07$")
+    assert auth_client.post("/auth/login", json=credentials).status_code == 200
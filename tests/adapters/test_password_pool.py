@@ -0,0 +1,31 @@
+import threading
+import time
+
+import pytest
+
+from adapters.input.api.auth.password_pool import PasswordPool, PasswordPoolSaturated
+
+
+def test_pool_without_workers_runs_inline():
+    """Test a size 0 pool runs operations on the calling thread."""
+    pool = PasswordPool(size=0, queue_limit=0)
+    assert pool.run(abs, -3) == 3
+
+
+def test_pool_rejects_operations_beyond_its_queue():
+    """Test a full pool fails fast instead of queueing more work."""
+    pool = PasswordPool(size=1, queue_limit=0, retry_after=5)
+    try:
+        assert pool.run(abs, -1) == 1  # start the worker process
+
+        busy = threading.Thread(target=pool.run, args=(time.sleep, 0.5))
+        busy.start()
+        time.sleep(0.1)
+        with pytest.raises(PasswordPoolSaturated) as error:
+            pool.run(abs, -2)
+        assert error.value.retry_after == 5
+
+        busy.join()
+        assert pool.run(abs, -2) == 2
+    finally:
+        pool.shutdown()
@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import event
+
+from adapters.output.persistence.write_behind.establishment_repository import (
+    WriteBehindEstablishmentRepository,
+)
+
+
+@pytest.fixture
+def count_queries(db_session):
+    """Count the statements a call executes on the session's engine."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+
+    def count(call):
+        statements.clear()
+        result = call()
+        return len(statements), result
+
+    yield count
+
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def add_commented_establishments(service, count):
+    for i in range(count):
+        establishment = service.create_establishment({"name": f"Place {i}"})
+        service.add_tag_to_establishment(establishment.id, "Cozy")
+        service.add_comment(establishment.id, f"Comment {i}", 8)
+
+
+@pytest.mark.parametrize("include_comments, expected", [(True, 2), (False, 1)])
+def test_search_query_count_is_constant(
+    establishment_service, count_queries, include_comments, expected
+):
+    """Test a search costs the same queries for 3 and 33 results."""
+
+    def search():
+        return establishment_service.search_establishments(
+            {"Cozy": 1.0}, 100, include_comments
+        )
+
+    add_commented_establishments(establishment_service, 3)
+    queries, results = count_queries(search)
+    assert (queries, len(results)) == (expected, 3)
+
+    add_commented_establishments(establishment_service, 30)
+    queries, results = count_queries(search)
+    assert (queries, len(results)) == (expected, 33)
+    if include_comments:
+        assert all(len(result.comments) == 1 for result in results)
+
+
+@pytest.mark.parametrize("include_comments, expected", [(True, 2), (False, 1)])
+def test_list_query_count_is_constant(
+    establishment_service, count_queries, include_comments, expected
+):
+    """Test listing a page costs the same queries for 3 and 33 establishments."""
+
+    def get_page():
+        return establishment_service.get_establishments_page(
+            100, include_comments=include_comments
+        )
+
+    add_commented_establishments(establishment_service, 3)
+    queries, results = count_queries(get_page)
+    assert (queries, len(results)) == (expected, 3)
+
+    add_commented_establishments(establishment_service, 30)
+    queries, results = count_queries(get_page)
+    assert (queries, len(results)) == (expected, 33)
+
+
+def test_buffered_tag_clicks_run_no_queries(establishment_service, count_queries):
+    """Test write-behind clicks on a known establishment never reach the database."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    repository = WriteBehindEstablishmentRepository(
+        establishment_service.establishment_repository
+    )
+    establishment_service.establishment_repository = repository
+    establishment_service.add_tag_to_establishment(cafe.id, "Cozy")
+
+    def click():
+        for _ in range(5):
+            establishment_service.add_tag_to_establishment(cafe.id, "Cozy")
+
+    assert count_queries(click)[0] == 0
+
+    repository.close()
+    assert establishment_service.tag_service.get_tag("Cozy") is not None
+    tags = establishment_service.get_establishment(cafe.id, False).tags
+    assert [(tag.tag_name, tag.count) for tag in tags] == [("Cozy", 6)]
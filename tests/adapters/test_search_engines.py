@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from adapters.output.search.csr_scoring_engine import CsrScoringEngine
+from adapters.output.search.inverted_index import InvertedTagIndex
+from adapters.output.search.scoring_engine import build_outgoing, effective_tag_weights
+from domain.models.tag import TagRelationship
+
+RELATIONSHIPS = [
+    TagRelationship(id=None, source_tag_name=s, target_tag_name=t, weight=w)
+    for s, t, w in [
+        ("Happy", "Party", 0.5),
+        ("Excited", "Party", 0.8),
+        ("Happy", "Cozy", 0.2),
+    ]
+]
+
+TAG_COUNTS = [
+    (1, "Party", 2),
+    (1, "Happy", 1),
+    (2, "Cozy", 5),
+    (3, "Quiet", 4),
+    (4, "Happy", 3),
+]
+
+
+def expected_scores(tag_counts, tag_weights):
+    """Score rows the way the SQL query does, one joined row at a time."""
+    scores = {}
+    for establishment_id, tag_name, count in tag_counts:
+        relationships = [
+            rel
+            for rel in RELATIONSHIPS
+            if rel.target_tag_name == tag_name and rel.source_tag_name in tag_weights
+        ]
+        direct = count * tag_weights.get(tag_name, 0.0)
+        score = direct * max(1, len(relationships)) + sum(
+            count * rel.weight * tag_weights[rel.source_tag_name]
+            for rel in relationships
+        )
+        scores[establishment_id] = scores.get(establishment_id, 0.0) + score
+    return {id_: score for id_, score in scores.items() if score > 0}
+
+
+def test_effective_weights_count_direct_weight_per_relationship():
+    """Test a tag reached by two query relationships counts its weight twice."""
+    weights = effective_tag_weights(
+        {"Happy": 1.0, "Excited": 0.5, "Party": 0.3}, build_outgoing(RELATIONSHIPS)
+    )
+
+    assert weights["Party"] == pytest.approx(0.3 * 2 + 0.5 * 1.0 + 0.8 * 0.5)
+    assert weights["Cozy"] == pytest.approx(0.2)
+    assert weights["Happy"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("engine_class", [CsrScoringEngine, InvertedTagIndex])
+def test_engine_matches_sql_scoring(engine_class):
+    """Test in-memory scores and ranking match the SQL scoring semantics."""
+    engine = engine_class()
+    engine.load(TAG_COUNTS, RELATIONSHIPS)
+    tag_weights = {"Happy": 1.0, "Excited": 0.5}
+
+    expected = expected_scores(TAG_COUNTS, tag_weights)
+    ranked = engine.top_k(tag_weights, limit=10)
+
+    assert {id_: pytest.approx(score) for id_, score in expected.items()} == dict(
+        ranked
+    )
+    assert [score for _, score in ranked] == sorted(expected.values(), reverse=True)
+    assert engine.top_k(tag_weights, limit=1) == ranked[:1]
+
+
+@pytest.mark.parametrize("engine_class", [CsrScoringEngine, InvertedTagIndex])
+def test_engine_applies_increments(engine_class):
+    """Test counts added after loading are reflected in scores."""
+    random.seed(7)
+    engine = engine_class()
+    engine.load(TAG_COUNTS, RELATIONSHIPS)
+    tag_counts = list(TAG_COUNTS)
+
+    for _ in range(50):
+        row = (random.randint(1, 8), random.choice(["Happy", "Party", "Cozy"]), 1)
+        engine.add_tag(*row)
+        tag_counts.append(row)
+
+    tag_weights = {"Happy": 0.7, "Cozy": 1.0}
+    expected = expected_scores(tag_counts, tag_weights)
+
+    assert dict(engine.top_k(tag_weights, limit=100)) == {
+        id_: pytest.approx(score) for id_, score in expected.items()
+    }
+
+
+def test_inverted_index_top_k_matches_exhaustive():
+    """Test MaxScore pruning returns the same top-k as scoring everything."""
+    random.seed(11)
+    tags = [f"t{i}" for i in range(12)]
+    tag_counts = [
+        (random.randint(1, 300), random.choice(tags), random.randint(1, 20))
+        for _ in range(2000)
+    ]
+    index = InvertedTagIndex()
+    index.load(tag_counts, [])
+
+    for _ in range(20):
+        tag_weights = {tag: random.random() for tag in random.sample(tags, 4)}
+        full = index.top_k(tag_weights, limit=1000)
+        assert [score for _, score in index.top_k(tag_weights, limit=5)] == (
+            pytest.approx([score for _, score in full[:5]])
+        )
@@ -0,0 +1,71 @@
+from adapters.input.api.auth.session_denylist import (
+    SessionDenylist,
+    SharedSessionDenylist,
+)
+from adapters.output.persistence.sqlalchemy.models.revoked_session import (
+    RevokedSessionModel,
+)
+from adapters.output.persistence.sqlalchemy.repositories.session_revocation_repository import (
+    SQLAlchemySessionRevocationRepository,
+)
+
+
+def test_revoked_session_is_denied_for_the_token_lifetime(clock):
+    """Test a logged out session stays denied until its tokens have expired."""
+    denylist = SessionDenylist(ttl=60, clock=clock)
+    denylist.revoke("session-1")
+
+    assert "session-1" in denylist
+    assert "session-2" not in denylist
+    clock.now = 1059.9
+    assert "session-1" in denylist
+    clock.now = 1060
+    assert "session-1" not in denylist
+
+
+def test_expired_sessions_are_forgotten(clock):
+    """Test the denylist only holds sessions revoked within the lifetime."""
+    denylist = SessionDenylist(ttl=60, clock=clock)
+    denylist.revoke("session-1")
+    clock.now = 1030
+    denylist.revoke("session-2")
+    denylist.revoke("session-1")
+
+    clock.now = 1070
+    assert len(denylist) == 2  # session-1 was revoked again at 1030
+    clock.now = 1090
+    assert len(denylist) == 0
+
+
+def test_logout_reaches_other_workers_within_the_poll_interval(db_session, clock):
+    """Test a revocation stored by one worker is loaded by the others."""
+    repository = SQLAlchemySessionRevocationRepository(db_session)
+    worker_a, worker_b = [
+        SharedSessionDenylist(repository, ttl=60, poll_interval=5, clock=clock)
+        for _ in range(2)
+    ]
+    assert "session-1" not in worker_b
+
+    worker_a.revoke("session-1")
+    assert "session-1" in worker_a
+    assert "session-1" not in worker_b  # Still trusting its last poll
+    clock.now = 1005
+    assert "session-1" in worker_b
+
+    # A worker started later loads every live revocation
+    clock.now = 1030
+    assert "session-1" in SharedSessionDenylist(repository, ttl=60, clock=clock)
+
+
+def test_shared_revocations_expire_with_the_tokens(db_session, clock):
+    """Test expired revocations are dropped from workers and the table."""
+    repository = SQLAlchemySessionRevocationRepository(db_session)
+    denylist = SharedSessionDenylist(repository, ttl=60, poll_interval=5, clock=clock)
+    denylist.revoke("session-1")
+
+    clock.now = 1060
+    assert "session-1" not in denylist
+    assert "session-1" not in SharedSessionDenylist(repository, ttl=60, clock=clock)
+
+    denylist.revoke("session-2")
+    assert db_session.query(RevokedSessionModel).count() == 1
@@ -0,0 +1,64 @@
+import pytest
+from flask import g
+
+from adapters.input.api.auth.security import admin_required, login_required
+
+
+@pytest.fixture
+def client(stateless, auth_client):
+    """Auth client of an app that also serves a user and an admin endpoint."""
+
+    @login_required
+    def me():
+        return {"user_id": g.token_payload["user_id"]}
+
+    @admin_required
+    def admin():
+        return {"message": "ok"}
+
+    app = auth_client.application
+    app.add_url_rule("/me", view_func=me)
+    app.add_url_rule("/admin", view_func=admin)
+    return auth_client
+
+
+def login(client, email, is_admin):
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "secret", "is_admin": is_admin},
+    )
+    response = client.post("/auth/login", json={"email": email, "password": "secret"})
+    assert response.status_code == 200
+    return response.get_json()["user"]["id"]
+
+
+def assert_no_session_data(client):
+    assert client.get_cookie("session") is None
+    with client.session_transaction() as flask_session:
+        assert dict(flask_session) == {}
+
+
+def test_stateless_session_lives_in_the_token(client):
+    """Test login, protected requests and logout without Flask session data."""
+    user_id = login(client, "admin@example.com", is_admin=True)
+    access_token = client.get_cookie("access_token").value
+    assert_no_session_data(client)
+
+    response = client.get("/me")
+    assert response.status_code == 200
+    assert response.get_json() == {"user_id": user_id}
+    assert client.get("/admin").status_code == 200
+    assert_no_session_data(client)
+
+    assert client.post("/auth/logout").status_code == 200
+    client.set_cookie("access_token", access_token)
+    assert client.get("/me").status_code == 401
+    assert client.get("/admin").status_code == 401
+
+
+def test_stateless_admin_check_reads_the_claim(client):
+    """Test a user without the is_admin claim is forbidden from admin endpoints."""
+    login(client, "user@example.com", is_admin=False)
+
+    assert client.get("/me").status_code == 200
+    assert client.get("/admin").status_code == 403
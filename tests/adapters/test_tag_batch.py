@@ -0,0 +1,132 @@
+import pytest
+
+from adapters.output.persistence.sqlalchemy.models.tag import TagModel
+from adapters.output.persistence.sqlalchemy.repositories import (
+    establishment_repository as repository_module,
+)
+from adapters.output.persistence.write_behind.establishment_repository import (
+    WriteBehindEstablishmentRepository,
+)
+
+
+@pytest.fixture(params=["upsert", "row_by_row"])
+def service(request, establishment_service, monkeypatch):
+    """Establishment service writing batches with either strategy."""
+    if request.param == "row_by_row":
+        monkeypatch.setattr(repository_module, "dialect_insert", lambda session: None)
+    return establishment_service
+
+
+def tag_counts(service, establishment_id):
+    establishment = service.get_establishment(establishment_id, False)
+    return {tag.tag_name: tag.count for tag in establishment.tags}
+
+
+def test_batch_adds_up_counts_and_creates_tags(service, db_session):
+    """Test repeated events aggregate, existing counts grow and new tags appear."""
+    service.tag_service.create_tag("Cozy")
+    cafe = service.create_establishment({"name": "Cafe"})
+    bar = service.create_establishment({"name": "Bar"})
+    service.add_tag_to_establishment(cafe.id, "Cozy")
+
+    applied = service.add_tags_to_establishments(
+        [(cafe.id, "Cozy"), (cafe.id, "Cozy"), (bar.id, "Loud"), (cafe.id, "Loud")]
+    )
+
+    assert applied == {(cafe.id, "Cozy"): 2, (bar.id, "Loud"): 1, (cafe.id, "Loud"): 1}
+    assert tag_counts(service, cafe.id) == {"Cozy": 3, "Loud": 1}
+    assert tag_counts(service, bar.id) == {"Loud": 1}
+    assert db_session.query(TagModel).filter_by(name="Loud").count() == 1
+
+
+def test_tagging_creates_missing_tag(establishment_service):
+    """Test a single tag write creates the tag it references."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+
+    establishment_service.add_tag_to_establishment(cafe.id, "Cozy")
+    establishment_service.add_tag_to_establishment(cafe.id, "Cozy")
+
+    assert establishment_service.tag_service.get_tag("Cozy") is not None
+    assert tag_counts(establishment_service, cafe.id) == {"Cozy": 2}
+
+
+def test_batch_with_unknown_establishment_writes_nothing(service):
+    """Test a missing establishment rejects the whole batch."""
+    cafe = service.create_establishment({"name": "Cafe"})
+
+    with pytest.raises(ValueError, match=str(cafe.id + 1)):
+        service.add_tags_to_establishments([(cafe.id, "Cozy"), (cafe.id + 1, "Cozy")])
+    assert tag_counts(service, cafe.id) == {}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        [],
+        {"events": {"establishment_id": 1}},
+        {"events": ["Cozy"]},
+        {"events": [{"tag_name": "Cozy"}]},
+        {"events": [{"establishment_id": "1", "tag_name": "Cozy"}]},
+        {"events": [{"establishment_id": True, "tag_name": "Cozy"}]},
+        {"events": [{"establishment_id": 1, "tag_name": ""}]},
+    ],
+)
+def test_batch_endpoint_rejects_malformed_events(admin_client, body):
+    """Test malformed bodies are bad requests rather than server errors."""
+    response = admin_client.post("/establishments/tags:batch", json=body)
+    assert response.status_code == 400
+
+
+def test_batch_endpoint_applies_events(admin_client, establishment_service):
+    """Test a valid batch is applied and an unknown establishment is a 400."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    events = [
+        {"establishment_id": cafe.id, "tag_name": "Cozy"},
+        {"establishment_id": cafe.id, "tag_name": "Cozy"},
+        {"establishment_id": cafe.id, "tag_name": "Calm"},
+    ]
+
+    response = admin_client.post("/establishments/tags:batch", json={"events": events})
+    assert response.status_code == 200
+    assert response.get_json() == {"events": 3, "updated": 2}
+
+    events = [{"establishment_id": cafe.id + 1, "tag_name": "Cozy"}]
+    response = admin_client.post("/establishments/tags:batch", json={"events": events})
+    assert response.status_code == 400
+
+
+def test_write_behind_only_buffers_existing_establishments(establishment_service):
+    """Test increments for a missing establishment are rejected, not buffered."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+    repository = WriteBehindEstablishmentRepository(
+        establishment_service.establishment_repository
+    )
+
+    with pytest.raises(ValueError):
+        repository.add_tag(cafe.id + 1, "Cozy")
+    with pytest.raises(ValueError):
+        repository.add_tags({(cafe.id, "Cozy"): 1, (cafe.id + 1, "Cozy"): 1})
+    assert repository.buffer.pending() == {}
+
+    assert repository.add_tag(cafe.id, "Cozy").count == 1
+    assert repository.buffer.pending() == {(cafe.id, "Cozy"): 1}
+
+
+def test_tag_endpoint_reports_missing_establishment(
+    admin_client, establishment_service
+):
+    """Test tagging a missing establishment is a 404, not a success message."""
+    cafe = establishment_service.create_establishment({"name": "Cafe"})
+
+    response = admin_client.post(
+        f"/establishments/{cafe.id}/tags", json={"tag_name": "Cozy"}
+    )
+    assert response.status_code == 200
+    assert response.get_json()["establishment"]["tags"] == [
+        {"tag_name": "Cozy", "count": 1}
+    ]
+
+    response = admin_client.post(
+        f"/establishments/{cafe.id + 1}/tags", json={"tag_name": "Cozy"}
+    )
+    assert response.status_code == 404
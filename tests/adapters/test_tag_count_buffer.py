@@ -0,0 +1,52 @@
+import pytest
+
+from adapters.output.persistence.write_behind.tag_count_buffer import TagCountBuffer
+
+
+def test_buffer_aggregates_increments_until_flushed():
+    """Test increments are merged per pair and written in one flush."""
+    flushed = []
+    buffer = TagCountBuffer(flushed.append, max_events=100)
+
+    buffer.add(1, "Cozy")
+    assert buffer.add(1, "Cozy") == 2
+    buffer.add_many({(2, "Calm"): 3})
+    assert buffer.pending() == {(1, "Cozy"): 2, (2, "Calm"): 3}
+
+    buffer.flush()
+    assert flushed == [{(1, "Cozy"): 2, (2, "Calm"): 3}]
+    assert buffer.pending() == {}
+
+
+def test_buffer_keeps_counts_when_flush_fails():
+    """Test a failed flush puts its counts back for the next attempt."""
+
+    def fail(tag_counts):
+        raise RuntimeError("database unavailable")
+
+    buffer = TagCountBuffer(fail)
+    buffer.add(1, "Cozy")
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    buffer.add(1, "Cozy")
+    assert buffer.pending() == {(1, "Cozy"): 2}
+
+
+def test_buffer_flushes_in_background_and_on_close():
+    """Test the flusher thread wakes up on max_events and close flushes the rest."""
+    flushed = []
+    buffer = TagCountBuffer(flushed.append, interval=60, max_events=2)
+    buffer.start()
+
+    buffer.add(1, "Cozy")
+    buffer.add(1, "Calm")
+    buffer.add(2, "Cozy")
+    buffer.close()
+
+    total = {}
+    for tag_counts in flushed:
+        for key, count in tag_counts.items():
+            total[key] = total.get(key, 0) + count
+    assert total == {(1, "Cozy"): 1, (1, "Calm"): 1, (2, "Cozy"): 1}
+    assert buffer.pending() == {}
@@ -0,0 +1,41 @@
+from adapters.input.api.auth.token_cache import VerifiedTokenCache
+
+
+def test_cache_honors_exp_exactly(clock):
+    """Test a cached token stops being returned at its exp timestamp."""
+    cache = VerifiedTokenCache(clock=clock)
+    payload = {"session_id": "s1", "exp": 1010}
+    cache.put("token", payload)
+
+    clock.now = 1009.999
+    assert cache.get("token") == payload
+    clock.now = 1010
+    assert cache.get("token") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(clock):
+    """Test the cache stays bounded, keeping recently used tokens."""
+    cache = VerifiedTokenCache(max_size=2, clock=clock)
+    cache.put("a", {"session_id": "s1", "exp": 2000})
+    cache.put("b", {"session_id": "s2", "exp": 2000})
+    cache.get("a")
+    cache.put("c", {"session_id": "s3", "exp": 2000})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_invalidate_session_forgets_its_tokens(clock):
+    """Test logging out drops the access and refresh tokens of the session."""
+    cache = VerifiedTokenCache(clock=clock)
+    cache.put("access", {"session_id": "s1", "exp": 2000})
+    cache.put("refresh", {"session_id": "s1", "exp": 3000})
+    cache.put("other", {"session_id": "s2", "exp": 2000})
+
+    cache.invalidate_session("s1")
+
+    assert cache.get("access") is None
+    assert cache.get("refresh") is None
+    assert cache.get("other") is not None
@@ -0,0 +1,33 @@
+import jwt
+
+from adapters.input.api.auth import security
+from adapters.input.api.auth.security import REFRESH_TOKEN_EXPIRES, generate_jwt
+
+
+def refresh(client, refresh_token):
+    client.set_cookie("refresh_token", refresh_token)
+    return client.post("/auth/refresh")
+
+
+def test_refresh_carries_user_claims(stateless, auth_client):
+    """Test a stateless refresh copies the claims into the new access token."""
+    claims = {"user_id": 7, "is_admin": True}
+    response = refresh(
+        auth_client, generate_jwt("session-1", REFRESH_TOKEN_EXPIRES, claims)
+    )
+
+    assert response.status_code == 200
+    access_token = auth_client.get_cookie("access_token").value
+    payload = jwt.decode(
+        access_token, security.JWT_SECRET_KEY, algorithms=[security.ALGORITHM]
+    )
+    assert payload["session_id"] == "session-1"
+    assert {key: payload[key] for key in claims} == claims
+
+
+def test_refresh_rejects_tokens_without_user_claims(stateless, auth_client):
+    """Test refresh tokens issued before stateless mode are a 401, not a 500."""
+    response = refresh(auth_client, generate_jwt("session-1", REFRESH_TOKEN_EXPIRES))
+
+    assert response.status_code == 401
+    assert auth_client.get_cookie("access_token") is None
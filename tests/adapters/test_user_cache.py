@@ -0,0 +1,57 @@
+from adapters.input.api.auth.user_cache import UserCache
+from domain.models.user import User
+
+
+def make_loader(users):
+    loads = []
+
+    def load(email):
+        loads.append(email)
+        return users.get(email)
+
+    return load, loads
+
+
+def test_cache_reads_through_until_ttl(clock):
+    """Test users are loaded once per TTL and missing users aren't cached."""
+    cache = UserCache(ttl=30, clock=clock)
+    load, loads = make_loader({"a@x.com": User(1, "a@x.com", "hash")})
+
+    assert cache.get("a@x.com", load).id == 1
+    assert cache.get("a@x.com", load).id == 1
+    assert cache.get("b@x.com", load) is None
+    assert cache.get("b@x.com", load) is None
+    assert loads == ["a@x.com", "b@x.com", "b@x.com"]
+
+    clock.now = 1030
+    cache.get("a@x.com", load)
+    assert loads[-1] == "a@x.com"
+
+
+def test_invalidate_reloads_changed_user(clock):
+    """Test a password change is seen on the next lookup."""
+    users = {"a@x.com": User(1, "a@x.com", "old")}
+    cache = UserCache(clock=clock)
+    load, _ = make_loader(users)
+    cache.get("a@x.com", load)
+
+    users["a@x.com"] = User(1, "a@x.com", "new")
+    cache.invalidate("a@x.com")
+
+    assert cache.get("a@x.com", load).password_hash == "new"
+
+
+def test_load_racing_with_invalidation_is_not_cached(clock):
+    """Test a row read before an invalidation isn't stored afterwards."""
+    cache = UserCache(clock=clock)
+    users = {"a@x.com": User(1, "a@x.com", "old")}
+
+    def stale_load(email):
+        user = users[email]
+        cache.invalidate(email)  # a password change commits meanwhile
+        return user
+
+    assert cache.get("a@x.com", stale_load).password_hash == "old"
+    load, loads = make_loader({"a@x.com": User(1, "a@x.com", "new")})
+    assert cache.get("a@x.com", load).password_hash == "new"
+    assert loads == ["a@x.com"]
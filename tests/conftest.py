@@ -1,10 +1,54 @@
 import os
 import pytest
 from flask import Flask
+from flask_restx import Api
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 
 from infrastructure.database import db as _db
 from app import create_app
+from adapters.input.api.establishments import (
+    api as establishments_api,
+    init_api as init_establishments_api,
+)
+from adapters.input.api.auth import routes as auth_routes
+from adapters.input.api.auth import security
+from adapters.input.api.auth.password_pool import PasswordPool
+from adapters.input.api.auth.security import generate_jwt
+from adapters.input.api.auth.utils import user_cache
+from adapters.output.persistence.sqlalchemy.models.base import Base
+from adapters.output.persistence.sqlalchemy.repositories.establishment_repository import (
+    SQLAlchemyEstablishmentRepository,
+)
+from adapters.output.persistence.sqlalchemy.repositories.tag_repository import (
+    SQLAlchemyTagRepository,
+)
+from adapters.output.persistence.sqlalchemy.repositories.comment_repository import (
+    SQLAlchemyCommentRepository,
+)
+from domain.services.establishment_service import EstablishmentService
+from domain.services.search_cache import SearchCache
+from domain.services.tag_service import TagService
+
+
+class FakeClock:
+    """Clock for time-based caches that only moves when a test moves it."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Create a fake clock to pass as the ``clock`` of time-based caches."""
+    return FakeClock()
 
 
 @pytest.fixture(scope="session")
@@ -56,3 +100,99 @@ def client(app):
 def auth_headers():
     """Create authentication headers for testing."""
     return {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def db_session():
+    """Create a session on a fresh in-memory SQLite database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+def build_establishment_service(session, materialized=False, search_cache=False):
+    """Wire an establishment service the way ``create_app`` does.
+
+    ``materialized`` scores searches over materialized mood scores and
+    ``search_cache`` puts a fresh ``SearchCache`` in front of them.
+    """
+    tag_service = TagService(
+        SQLAlchemyTagRepository(session), materialize_mood_scores=materialized
+    )
+    return EstablishmentService(
+        establishment_repository=SQLAlchemyEstablishmentRepository(
+            session,
+            mood_affinities=tag_service.get_mood_affinities if materialized else None,
+        ),
+        comment_repository=SQLAlchemyCommentRepository(session),
+        tag_service=tag_service,
+        search_cache=SearchCache() if search_cache else None,
+    )
+
+
+@pytest.fixture
+def make_establishment_service(db_session):
+    """Build services on the SQLite session, e.g. one per simulated worker."""
+
+    def make(**options):
+        return build_establishment_service(db_session, **options)
+
+    return make
+
+
+@pytest.fixture
+def establishment_service(request, make_establishment_service):
+    """Create an establishment service backed by the SQLite session.
+
+    Parametrize indirectly with the options of ``build_establishment_service``,
+    e.g. ``{"materialized": True, "search_cache": True}``.
+    """
+    return make_establishment_service(**getattr(request, "param", {}))
+
+
+@pytest.fixture(scope="session")
+def establishments_app():
+    """Create a Flask application serving only the establishments API."""
+    app = Flask(__name__)
+    app.config.update(TESTING=True, SECRET_KEY="test-secret-key", FAST_JSON=False)
+    Api(app).add_namespace(establishments_api, path="/establishments")
+    return app
+
+
+@pytest.fixture
+def admin_client(establishments_app, establishment_service):
+    """Create a client of the establishments API logged in as an admin."""
+    init_establishments_api(establishment_service)
+    client = establishments_app.test_client()
+    client.set_cookie("access_token", generate_jwt("test-session"))
+    with client.session_transaction() as flask_session:
+        flask_session["session_id"] = "test-session"
+        flask_session["is_admin"] = True
+    return client
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    """Enable stateless sessions, checked against the token claims."""
+    monkeypatch.setattr(security, "AUTH_STATELESS", True)
+
+
+@pytest.fixture
+def auth_client(monkeypatch):
+    """Create a client of the auth API on an in-memory database, hashing inline."""
+    monkeypatch.setattr(auth_routes, "password_pool", PasswordPool(0, 0))
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True, SECRET_KEY="test-secret-key", SQLALCHEMY_DATABASE_URI="sqlite://"
+    )
+    _db.init_app(app)
+    Api(app).add_namespace(auth_routes.api, path="/auth")
+    with app.app_context():
+        _db.create_all()
+        yield app.test_client()
+    user_cache.clear()
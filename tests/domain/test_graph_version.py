@@ -0,0 +1,21 @@
+from domain.services.graph_version import CachedVersion
+
+
+def test_cached_version_reads_once_per_ttl(clock):
+    """Test the counter is fetched again only after the TTL expires."""
+    versions = iter([1, 2])
+    cached = CachedVersion(lambda: next(versions), ttl=5.0, clock=clock)
+
+    assert cached.get() == 1
+    clock.advance(4.9)
+    assert cached.get() == 1
+    clock.advance(0.1)
+    assert cached.get() == 2
+
+
+def test_cached_version_set_overrides_value(clock):
+    """Test a locally written version is served without a fetch."""
+    cached = CachedVersion(lambda: 1, ttl=5.0, clock=clock)
+
+    cached.set(7)
+    assert cached.get() == 7
@@ -3,6 +3,7 @@ from datetime import datetime
 
 from domain.models.user import User
 from domain.models.tag import Tag, TagRelationship
+from domain.models.comment import Comment, RatingStats
 from domain.models.establishment import Establishment, EstablishmentTag
 
 
@@ -86,3 +87,30 @@ def test_establishment_model_default_values():
     assert establishment.score is None
     assert isinstance(establishment.created_at, datetime)
     assert establishment.tags == []
+
+
+def test_created_at_default_is_per_instance():
+    """Test created_at defaults to creation time, not import time."""
+    before = datetime.utcnow()
+    comment = Comment(id=None, establishment_id=1, text="Nice", rating=7)
+
+    assert comment.created_at >= before
+    assert not hasattr(comment, "__dict__")
+
+
+def test_rating_stats_model():
+    """Test RatingStats aggregate."""
+    stats = RatingStats()
+    assert stats.average is None
+    assert stats.histogram == [0] * 10
+
+    stats.add(10)
+    stats.add(7)
+    stats.add(10)
+
+    assert stats.count == 3
+    assert stats.total == 27
+    assert stats.average == 9.0
+    assert stats.histogram[9] == 2
+    assert stats.histogram[6] == 1
+    assert RatingStats().histogram is not RatingStats().histogram
@@ -0,0 +1,144 @@
+import pytest
+
+from domain.models.tag import TagRelationship
+from domain.services.mood_graph import MoodGraph
+from domain.services.matrix_mood_graph import MatrixMoodGraph
+from domain.services.mood_index import MoodIndex
+
+
+def make_relationships(edges):
+    return [
+        TagRelationship(id=None, source_tag_name=s, target_tag_name=t, weight=w)
+        for s, t, w in edges
+    ]
+
+
+EDGES = [
+    ("Happy", "Excited", 0.8),
+    ("Excited", "Happy", 0.8),
+    ("Happy", "Social", 0.7),
+    ("Social", "Party", 0.8),
+    ("Excited", "Energetic", 0.9),
+    ("Party", "Energetic", 0.7),
+    ("Relaxed", "Cozy", 0.8),
+]
+
+
+def test_matrix_backend_matches_python_backend():
+    """Test NumPy closure returns the same weights as the reference implementation."""
+    expected = MoodGraph(make_relationships(EDGES)).get_all_relationships()
+    actual = MatrixMoodGraph(make_relationships(EDGES)).get_all_relationships()
+
+    assert actual.keys() == expected.keys()
+    for source, row in expected.items():
+        assert actual[source].keys() == row.keys()
+        for target, weight in row.items():
+            assert actual[source][target] == pytest.approx(weight)
+
+
+def test_transitive_strength_is_strongest_path():
+    """Test the closure keeps the strongest multiplicative path."""
+    graph = MatrixMoodGraph(make_relationships(EDGES))
+    relationships = graph.get_all_relationships()
+
+    # Happy -> Excited -> Energetic beats Happy -> Social -> Party -> Energetic
+    assert relationships["Happy"]["Energetic"] == pytest.approx(0.72)
+    assert relationships["Happy"]["Cozy"] == 0
+
+
+@pytest.mark.parametrize("graph_class", [MoodGraph, MatrixMoodGraph])
+def test_get_related_moods(graph_class):
+    """Test related moods are filtered by the minimum weight."""
+    graph = graph_class(make_relationships(EDGES))
+
+    related = graph.get_related_moods("Relaxed")
+    assert related == {"Cozy": pytest.approx(0.8)}
+    assert graph.get_related_moods("Unknown") == {}
+
+
+@pytest.mark.parametrize("graph_class", [MoodGraph, MatrixMoodGraph])
+def test_incremental_update_matches_rebuild(graph_class):
+    """Test adding edges one by one yields the same closure as a full rebuild."""
+    extra = [
+        ("Cozy", "Happy", 0.9),
+        ("Energetic", "Relaxed", 0.5),
+        ("Calm", "Relaxed", 0.6),
+        ("Happy", "Social", 0.95),
+    ]
+    graph = graph_class(make_relationships(EDGES))
+    for relationship in make_relationships(extra):
+        graph.add_relationship(relationship)
+
+    expected = graph_class(make_relationships(EDGES + extra)).get_all_relationships()
+    actual = graph.get_all_relationships()
+
+    assert actual.keys() == expected.keys()
+    for source, row in expected.items():
+        for target, weight in row.items():
+            assert actual[source][target] == pytest.approx(weight)
+
+
+@pytest.mark.parametrize("graph_class", [MoodGraph, MatrixMoodGraph])
+def test_incremental_update_reports_changes(graph_class):
+    """Test the returned changes are exactly the closure weight increases."""
+    graph = graph_class(make_relationships(EDGES))
+    before = graph.get_all_relationships()
+    before = {source: dict(row) for source, row in before.items()}
+
+    (relationship,) = make_relationships([("Cozy", "Happy", 0.9)])
+    changes = graph.add_relationship(relationship)
+    after = graph.get_all_relationships()
+
+    expected = {
+        (source, target): weight - before[source][target]
+        for source, row in after.items()
+        for target, weight in row.items()
+        if weight > before[source][target]
+    }
+    assert changes.keys() == expected.keys()
+    for pair, increase in expected.items():
+        assert changes[pair] == pytest.approx(increase)
+
+    assert graph.add_relationship(relationship) == {}
+    assert graph.get_mood_affinities("Happy")["Happy"] == 1.0
+    assert graph.get_mood_affinities("Happy")["Cozy"] == pytest.approx(0.9)
+
+
+def test_mood_index_matches_dense_closure():
+    """Test the sparse index holds the non-zero closure row of every tag."""
+    dense = MoodGraph(make_relationships(EDGES)).get_all_relationships()
+    index = MoodIndex(make_relationships(EDGES))
+
+    for source, row in dense.items():
+        expected = {t: w for t, w in row.items() if w > 0 and t != source}
+        related = index.get_related_moods(source)
+        assert related.keys() == expected.keys()
+        for target, weight in expected.items():
+            assert related[target] == pytest.approx(weight)
+
+
+def test_mood_index_bounds():
+    """Test the index honours the weight floor and top-k, strongest first."""
+    index = MoodIndex(make_relationships(EDGES), min_weight=0.6, top_k=3)
+
+    names, weights = index.related("Happy")
+    assert names == ("Excited", "Energetic", "Social")
+    assert list(weights) == sorted(weights, reverse=True)
+    assert all(weight >= 0.6 for weight in weights)
+    assert index.get_related_moods("Unknown") == {}
+
+
+@pytest.mark.parametrize("min_weight, top_k", [(0.0, None), (0.5, 2)])
+def test_mood_index_add_relationship_matches_rebuild(min_weight, top_k):
+    """Test patching the index gives the same rows as building it again."""
+    added = [("Cozy", "Happy", 0.9), ("Calm", "Relaxed", 0.6), ("Social", "Cozy", 0.8)]
+    index = MoodIndex(make_relationships(EDGES), min_weight, top_k)
+
+    for relationship in make_relationships(added):
+        index.add_relationship(relationship)
+
+    rebuilt = MoodIndex(make_relationships(EDGES + added), min_weight, top_k)
+    for source in ("Happy", "Excited", "Social", "Party", "Relaxed", "Cozy", "Calm"):
+        assert index.get_related_moods(source) == pytest.approx(
+            rebuilt.get_related_moods(source)
+        )
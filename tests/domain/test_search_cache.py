@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from domain.services.search_cache import SearchCache
+
+
+def _results(*ids):
+    return [SimpleNamespace(id=id_) for id_ in ids]
+
+
+def test_search_cache_key_ignores_tag_order():
+    """Test equal queries normalize to the same key."""
+    first = SearchCache.make_key({"Happy": 1.0, "Cozy": 1.0}, 10, True)
+    second = SearchCache.make_key({"Cozy": 1.0, "Happy": 1.0}, 10, True)
+
+    assert first == second
+    assert first != SearchCache.make_key({"Cozy": 1.0, "Happy": 1.0}, 5, True)
+
+
+def test_search_cache_counts_hits_and_expires_entries(clock):
+    """Test hits, misses and TTL expiry."""
+    cache = SearchCache(max_size=10, ttl=30.0, clock=clock)
+
+    assert cache.get("q", 1) is None
+    cache.put("q", 1, _results(1), {"Happy"})
+    assert [result.id for result in cache.get("q", 1)] == [1]
+
+    clock.advance(30.0)
+    assert cache.get("q", 1) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 0}
+
+
+def test_search_cache_evicts_least_recently_used():
+    """Test the least recently read entry is evicted first."""
+    cache = SearchCache(max_size=2)
+    cache.put("a", 1, _results(1), {"A"})
+    cache.put("b", 1, _results(2), {"B"})
+    cache.get("a", 1)
+    cache.put("c", 1, _results(3), {"C"})
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    assert cache.get("c", 1) is not None
+
+
+def test_search_cache_invalidates_selectively():
+    """Test writes only drop entries they can affect."""
+    cache = SearchCache()
+    cache.put("happy", 1, _results(1), {"Happy", "Joyful"})
+    cache.put("calm", 1, _results(2), {"Calm"})
+
+    cache.invalidate_tags(["Joyful"])
+    assert cache.get("happy", 1) is None
+    assert cache.get("calm", 1) is not None
+
+    cache.invalidate_establishment(2)
+    assert cache.get("calm", 1) is None
+
+
+def test_search_cache_cleared_on_graph_version_change():
+    """Test a new mood graph version drops every entry."""
+    cache = SearchCache()
+    cache.put("q", 1, _results(1), {"Happy"})
+
+    assert cache.get("q", 2) is None
+    assert cache.stats()["size"] == 0